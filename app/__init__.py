@@ -4,7 +4,7 @@ Application factory for Adaptive Auto Hub Flask website.
 Creates and configures Flask application with blueprints and extensions.
 """
 
-from flask import Flask
+from flask import Flask, request
 from flask_talisman import Talisman
 from flask_wtf.csrf import CSRFProtect
 from flask_compress import Compress
@@ -24,11 +24,22 @@ def create_app(config_name='default'):
         app.config.from_object('config.DevelopmentConfig')
 
     # Initialize extensions
+    _configure_og_cards(app)
+    _configure_critical_css(app)  # before security: the CSP allows its blobs by hash
+    _configure_speculation_rules(app)  # before security: the CSP allows its rules by hash
     _configure_security(app)
     _configure_compression(app)
-    
-    # Optional: Configure assets (comment out if not using Flask-Assets)
-    # _configure_assets(app)
+    _configure_assets(app)  # before static files: fingerprints see built bundles
+    _configure_service_worker(app)
+    _configure_static_files(app)
+    _configure_preload_headers(app)  # before the page cache: cached pages keep their Link
+    _configure_page_cache(app)
+    _configure_asset_inliner(app)  # runs after the LCP hints and picture upgrade
+    _configure_lcp_hints(app)
+    _configure_picture_upgrade(app)  # runs before the LCP hints
+    _configure_html_minifier(app)  # last: its response filter runs first
+    _configure_fragments(app)
+    _configure_partial_navigation(app)
 
     # Register blueprints
     _register_blueprints(app)
@@ -36,6 +47,9 @@ def create_app(config_name='default'):
     # Register error handlers
     _register_error_handlers(app)
 
+    # Register template context helpers
+    _register_context_processors(app)
+
     return app
 
 def _configure_security(app):
@@ -44,10 +58,17 @@ def _configure_security(app):
     
     # Only enable Talisman in production
     if app.config.get('FLASK_ENV') == 'production':
+        from .utils.critical_css import get_critical_css
+        from .utils.speculation_rules import get_speculation_rules
+
+        # Inline critical CSS and speculation rules must match a hash once the
+        # nonce disables 'unsafe-inline'
+        critical = get_critical_css(app)
+        speculation = get_speculation_rules(app)
         csp = {
             'default-src': "'self'",
-            'style-src': ["'self'", "'unsafe-inline'"],
-            'script-src': ["'self'", "'unsafe-inline'"],
+            'style-src': ["'self'", "'unsafe-inline'"] + (critical.csp_sources() if critical else []),
+            'script-src': ["'self'", "'unsafe-inline'"] + (speculation.csp_sources() if speculation else []),
             'img-src': ["'self'", "data:"],
             'font-src': ["'self'"],
         }
@@ -61,19 +82,90 @@ def _configure_security(app):
         )
 
 def _configure_compression(app):
-    """Configure response compression"""
-    Compress(app)
+    """Configure response compression for dynamic responses"""
+    compress = Compress(app)
+    app.extensions['compress'] = compress
 
-def _configure_assets(app):
-    """Configure Flask-Assets if needed"""
-    try:
-        from .extensions import configure_assets
-        assets = configure_assets(app)
-        return assets
-    except ImportError:
-        app.logger.warning("Flask-Assets not configured - using static files directly")
+    # Static files ship precompressed siblings (build.py); never recompress them
+    @app.after_request
+    def compress_dynamic_response(response):
+        if request.endpoint == 'static' or (request.endpoint or '').endswith('.static'):
+            return response
+        return compress.after_request(response)
+
+def _configure_static_files(app):
+    """Serve static files with their precompressed siblings"""
+    from .utils.static_files import init_static_files
+    init_static_files(app)
+
+def _configure_preload_headers(app):
+    """Configure Link preload headers and 103 Early Hints"""
+    from .utils.preload_headers import init_preload_headers
+    return init_preload_headers(app)
+
+def _configure_page_cache(app):
+    """Configure the full-page response cache"""
+    if not app.config.get('PAGE_CACHE_ENABLED'):
         return None
 
+    from .utils.page_cache import init_page_cache
+    return init_page_cache(app)
+
+def _configure_asset_inliner(app):
+    """Serve small images as data URIs in rendered pages"""
+    from .utils.asset_inliner import init_asset_inliner
+    return init_asset_inliner(app)
+
+def _configure_lcp_hints(app):
+    """Add image dimensions and LCP hints to rendered pages"""
+    from .utils.lcp_hints import init_lcp_hints
+    return init_lcp_hints(app)
+
+def _configure_picture_upgrade(app):
+    """Serve plain static <img> tags as responsive <picture> markup"""
+    from .utils.picture_upgrade import init_picture_upgrade
+    return init_picture_upgrade(app)
+
+def _configure_html_minifier(app):
+    """Minify templates at compile time and, optionally, rendered pages"""
+    from .utils.html_minifier import init_html_minifier
+    return init_html_minifier(app)
+
+def _configure_fragments(app):
+    """Register the fragment() helper placing lazily loaded page sections"""
+    from .utils.fragments import init_fragments
+    return init_fragments(app)
+
+def _configure_partial_navigation(app):
+    """Answer client-side page swaps with partial pages"""
+    from .utils.partial_navigation import init_partial_navigation
+    return init_partial_navigation(app)
+
+def _configure_og_cards(app):
+    """Attach the Open Graph card renderer"""
+    from .utils.og_cards import init_og_cards
+    return init_og_cards(app)
+
+def _configure_critical_css(app):
+    """Load per-route critical CSS (built by build.py) into memory"""
+    from .utils.critical_css import init_critical_css
+    return init_critical_css(app)
+
+def _configure_speculation_rules(app):
+    """Load per-page speculation rules (link graph built by build.py)"""
+    from .utils.speculation_rules import init_speculation_rules
+    return init_speculation_rules(app)
+
+def _configure_service_worker(app):
+    """Load the service worker generated by build.py"""
+    from .utils.service_worker import init_service_worker
+    return init_service_worker(app)
+
+def _configure_assets(app):
+    """Configure CSS/JS bundles (config.ASSET_BUNDLES)"""
+    from .extensions import configure_assets
+    return configure_assets(app)
+
 def _register_blueprints(app):
     """Register all application blueprints"""
     from .blueprints.main import main_bp
@@ -101,4 +193,14 @@ def _register_error_handlers(app):
         # In development, let Flask show the debug page
         if app.config.get('DEBUG'):
             raise error
-        return render_template('errors/500.html'), 500
\ No newline at end of file
+        return render_template('errors/500.html'), 500
+
+def _register_context_processors(app):
+    """Register template context processors"""
+    @app.context_processor
+    def inject_og_image():
+        from flask import request
+        from .utils.og_cards import card_name_for_endpoint, og_card_url
+
+        card = card_name_for_endpoint(request.endpoint, request.view_args)
+        return {'og_image': og_card_url(card)}
@@ -11,11 +11,15 @@ from wtforms.validators import DataRequired, Email, Length
 import os
 from datetime import datetime
 
+from ...utils.http_cache import apply_cache_policy, cache_policy
+
 about_bp = Blueprint('about', __name__,
                     url_prefix='/about',
                     template_folder='templates',
                     static_folder='static')
 
+apply_cache_policy(about_bp)
+
 class ContactForm(FlaskForm):
     """Contact form for inquiries."""
     name = StringField('Name', validators=[
@@ -150,6 +154,7 @@ def index():
     return render_template('about/index.html', **context)
 
 @about_bp.route('/contact', methods=['GET', 'POST'])
+@cache_policy(no_store=True)
 def contact():
     """Contact page with form."""
     form = ContactForm()
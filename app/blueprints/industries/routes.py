@@ -6,11 +6,15 @@ Handles industry-specific applications and use cases.
 
 from flask import Blueprint, render_template, redirect, url_for
 
+from ...utils.http_cache import apply_cache_policy
+
 industries_bp = Blueprint('industries', __name__,
                          url_prefix='/industries',
                          template_folder='templates',
                          static_folder='static')
 
+apply_cache_policy(industries_bp)
+
 def get_industries_data():
     """Get comprehensive industry application data."""
     return [
@@ -164,12 +168,6 @@ def get_industries_data():
     ]
 
 
-@industries_bp.route('/<slug>')
-def detail(slug):
-    # Render the industry detail template
-    return render_template('industries/detail.html', slug=slug)
-
-
 @industries_bp.route('/')
 def index():
     """Industries overview page."""
@@ -4,11 +4,20 @@ Main blueprint routes for Adaptive Auto Hub website.
 Handles homepage, sitemap, and general routes.
 """
 
-from flask import Blueprint, render_template, jsonify, redirect, url_for
+from flask import (Blueprint, render_template, jsonify, redirect, url_for, abort,
+                   send_file, make_response)
 from datetime import datetime
 
+from ...utils.fragments import register_fragment, render_fragment
+from ...utils.og_cards import get_card_spec, get_card_digest, get_renderer
+from ...utils.page_cache import get_page_cache
+from ...utils.http_cache import apply_cache_policy, cache_policy
+from ...utils.service_worker import get_service_worker
+
 main_bp = Blueprint('main', __name__, template_folder='templates')
 
+apply_cache_policy(main_bp)
+
 
 @main_bp.route('/')
 def index():
@@ -47,67 +56,114 @@ def index():
                 'features': ['360° Detection', 'AI Classification', 'RIFF Integration'],
                 'link': '/products/aegis'
             }
-        ],
-        'testimonials': [
-            {
-                'quote': 'Aura reduced our inspection costs by 82% while improving defect detection accuracy.',
-                'client': 'Major Pipeline Operator',
-                'industry': 'Oil & Gas'
-            },
-            {
-                'quote': 'The integration with RIFF provides unmatched perimeter security.',
-                'client': 'Defense Contractor',
-                'industry': 'Defense'
-            }
-        ],
-        'partners': [
-            {
-                'name': 'Elphel Inc.',
-                'type': 'Technology Partner'
-            },
-            {
-                'name': 'InterProInvest',
-                'type': 'Defense Systems'
-            }
-        ],
-        'solutions': [
-            {
-                'id': 'computer-vision',
-                'title': 'Computer Vision',
-                'description': 'Advanced image recognition and analysis systems for quality control, security, and automated visual inspection.',
-                'image': '/static/images/solutions/computer-vision.webp',
-                'tags': ['Deep Learning', 'Image Recognition'],
-                'details': 'Our computer vision solutions leverage state-of-the-art neural networks...'
-            },
-            {
-                'id': 'predictive-analytics',
-                'title': 'Predictive Analytics',
-                'description': 'AI-driven predictive maintenance and failure prevention for critical infrastructure.',
-                'image': '/static/images/solutions/predictive-analytics.webp',
-                'tags': ['Machine Learning', 'IoT Integration'],
-                'details': 'Prevent costly failures before they happen with our predictive analytics...'
-            },
-            {
-                'id': 'autonomous-navigation',
-                'title': 'Autonomous Navigation',
-                'description': 'Intelligent path planning and obstacle avoidance for drone fleets.',
-                'image': '/static/images/solutions/autonomous-navigation.webp',
-                'tags': ['Robotics', 'Path Planning'],
-                'details': 'Enable your drones to navigate complex environments autonomously...'
-            }
         ]
     }
     
     return render_template('main/index.html', **context)
 
 
+def get_solutions():
+    """Industry solutions shown on the homepage."""
+    return [
+        {
+            'id': 'computer-vision',
+            'title': 'Computer Vision',
+            'description': 'Advanced image recognition and analysis systems for quality control, security, and automated visual inspection.',
+            'image': '/static/images/solutions/computer-vision.webp',
+            'tags': ['Deep Learning', 'Image Recognition'],
+            'details': 'Our computer vision solutions leverage state-of-the-art neural networks...'
+        },
+        {
+            'id': 'predictive-analytics',
+            'title': 'Predictive Analytics',
+            'description': 'AI-driven predictive maintenance and failure prevention for critical infrastructure.',
+            'image': '/static/images/solutions/predictive-analytics.webp',
+            'tags': ['Machine Learning', 'IoT Integration'],
+            'details': 'Prevent costly failures before they happen with our predictive analytics...'
+        },
+        {
+            'id': 'autonomous-navigation',
+            'title': 'Autonomous Navigation',
+            'description': 'Intelligent path planning and obstacle avoidance for drone fleets.',
+            'image': '/static/images/solutions/autonomous-navigation.webp',
+            'tags': ['Robotics', 'Path Planning'],
+            'details': 'Enable your drones to navigate complex environments autonomously...'
+        }
+    ]
+
+
+def get_testimonials():
+    """Client testimonials shown on the homepage."""
+    return [
+        {
+            'quote': 'Aura reduced our inspection costs by 82% while improving defect detection accuracy.',
+            'client': 'Major Pipeline Operator',
+            'industry': 'Oil & Gas'
+        },
+        {
+            'quote': 'The integration with RIFF provides unmatched perimeter security.',
+            'client': 'Defense Contractor',
+            'industry': 'Defense'
+        }
+    ]
+
+
+def get_partners():
+    """Strategic partners shown on the homepage."""
+    return [
+        {
+            'name': 'Elphel Inc.',
+            'type': 'Technology Partner'
+        },
+        {
+            'name': 'InterProInvest',
+            'type': 'Defense Systems'
+        }
+    ]
+
+
+@register_fragment(main_bp, 'solutions')
+def solutions_fragment():
+    """Homepage industry solutions grid (below the fold)."""
+    return {'solutions': get_solutions()}
+
+
+@register_fragment(main_bp, 'testimonials')
+def testimonials_fragment():
+    """Homepage client testimonials (below the fold)."""
+    return {'testimonials': get_testimonials()}
+
+
+@register_fragment(main_bp, 'partners')
+def partners_fragment():
+    """Homepage strategic partners (below the fold)."""
+    return {'partners': get_partners()}
+
+
+@main_bp.route('/fragments/<name>.html')
+def fragment(name):
+    """Serve a lazily loaded page section on its own."""
+    html = render_fragment(name)
+    if html is None:
+        abort(404)
+
+    response = make_response(html)
+    # Sections are indexed with the pages that load them
+    response.headers['X-Robots-Tag'] = 'noindex'
+    return response
+
+
 @main_bp.route('/health')
+@cache_policy(no_store=True)
 def health():
     """Health check endpoint for monitoring."""
+    page_cache = get_page_cache()
+    
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.utcnow().isoformat(),
-        'service': 'Adaptive Auto Hub Web Application'
+        'service': 'Adaptive Auto Hub Web Application',
+        'page_cache': page_cache.get_stats() if page_cache else None
     })
 
 
@@ -125,12 +181,45 @@ def api_metrics():
     })
 
 
+@main_bp.route('/og/<path:card>.<digest>.jpg')
+def og_card(card, digest):
+    """Serve a per-page Open Graph card, rendering it on first request."""
+    spec = get_card_spec(card)
+    if spec is None:
+        abort(404)
+
+    # Stale digests (content changed since the page was cached) get the current card
+    current_digest = get_card_digest(card)
+    if digest != current_digest:
+        return redirect(url_for('main.og_card', card=card, digest=current_digest))
+
+    path = get_renderer().render(spec['title'], spec['subtitle'], spec['image'])
+
+    response = send_file(path, mimetype='image/jpeg', max_age=31536000)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
 @main_bp.route('/contact/')
 def contact_redirect():
     """Redirect /contact/ to /about/contact"""
     return redirect(url_for('about.contact'), code=301)
 
 
+@main_bp.route('/sw.js')
+@cache_policy(max_age=0, stale_while_revalidate=0, etag='body', last_modified=False)
+def service_worker():
+    """Service worker, served from the root so it controls every page."""
+    script = get_service_worker()
+    if script is None:
+        abort(404)
+
+    response = make_response(script)
+    response.headers['Content-Type'] = 'text/javascript; charset=utf-8'
+    return response
+
+
 @main_bp.route('/sitemap.xml')
 def sitemap():
     """Generate XML sitemap for SEO."""
@@ -147,7 +236,7 @@ def sitemap():
     ]
     
     response = render_template('sitemap.xml', pages=pages)
-    response = app.make_response(response)
+    response = make_response(response)
     response.headers['Content-Type'] = 'application/xml'
     return response
 
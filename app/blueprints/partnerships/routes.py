@@ -6,11 +6,15 @@ Handles partnership pages and partner information display.
 
 from flask import Blueprint, render_template, abort
 
+from ...utils.http_cache import apply_cache_policy
+
 partnerships_bp = Blueprint('partnerships', __name__,
                            url_prefix='/partnerships',
                            template_folder='templates',
                            static_folder='static')
 
+apply_cache_policy(partnerships_bp)
+
 
 def get_partnerships_data():
     """Get all partnerships data."""
@@ -6,11 +6,17 @@ Handles product overview, Aura Analytics, and Aegis Defense pages.
 
 from flask import Blueprint, render_template, jsonify, request
 
+from ...utils.fragments import register_fragment
+from ...utils.http_cache import apply_cache_policy
+
 products_bp = Blueprint('products', __name__, 
                        url_prefix='/products',
                        template_folder='templates',
                        static_folder='static')
 
+# Pages and specification JSON only change on deploy
+apply_cache_policy(products_bp)
+
 def get_aura_data():
     """Get Aura Analytics product data."""
     return {
@@ -216,6 +222,19 @@ def get_products_data():
         }
     ]
 
+def get_comparison():
+    """Feature comparison of the products."""
+    return {
+        'headers': ['Feature', 'Aura Analytics', 'Aegis Defense'],
+        'rows': [
+            ['Primary Use', 'Infrastructure Inspection', 'Threat Detection'],
+            ['AI Technology', 'Computer Vision & ML', 'Sensor Fusion & Classification'],
+            ['Key Benefit', '75-85% Cost Savings', '24/7 Autonomous Protection'],
+            ['Integration', 'Any Drone Platform', 'RIFF Defense Systems'],
+            ['Markets', 'Commercial/Industrial', 'Defense/Security']
+        ]
+    }
+
 @products_bp.route('/')
 def index():
     """Products overview page with pagination support."""
@@ -242,21 +261,21 @@ def index():
         'page': page,
         'total_pages': total_pages,
         'per_page': per_page,
-        'total': total,
-        'comparison': {
-            'headers': ['Feature', 'Aura Analytics', 'Aegis Defense'],
-            'rows': [
-                ['Primary Use', 'Infrastructure Inspection', 'Threat Detection'],
-                ['AI Technology', 'Computer Vision & ML', 'Sensor Fusion & Classification'],
-                ['Key Benefit', '75-85% Cost Savings', '24/7 Autonomous Protection'],
-                ['Integration', 'Any Drone Platform', 'RIFF Defense Systems'],
-                ['Markets', 'Commercial/Industrial', 'Defense/Security']
-            ]
-        }
+        'total': total
     }
     
     return render_template('products/index.html', **context)
 
+@register_fragment(products_bp, 'comparison')
+def comparison_fragment():
+    """Products overview comparison table (below the fold)."""
+    return {'comparison': get_comparison()}
+
+@register_fragment(products_bp, 'aura_case_study')
+def aura_case_study_fragment():
+    """Aura Analytics success story (below the fold)."""
+    return {'case_study': get_aura_data()['case_study']}
+
 @products_bp.route('/aura')
 def aura():
     """Aura Analytics product detail page."""
@@ -1,88 +1,34 @@
 # /app/extensions.py
 """
 Flask extensions configuration for Adaptive Auto Hub website.
-Configures Flask-Assets for CSS/JS bundling and optimization.
+Configures the CSS/JS bundle pipeline and asset helpers.
 """
 
-from flask_assets import Environment, Bundle
+from .utils.bundler import asset_urls, bundle_fonts, init_bundles
+from .utils.critical_css import get_critical_css
+from .utils.js_splitter import init_js_split
+from .utils.svg_sprite import init_icon_sprite
 
 
 def configure_assets(app):
     """
-    Configure Flask-Assets for CSS and JavaScript bundling.
+    Configure the CSS/JavaScript bundle pipeline.
     
-    Sets up asset bundles for development and production environments
-    with appropriate filters for minification and cache busting.
+    Bundles are defined once in config.ASSET_BUNDLES, plus per-page
+    JavaScript bundles planned from the templates (config.JS_FEATURES),
+    and built by build.py; in development the input files are linked
+    directly. The icon sprite (static/icons) backs the icon() helper.
     
     Args:
         app: Flask application instance
         
     Returns:
-        Environment: Configured Flask-Assets environment
+        dict: Loaded bundle manifest (empty when bundles are not built)
     """
-    assets = Environment(app)
-    
-    # Configure asset environment
-    assets.url = app.static_url_path
-    assets.directory = app.static_folder
-    
-    # Development vs Production configuration
-    if app.config.get('FLASK_ENV') == 'development':
-        assets.debug = True
-        assets.auto_build = True
-        css_filters = []
-        js_filters = []
-    else:
-        assets.debug = False
-        assets.auto_build = False
-        css_filters = ['cssmin']
-        js_filters = ['jsmin']
-    
-    # Critical CSS bundle (for inline rendering)
-    critical_css = Bundle(
-        'css/critical.css',
-        filters=css_filters,
-        output='gen/critical.%(version)s.css'
-    )
-    
-    # Main CSS bundle
-    main_css = Bundle(
-        'css/base.css',
-        'css/components/navigation.css',
-        'css/components/buttons.css',
-        'css/components/cards.css',
-        'css/components/forms.css',
-        'css/components/hero.css',
-        'css/utilities.css',
-        filters=css_filters,
-        output='gen/main.%(version)s.css'
-    )
-    
-    # Main JavaScript bundle
-    main_js = Bundle(
-        'js/modules/utils.js',
-        'js/navigation.js',
-        'js/lazy-load.js',
-        'js/forms.js',
-        filters=js_filters,
-        output='gen/main.%(version)s.js'
-    )
-    
-    # Enhanced JavaScript bundle (for advanced features)
-    enhanced_js = Bundle(
-        'js/enhanced/animations.js',
-        'js/enhanced/analytics.js',
-        filters=js_filters,
-        output='gen/enhanced.%(version)s.js'
-    )
-    
-    # Register bundles
-    assets.register('critical_css', critical_css)
-    assets.register('main_css', main_css)
-    assets.register('main_js', main_js)
-    assets.register('enhanced_js', enhanced_js)
-    
-    return assets
+    init_js_split(app)
+    init_bundles(app)
+    init_icon_sprite(app)
+    return app.extensions['asset_bundles']
 
 
 def get_asset_url(bundle_name, app=None):
@@ -93,57 +39,59 @@ def get_asset_url(bundle_name, app=None):
     with fallback handling for development environments.
     
     Args:
-        bundle_name: Name of the registered bundle
+        bundle_name: Name of the bundle in config.ASSET_BUNDLES
         app: Flask application instance (optional)
         
     Returns:
         str: Asset URL or empty string if not found
     """
-    if app is None:
-        from flask import current_app as app
-    
     try:
-        assets = app.extensions.get('assets')
-        if assets and bundle_name in assets:
-            return assets[bundle_name].urls()[0]
-    except (AttributeError, IndexError, KeyError):
-        pass
-    
-    return ''
+        urls = asset_urls(bundle_name, app)
+        return urls[0] if urls else ''
+    except (KeyError, IndexError):
+        return ''
 
 
-def preload_critical_assets():
+def preload_critical_assets(app=None):
     """
     Generate preload directives for critical assets.
     
-    Returns list of preload directives for inclusion in HTML head.
-    Used to optimize loading of critical CSS and JavaScript.
+    Covers what every page loads: the main stylesheet (critical CSS
+    itself is inlined), the web fonts it references and the shared JS
+    chunk. Used for the Link preload headers (utils/preload_headers.py),
+    which add each page's LCP image and scripts.
+    
+    Args:
+        app: Flask application instance (optional)
     
     Returns:
         list: Preload directives as dictionaries
     """
+    from flask import url_for
+    
     preloads = []
     
-    # Critical CSS preload
-    critical_css_url = get_asset_url('critical_css')
-    if critical_css_url:
+    # Main CSS preload (the base file; media-split parts may not apply)
+    main_css_url = get_asset_url('css_main', app)
+    if main_css_url:
         preloads.append({
-            'href': critical_css_url,
+            'href': main_css_url,
             'rel': 'preload',
             'as': 'style'
         })
     
-    # Main CSS preload
-    main_css_url = get_asset_url('main_css')
-    if main_css_url:
+    # Fonts are discovered only once the stylesheet is parsed
+    for path in bundle_fonts('css_main', app):
         preloads.append({
-            'href': main_css_url,
+            'href': url_for('static', filename=path),
             'rel': 'preload',
-            'as': 'style'
+            'as': 'font',
+            'type': 'font/woff2',
+            'crossorigin': ''
         })
     
-    # Main JS preload
-    main_js_url = get_asset_url('main_js')
+    # Shared JS chunk preload
+    main_js_url = get_asset_url('js_shared', app)
     if main_js_url:
         preloads.append({
             'href': main_js_url,
@@ -156,10 +104,11 @@ def preload_critical_assets():
 
 def inline_critical_css(app=None):
     """
-    Read critical CSS content for inline rendering.
+    Get the critical CSS to inline for the current page.
     
-    Returns the minified critical CSS content as a string
-    for inclusion in HTML head to eliminate render-blocking.
+    Returns the page's minified above-the-fold CSS, extracted per
+    route by build.py and held in memory, for inclusion in the
+    HTML head to eliminate render-blocking.
     
     Args:
         app: Flask application instance (optional)
@@ -167,58 +116,10 @@ def inline_critical_css(app=None):
     Returns:
         str: Critical CSS content or empty string
     """
-    if app is None:
-        from flask import current_app as app
-    
-    try:
-        import os
-        critical_path = os.path.join(
-            app.static_folder, 
-            'css', 
-            'critical.css'
-        )
-        
-        if os.path.exists(critical_path):
-            with open(critical_path, 'r', encoding='utf-8') as f:
-                css_content = f.read()
-            
-            # Simple minification for inline CSS
-            if app.config.get('FLASK_ENV') == 'production':
-                css_content = _minify_css_simple(css_content)
-            
-            return css_content
-            
-    except (IOError, OSError):
-        pass
-    
-    return ''
-
-
-def _minify_css_simple(css_content):
-    """
-    Simple CSS minification for inline styles.
-    
-    Removes comments, excess whitespace, and line breaks
-    for basic CSS optimization without external dependencies.
-    
-    Args:
-        css_content: CSS string to minify
-        
-    Returns:
-        str: Minified CSS content
-    """
-    import re
-    
-    # Remove comments
-    css_content = re.sub(r'/\*.*?\*/', '', css_content, flags=re.DOTALL)
-    
-    # Remove excess whitespace
-    css_content = re.sub(r'\s+', ' ', css_content)
-    
-    # Remove spaces around specific characters
-    css_content = re.sub(r'\s*([{}:;,>+~])\s*', r'\1', css_content)
+    from flask import request
     
-    # Remove trailing semicolons before closing braces
-    css_content = re.sub(r';\s*}', '}', css_content)
+    store = get_critical_css(app)
+    if store is None:
+        return ''
     
-    return css_content.strip()
+    return store.lookup(request.path, request.endpoint)
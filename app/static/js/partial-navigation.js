@@ -0,0 +1,304 @@
+// /app/static/js/partial-navigation.js
+// Partial page navigation for Adaptive Auto Hub
+// Swaps in the next page's head, content and scripts on same-site link clicks instead of reloading the shell
+
+(function() {
+    'use strict';
+
+    var meta = document.querySelector('meta[name="partial-navigation"]');
+
+    if (!meta || !window.fetch || !window.DOMParser || !window.history.pushState) {
+        return;
+    }
+
+    var HEADER = meta.content;
+
+    // Paths with a file extension other than .html are files, not pages
+    var FILE_PATTERN = /\.(?!html$)[a-z0-9]+$/i;
+
+    // Body classes as served; page scripts may add their own (has-video-hero)
+    var bodyClass = document.body.className;
+    var controller = null;
+
+    function isPageLink(link, event) {
+        if (event.defaultPrevented || event.button !== 0 ||
+            event.metaKey || event.ctrlKey || event.shiftKey || event.altKey) {
+            return false;
+        }
+        if (typeof link.href !== 'string' || (link.target && link.target !== '_self') ||
+            link.hasAttribute('download') || link.getAttribute('rel') === 'external') {
+            return false;
+        }
+
+        var url = new URL(link.href);
+        if (url.origin !== location.origin || FILE_PATTERN.test(url.pathname)) {
+            return false;
+        }
+
+        // Anchors within the current page scroll as usual
+        return !(url.hash && url.pathname === location.pathname && url.search === location.search);
+    }
+
+    function fetchPage(url, signal) {
+        var headers = {};
+        headers[HEADER] = '1';
+
+        return fetch(url, { headers: headers, credentials: 'same-origin', signal: signal })
+            .then(function(response) {
+                var type = response.headers.get('Content-Type') || '';
+                if (!response.ok || type.indexOf('text/html') !== 0) {
+                    throw new Error('Not a page: HTTP ' + response.status);
+                }
+
+                return response.text().then(function(html) {
+                    var page = new DOMParser().parseFromString(html, 'text/html');
+
+                    // Whole documents (static exports, pages not built on base.html)
+                    // carry their own shell
+                    if (page.doctype || !page.getElementById('main')) {
+                        throw new Error('Not a partial page');
+                    }
+                    return { url: response.url || url, page: page };
+                });
+            });
+    }
+
+    // New stylesheets are applied before the swap so content never shows unstyled;
+    // applied ones stay, as page stylesheets are scoped to their page's markup
+    function loadStylesheets(page, baseUrl) {
+        var applied = {};
+        Array.prototype.forEach.call(document.querySelectorAll('link[rel="stylesheet"]'), function(link) {
+            applied[link.href] = true;
+        });
+
+        var links = page.head.querySelectorAll('link[rel="stylesheet"], link[rel="preload"][as="style"]');
+        var pending = [];
+
+        Array.prototype.forEach.call(links, function(source) {
+            var href = new URL(source.getAttribute('href'), baseUrl).href;
+            if (applied[href]) return;
+            applied[href] = true;
+
+            var link = document.createElement('link');
+            link.rel = 'stylesheet';
+            link.href = href;
+            if (source.media) {
+                link.media = source.media;
+            }
+
+            pending.push(new Promise(function(resolve) {
+                link.onload = link.onerror = resolve;
+            }));
+            document.head.appendChild(link);
+        });
+
+        return Promise.all(pending);
+    }
+
+    function updateHead(page) {
+        document.title = page.title;
+
+        ['meta[name="description"]', 'link[rel="canonical"]'].forEach(function(selector) {
+            var current = document.head.querySelector(selector);
+            var next = page.head.querySelector(selector);
+
+            if (current) {
+                current.parentNode.removeChild(current);
+            }
+            if (next) {
+                document.head.appendChild(document.importNode(next, true));
+            }
+        });
+    }
+
+    // The longest nav link path the new page is at or under is current
+    function updateNavigation(path) {
+        var links = document.querySelectorAll('.nav__link');
+        var current = '';
+
+        Array.prototype.forEach.call(links, function(link) {
+            var href = new URL(link.href).pathname;
+            var matches = href === path ||
+                (href !== '/' && href.slice(-1) === '/' && path.indexOf(href) === 0);
+            if (matches && href.length > current.length) {
+                current = href;
+            }
+        });
+
+        Array.prototype.forEach.call(links, function(link) {
+            var active = new URL(link.href).pathname === current;
+            link.classList.toggle('nav__link--active', active);
+            link.classList.toggle('active', active && link.classList.contains('mobile-menu-link'));
+            if (active) {
+                link.setAttribute('aria-current', 'page');
+            } else {
+                link.removeAttribute('aria-current');
+            }
+        });
+    }
+
+    function replaceSpeculationRules(page) {
+        Array.prototype.forEach.call(document.querySelectorAll('script[type="speculationrules"]'), function(script) {
+            script.parentNode.removeChild(script);
+        });
+
+        Array.prototype.forEach.call(page.querySelectorAll('script[type="speculationrules"]'), function(source) {
+            var script = document.createElement('script');
+            script.type = 'speculationrules';
+            script.textContent = source.textContent;
+            document.body.appendChild(script);
+        });
+    }
+
+    // Page scripts wait for DOMContentLoaded, which fired with the first
+    // page: run the listeners they add as soon as they are added
+    function withReadyListeners(run) {
+        var addEventListener = document.addEventListener;
+
+        document.addEventListener = function(type, listener, options) {
+            if (type !== 'DOMContentLoaded') {
+                return addEventListener.call(document, type, listener, options);
+            }
+            setTimeout(function() {
+                var event = new Event('DOMContentLoaded');
+                if (typeof listener === 'function') {
+                    listener.call(document, event);
+                } else {
+                    listener.handleEvent(event);
+                }
+            }, 0);
+        };
+
+        function restore() {
+            document.addEventListener = addEventListener;
+        }
+        return run().then(restore, restore);
+    }
+
+    // The shared chunk (data-shared) runs once per document; page bundles
+    // and inline scripts run on every swap, so the widgets of the new
+    // content initialize even when an earlier page loaded the same bundle
+    function runScripts(page, baseUrl) {
+        var loaded = {};
+        Array.prototype.forEach.call(document.querySelectorAll('script[data-shared][src]'), function(script) {
+            loaded[script.src] = true;
+        });
+
+        var scripts = page.querySelectorAll('script:not([type="speculationrules"])');
+
+        return Array.prototype.reduce.call(scripts, function(previous, source) {
+            return previous.then(function() {
+                var src = source.hasAttribute('src') ? new URL(source.getAttribute('src'), baseUrl).href : '';
+                if (src && source.hasAttribute('data-shared')) {
+                    if (loaded[src]) {
+                        return undefined;
+                    }
+                    loaded[src] = true;
+                }
+
+                var script = document.createElement('script');
+                Array.prototype.forEach.call(source.attributes, function(attribute) {
+                    script.setAttribute(attribute.name, attribute.value);
+                });
+
+                return withReadyListeners(function() {
+                    return new Promise(function(resolve) {
+                        if (src) {
+                            script.async = false;
+                            script.src = src;
+                            script.onload = script.onerror = resolve;
+                        } else {
+                            script.textContent = source.textContent;
+                        }
+                        document.body.appendChild(script);
+                        if (!src) resolve();
+                    });
+                });
+            });
+        }, Promise.resolve());
+    }
+
+    function swap(page, url, scrollY) {
+        updateHead(page);
+
+        var main = document.getElementById('main');
+        var next = document.importNode(page.getElementById('main'), true);
+        main.parentNode.replaceChild(next, main);
+
+        document.body.className = bodyClass;
+        replaceSpeculationRules(page);
+        updateNavigation(new URL(url).pathname);
+
+        if (window.MobileMenu && window.MobileMenu.isOpen()) {
+            window.MobileMenu.close();
+        }
+
+        var hash = new URL(url).hash;
+        var target = hash && document.getElementById(decodeURIComponent(hash.slice(1)));
+        if (typeof scrollY === 'number') {
+            window.scrollTo(0, scrollY);
+        } else if (target) {
+            target.scrollIntoView();
+        } else {
+            window.scrollTo(0, 0);
+        }
+
+        // Move screen readers and keyboard focus to the new content
+        next.setAttribute('tabindex', '-1');
+        next.focus({ preventScroll: true });
+    }
+
+    function navigate(url, state) {
+        if (controller) {
+            controller.abort();
+        }
+        controller = window.AbortController ? new AbortController() : null;
+
+        var main = document.getElementById('main');
+        main.setAttribute('aria-busy', 'true');
+
+        return fetchPage(url, controller && controller.signal)
+            .then(function(result) {
+                var next = new URL(result.url);
+                next.hash = new URL(url).hash;
+
+                return loadStylesheets(result.page, next.href).then(function() {
+                    if (!state) {
+                        history.replaceState(Object.assign({}, history.state, { scrollY: window.scrollY }), '');
+                        history.pushState({ partialNavigation: true }, '', next.href);
+                    }
+                    swap(result.page, next.href, state && state.scrollY);
+                    return runScripts(result.page, next.href);
+                });
+            })
+            .catch(function(error) {
+                if (error.name === 'AbortError') {
+                    return;
+                }
+                main.removeAttribute('aria-busy');
+                location.assign(url);
+            });
+    }
+
+    if ('scrollRestoration' in history) {
+        history.scrollRestoration = 'manual';
+    }
+    history.replaceState(Object.assign({}, history.state, { partialNavigation: true }), '');
+
+    document.addEventListener('click', function(event) {
+        var link = event.target.closest ? event.target.closest('a[href]') : null;
+        if (!link || !isPageLink(link, event)) {
+            return;
+        }
+
+        event.preventDefault();
+        navigate(link.href);
+    });
+
+    window.addEventListener('popstate', function(event) {
+        // Entries of in-page anchors keep the browser's handling
+        if (event.state && event.state.partialNavigation) {
+            navigate(location.href, event.state);
+        }
+    });
+})();
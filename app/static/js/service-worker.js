@@ -0,0 +1,98 @@
+// /app/static/js/service-worker.js
+// Service worker for Adaptive Auto Hub
+// build.py prepends self.SW_BUILD (build ID, precache URLs) and serves the result at /sw.js
+
+(function() {
+    'use strict';
+
+    const BUILD = self.SW_BUILD;
+
+    // Caches of this site; other generations are deleted on activation
+    const CACHE_PREFIX = 'aah-';
+    const ASSET_CACHE = CACHE_PREFIX + 'assets-' + BUILD.build;
+    const PAGE_CACHE = CACHE_PREFIX + 'pages-' + BUILD.build;
+
+    // Content-hashed static file names ('style.3f2a9c1b.css') never change
+    const HASHED_NAME_PATTERN = /\.[0-9a-f]{8}\.[^./]+$/;
+
+    // Pages rendered per visitor (forms with CSRF tokens) are never stored
+    const PRIVATE_PATTERN = /no-store|no-cache|private/i;
+
+    self.addEventListener('install', (event) => {
+        event.waitUntil(
+            caches.open(ASSET_CACHE)
+                .then((cache) => cache.addAll(BUILD.precache))
+                .then(() => self.skipWaiting())
+        );
+    });
+
+    self.addEventListener('activate', (event) => {
+        event.waitUntil(
+            caches.keys()
+                .then((names) => Promise.all(names
+                    .filter((name) => name.startsWith(CACHE_PREFIX) &&
+                        name !== ASSET_CACHE && name !== PAGE_CACHE)
+                    .map((name) => caches.delete(name))))
+                .then(() => self.clients.claim())
+        );
+    });
+
+    function isStorable(response) {
+        return response.ok && response.type === 'basic' && !response.redirected &&
+            !PRIVATE_PATTERN.test(response.headers.get('Cache-Control') || '');
+    }
+
+    // Hashed assets: the cached copy is always current
+    function cacheFirst(event) {
+        return caches.open(ASSET_CACHE).then((cache) =>
+            cache.match(event.request).then((cached) => cached || fetch(event.request)
+                .then((response) => {
+                    if (isStorable(response)) {
+                        event.waitUntil(cache.put(event.request, response.clone()));
+                    }
+                    return response;
+                }))
+        );
+    }
+
+    // Pages: answer from the cache at once, refresh it from the network
+    function staleWhileRevalidate(event) {
+        const network = fetch(event.request).then((response) => {
+            if (!isStorable(response)) {
+                return response;
+            }
+            const copy = response.clone();
+            return caches.open(PAGE_CACHE)
+                .then((cache) => cache.put(event.request, copy))
+                .then(() => response);
+        });
+        event.waitUntil(network.catch(() => undefined));
+
+        return caches.open(PAGE_CACHE)
+            .then((cache) => cache.match(event.request))
+            .then((cached) => cached || network);
+    }
+
+    self.addEventListener('fetch', (event) => {
+        const request = event.request;
+        if (request.method !== 'GET' || request.headers.has('range')) {
+            return;
+        }
+
+        const url = new URL(request.url);
+        if (url.origin !== self.location.origin) {
+            return;
+        }
+
+        if (url.pathname.startsWith(BUILD.staticPrefix)) {
+            if (HASHED_NAME_PATTERN.test(url.pathname)) {
+                event.respondWith(cacheFirst(event));
+            }
+            return;
+        }
+
+        if (request.mode === 'navigate') {
+            event.respondWith(staleWhileRevalidate(event));
+        }
+    });
+})();
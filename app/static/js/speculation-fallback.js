@@ -0,0 +1,44 @@
+// /app/static/js/speculation-fallback.js
+// Prefetch fallback for Adaptive Auto Hub
+// Turns the page's speculation rules into <link rel="prefetch"> where the browser does not support them
+
+(function() {
+    'use strict';
+
+    if (window.HTMLScriptElement && HTMLScriptElement.supports &&
+        HTMLScriptElement.supports('speculationrules')) {
+        return;
+    }
+
+    function addPrefetchLinks() {
+        var scripts = document.querySelectorAll('script[type="speculationrules"]');
+        var seen = {};
+
+        Array.prototype.forEach.call(scripts, function(script) {
+            var rules;
+            try {
+                rules = JSON.parse(script.textContent);
+            } catch (e) {
+                return;
+            }
+
+            (rules.prefetch || []).forEach(function(rule) {
+                (rule.urls || []).forEach(function(url) {
+                    if (seen[url]) return;
+                    seen[url] = true;
+
+                    var link = document.createElement('link');
+                    link.rel = 'prefetch';
+                    link.href = url;
+                    document.head.appendChild(link);
+                });
+            });
+        });
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', addPrefetchLinks);
+    } else {
+        addPrefetchLinks();
+    }
+})();
@@ -0,0 +1,27 @@
+// /app/static/js/sw-register.js
+// Service worker registration for Adaptive Auto Hub
+// Registers the worker the page's <meta name="service-worker"> points to, or removes a stale one
+
+(function() {
+    'use strict';
+
+    if (!('serviceWorker' in navigator)) {
+        return;
+    }
+
+    var meta = document.querySelector('meta[name="service-worker"]');
+
+    if (!meta) {
+        // Disabled (or not built): drop the worker an earlier deploy installed
+        navigator.serviceWorker.getRegistrations().then(function(registrations) {
+            registrations.forEach(function(registration) {
+                registration.unregister();
+            });
+        });
+        return;
+    }
+
+    window.addEventListener('load', function() {
+        navigator.serviceWorker.register(meta.content, { scope: '/' }).catch(function() {});
+    });
+})();
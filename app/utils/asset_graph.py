@@ -0,0 +1,299 @@
+# /app/utils/asset_graph.py
+"""
+Asset reference graph for Adaptive Auto Hub website.
+Crawls pages, templates, route code, CSS and JS for static references and reports dead and broken assets.
+"""
+
+import json
+import os
+import posixpath
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from jinja2 import TemplateError
+
+from .bundler import (
+    CSS_IMPORT_PATTERN, CSS_URL_PATTERN, OUTPUT_DIR, _app_bundle_definitions, _is_local_url
+)
+from .fingerprint import HASHED_NAME_PATTERN
+from .js_splitter import TemplateAnalyzer, find_page_templates
+from .precompress import ENCODINGS
+from .service_worker import SERVICE_WORKER_SOURCE
+from .svg_sprite import ICON_FOLDER, get_icon_sprite
+
+
+REPORT_NAME = 'asset-graph.json'
+
+# Build outputs: referenced through their manifests, never reported as dead
+GENERATED_FOLDERS = (OUTPUT_DIR + '/', 'images/optimized/', 'images/placeholders/')
+
+# Files whose contents may reference other static files
+TEXT_EXTENSIONS = ('.css', '.js', '.mjs', '.webmanifest', '.json', '.svg')
+
+# Images the image pipeline processes
+ORIGINAL_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+TEMPLATE_STATIC_PATTERN = re.compile(
+    r'''url_for\(\s*['"]static['"]\s*,\s*filename\s*=\s*['"]([^'"]+)['"]'''
+)
+JS_RELATIVE_IMPORT_PATTERN = re.compile(
+    r'''(?:\bimport\s*\(?|\bfrom)\s*['"](\.{1,2}/[^'"]+)['"]'''
+)
+
+
+class AssetGraph:
+    """
+    Graph of references from pages, templates and code to static files.
+
+    References are collected from roots (rendered pages, the templates
+    views render, Python source, bundle definitions) and followed through
+    the static text files they reach: CSS url() and @import, JS string
+    literals and imports, web manifests.
+    """
+
+    def __init__(self, static_folder: str, static_url_path: str = '/static'):
+        """
+        Initialize an empty graph.
+
+        Args:
+            static_folder: Path to Flask static folder
+            static_url_path: URL prefix of the static folder
+        """
+        self.static_folder = static_folder
+        self.static_prefix = static_url_path.rstrip('/') + '/'
+        # Root-relative or absolute ('https://host/static/...') static URLs
+        self.static_url_pattern = re.compile(
+            r'''(?<![\w/.:-])(?:(?:https?:)?//[^/\s'"()<>]+)?''' + re.escape(self.static_prefix)
+            + r'''([^\s'"()<>,?#\\]+)'''
+        )
+        # Referenced path to the referrers found pointing at it
+        self.references: Dict[str, Set[str]] = {}
+        self.templates: Set[str] = set()
+        self._crawled: Set[str] = set()
+
+    def _exists(self, path: str) -> bool:
+        return os.path.isfile(os.path.join(self.static_folder, *path.split('/')))
+
+    def _normalize(self, path: str) -> str:
+        """Map a fingerprinted name ('css/style.3f2a9c1b.css') back to the file."""
+        path = posixpath.normpath(path.lstrip('/'))
+        if not self._exists(path):
+            match = HASHED_NAME_PATTERN.match(path)
+            if match and self._exists(match.group('stem') + match.group('ext')):
+                return match.group('stem') + match.group('ext')
+        return path
+
+    def add_reference(self, referrer: str, path: str) -> None:
+        """
+        Record a reference to a static file.
+
+        Args:
+            referrer: What refers to it ('page:/products/', 'css/style.css')
+            path: Path relative to the static folder (may be fingerprinted)
+        """
+        self.references.setdefault(self._normalize(path), set()).add(referrer)
+
+    def add_text(self, referrer: str, text: str) -> None:
+        """Record every static URL ('/static/...') in a page or source file."""
+        for match in self.static_url_pattern.finditer(text):
+            path = match.group(1)
+            # Skip folder prefixes and format strings ('images/{name}.png')
+            if posixpath.splitext(path)[1] and not any(char in path for char in '{}%<$'):
+                self.add_reference(referrer, path)
+
+    def _add_static_file(self, path: str, text: str) -> None:
+        """Record the references of a static text file, relative ones included."""
+        self.add_text(path, text)
+        base = posixpath.dirname(path)
+
+        relative: List[str] = []
+        if path.endswith('.css'):
+            relative += [match.group(2) for match in CSS_IMPORT_PATTERN.finditer(text)]
+            relative += [match.group(2).strip() for match in CSS_URL_PATTERN.finditer(text)]
+        elif path.endswith(('.js', '.mjs')):
+            relative += JS_RELATIVE_IMPORT_PATTERN.findall(text)
+
+        for url in relative:
+            if _is_local_url(url):
+                self.add_reference(path, posixpath.join(base, url.split('?')[0].split('#')[0]))
+
+    def crawl(self) -> None:
+        """Follow references through every reachable static text file."""
+        pending = [path for path in self.references if path not in self._crawled]
+
+        while pending:
+            for path in pending:
+                self._crawled.add(path)
+                if not path.endswith(TEXT_EXTENSIONS) or not self._exists(path):
+                    continue
+
+                try:
+                    with open(os.path.join(self.static_folder, *path.split('/')), 'r',
+                              encoding='utf-8') as f:
+                        self._add_static_file(path, f.read())
+                except (IOError, OSError, UnicodeDecodeError):
+                    continue
+
+            pending = [path for path in self.references if path not in self._crawled]
+
+    def static_files(self) -> List[str]:
+        """Every static file (precompressed siblings excluded)."""
+        files = []
+        for root, _, names in os.walk(self.static_folder):
+            for name in names:
+                if not name.endswith(tuple(ENCODINGS)):
+                    path = os.path.join(root, name)
+                    files.append(os.path.relpath(path, self.static_folder).replace(os.sep, '/'))
+        return sorted(files)
+
+    def broken(self) -> Dict[str, List[str]]:
+        """Referenced paths with no file, to their referrers."""
+        return {path: sorted(referrers) for path, referrers in sorted(self.references.items())
+                if not self._exists(path)}
+
+    def unreferenced(self) -> List[str]:
+        """Static files nothing reaches (build outputs excluded)."""
+        return [path for path in self.static_files()
+                if path not in self.references and not path.startswith(GENERATED_FOLDERS)]
+
+    def report(self, templates: Iterable[str] = ()) -> Dict:
+        """
+        Summarize the graph.
+
+        Args:
+            templates: Every template file, to report those no view reaches
+
+        Returns:
+            dict: references, broken references, unreferenced files and
+                  templates, and the bytes unreferenced files take
+        """
+        unreferenced = self.unreferenced()
+        return {
+            'references': {path: sorted(referrers)
+                           for path, referrers in sorted(self.references.items())},
+            'broken': self.broken(),
+            'unreferenced': unreferenced,
+            'unreferenced_bytes': sum(
+                os.path.getsize(os.path.join(self.static_folder, *path.split('/')))
+                for path in unreferenced
+            ),
+            'unreferenced_templates': sorted(set(templates) - self.templates)
+        }
+
+
+def build_asset_graph(app, base_url: str = 'https://localhost') -> Dict:
+    """
+    Crawl the application's asset references and write the report.
+
+    Args:
+        app: Flask application instance (with bundles loaded)
+        base_url: Site URL pages are rendered against
+
+    Returns:
+        dict: The report (see AssetGraph.report)
+    """
+    from .asset_inliner import load_inline_assets
+    from .freezer import collect_page_urls
+
+    graph = AssetGraph(app.static_folder, app.static_url_path)
+
+    # Images inlined by the last build appear in pages as data URIs; they
+    # still count as page references, or the next selection would drop them
+    inlined = {entry['uri']: path for path, entry in load_inline_assets(app.static_folder).items()
+               if entry.get('html')}
+
+    # Rendered pages: route context values as the templates use them
+    urls, _ = collect_page_urls(app, base_url)
+    client = app.test_client()
+    for url in urls:
+        response = client.get(url, base_url=base_url, headers={'Accept-Encoding': 'identity'})
+        mimetype = response.mimetype or ''
+        if response.status_code == 200 and (mimetype.startswith('text/')
+                                            or mimetype.endswith(('xml', 'json'))):
+            text = response.get_data(as_text=True)
+            graph.add_text(f'page:{url}', text)
+            for uri, path in inlined.items():
+                if uri in text:
+                    graph.add_reference(f'page:{url}', path)
+
+    # Templates views render (with what they extend and include): covers
+    # branches the rendered pages did not take
+    analyzer = TemplateAnalyzer(app.jinja_env, {})
+    for page in find_page_templates(app):
+        graph.templates.update(analyzer.chain(page))
+    for name in sorted(graph.templates):
+        try:
+            source = app.jinja_env.loader.get_source(app.jinja_env, name)[0]
+        except TemplateError:
+            continue
+        for path in TEMPLATE_STATIC_PATTERN.findall(source):
+            graph.add_reference(f'template:{name}', path)
+        graph.add_text(f'template:{name}', source)
+
+    # Route context dicts and other Python source
+    for root, dirs, files in os.walk(app.root_path):
+        dirs[:] = [d for d in dirs if d not in ('__pycache__', 'static', 'templates')]
+        for name in sorted(files):
+            if name.endswith('.py'):
+                path = os.path.join(root, name)
+                with open(path, 'r', encoding='utf-8') as f:
+                    graph.add_text(os.path.relpath(path, os.path.dirname(app.root_path)), f.read())
+
+    for name, bundle in _app_bundle_definitions(app).items():
+        for path in bundle.get('inputs', []):
+            graph.add_reference(f'bundle:{name}', path)
+
+    # Icons reach pages through the sprite
+    sprite = get_icon_sprite(app)
+    for name in sprite.icons if sprite is not None else []:
+        graph.add_reference('sprite:icons', f'{ICON_FOLDER}/{name}.svg')
+
+    # The service worker is generated from its source (build.py)
+    graph.add_reference('build:service-worker', SERVICE_WORKER_SOURCE)
+
+    for path in app.config.get('ASSET_GRAPH_EXTERNAL_FILES', []):
+        graph.add_reference('config:ASSET_GRAPH_EXTERNAL_FILES', path)
+
+    graph.crawl()
+
+    report = graph.report(app.jinja_env.list_templates())
+
+    output_dir = os.path.join(app.static_folder, OUTPUT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, REPORT_NAME), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    return report
+
+
+def load_asset_report(static_folder: str) -> Optional[Dict]:
+    """
+    Load the report written by build_asset_graph().
+
+    Args:
+        static_folder: Path to Flask static folder
+
+    Returns:
+        dict or None if the graph was not built
+    """
+    try:
+        with open(os.path.join(static_folder, OUTPUT_DIR, REPORT_NAME), 'r',
+                  encoding='utf-8') as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def unreferenced_images(static_folder: str) -> Set[str]:
+    """
+    Get the original images nothing references, for the pipeline and deploy to skip.
+
+    Args:
+        static_folder: Path to Flask static folder
+
+    Returns:
+        set: Paths relative to the static folder (empty if the graph was not built)
+    """
+    report = load_asset_report(static_folder) or {}
+    return {path for path in report.get('unreferenced', [])
+            if path.startswith('images/') and path.lower().endswith(ORIGINAL_IMAGE_EXTENSIONS)}
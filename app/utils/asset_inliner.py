@@ -0,0 +1,351 @@
+# /app/utils/asset_inliner.py
+"""
+Small asset inlining for Adaptive Auto Hub website.
+Selects tiny images referenced from few pages at build time and serves them as data URIs in pages and CSS.
+"""
+
+import base64
+import fnmatch
+import json
+import os
+import posixpath
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from flask import request
+
+from .asset_graph import load_asset_report
+from .bundler import OUTPUT_DIR
+from .fingerprint import HASHED_NAME_PATTERN
+from .lcp_hints import _parse_attributes, _with_attributes
+from .page_cache import is_page_cache_hit
+from .picture_upgrade import ResponsiveImages
+
+
+MANIFEST_NAME = 'inline-assets.json'
+
+INLINE_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.svg': 'image/svg+xml',
+}
+
+IMG_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.I)
+
+
+def data_uri(data: bytes, mimetype: str) -> str:
+    """
+    Encode file contents as a data URI.
+
+    SVG is percent-encoded text (smaller than Base64 and still
+    compressible); other images are Base64.
+
+    Args:
+        data: File contents
+        mimetype: Content type
+
+    Returns:
+        str: data: URI, safe inside quoted HTML attributes and CSS url()
+    """
+    if mimetype == 'image/svg+xml':
+        text = ' '.join(data.decode('utf-8').split())
+        return f'data:{mimetype},' + quote(text, safe=" /:=;,.'-")
+    return f'data:{mimetype};base64,' + base64.b64encode(data).decode('ascii')
+
+
+def _smallest_bytes(static_folder: str, path: str,
+                    images: ResponsiveImages) -> Tuple[bytes, str]:
+    """Contents of an image, or of its same-size optimized JPEG when smaller."""
+    with open(os.path.join(static_folder, *path.split('/')), 'rb') as f:
+        data = f.read()
+    mimetype = INLINE_TYPES[posixpath.splitext(path)[1].lower()]
+
+    image = images.lookup(path)
+    if image is not None:
+        # Variants never upscale: the widest is at the original's own width
+        variant = dict(image.variants.get('jpg', [])).get(image.size[0])
+        if variant:
+            with open(os.path.join(static_folder, *variant.split('/')), 'rb') as f:
+                optimized = f.read()
+            if len(optimized) < len(data):
+                data, mimetype = optimized, 'image/jpeg'
+
+    return data, mimetype
+
+
+def select_inline_assets(static_folder: str, references: Dict[str, List[str]],
+                         max_bytes: int = 2048, max_pages: int = 2,
+                         exclude: Iterable[str] = ()) -> Dict[str, Dict]:
+    """
+    Choose the images to inline.
+
+    An image is inlined in pages when at most max_pages pages reference
+    it (every page view downloads it again), and in CSS when a single
+    source stylesheet does (the bundle carries it once). Either way its
+    smallest encoding must fit in max_bytes.
+
+    Args:
+        static_folder: Path to Flask static folder
+        references: Asset graph references (path to referrers)
+        max_bytes: Largest image inlined, in bytes before encoding
+        max_pages: Most pages an image inlined in pages may appear on
+        exclude: fnmatch patterns of paths never inlined
+
+    Returns:
+        dict: Path to {'uri', 'bytes', 'html', 'css'}
+    """
+    exclude = list(exclude)
+    images = ResponsiveImages(static_folder, url_prefix='')
+    selected = {}
+
+    for path, referrers in sorted(references.items()):
+        if (posixpath.splitext(path)[1].lower() not in INLINE_TYPES
+                or any(fnmatch.fnmatch(path, pattern) for pattern in exclude)):
+            continue
+
+        full_path = os.path.join(static_folder, *path.split('/'))
+        if not os.path.isfile(full_path) or not 0 < os.path.getsize(full_path):
+            continue
+
+        pages = [referrer for referrer in referrers if referrer.startswith('page:')]
+        stylesheets = [referrer for referrer in referrers
+                       if referrer.endswith('.css') and not referrer.startswith(OUTPUT_DIR + '/')]
+        html = 0 < len(pages) <= max_pages
+        css = len(stylesheets) == 1
+        if not (html or css):
+            continue
+
+        try:
+            data, mimetype = _smallest_bytes(static_folder, path, images)
+            if len(data) > max_bytes:
+                continue
+            uri = data_uri(data, mimetype)
+        except (IOError, OSError, UnicodeDecodeError):
+            continue
+
+        selected[path] = {'uri': uri, 'bytes': len(data), 'html': html, 'css': css}
+
+    return selected
+
+
+def build_inline_assets(app) -> Dict[str, Dict]:
+    """
+    Select the application's inline assets and write the manifest.
+
+    Reads the asset graph report, so run after build_asset_graph() and
+    image processing; CSS bundles built afterwards pick the manifest up.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        dict: The manifest (empty if the asset graph was not built)
+    """
+    report = load_asset_report(app.static_folder) or {}
+    exclude = (list(app.config.get('INLINE_ASSETS_EXCLUDE', []))
+               + list(app.config.get('ASSET_GRAPH_EXTERNAL_FILES', [])))
+
+    selected = select_inline_assets(
+        app.static_folder, report.get('references', {}),
+        max_bytes=app.config.get('INLINE_ASSET_MAX_BYTES', 2048),
+        max_pages=app.config.get('INLINE_ASSET_MAX_PAGES', 2),
+        exclude=exclude
+    )
+
+    output_dir = os.path.join(app.static_folder, OUTPUT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(selected, f, indent=2, sort_keys=True)
+
+    return selected
+
+
+def load_inline_assets(static_folder: str) -> Dict[str, Dict]:
+    """
+    Load the manifest written by build_inline_assets().
+
+    Args:
+        static_folder: Path to Flask static folder
+
+    Returns:
+        dict: Path to entry (empty if not built)
+    """
+    try:
+        with open(os.path.join(static_folder, OUTPUT_DIR, MANIFEST_NAME), 'r',
+                  encoding='utf-8') as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def lookup_inline_asset(assets: Dict[str, Dict], filename: str) -> Optional[Dict]:
+    """
+    Get the manifest entry of a static file.
+
+    Args:
+        assets: Inline asset manifest
+        filename: Path relative to the static folder (may be fingerprinted)
+
+    Returns:
+        dict or None if the file is not inlined
+    """
+    entry = assets.get(filename)
+    if entry is None:
+        match = HASHED_NAME_PATTERN.match(filename)
+        if match:
+            entry = assets.get(match.group('stem') + match.group('ext'))
+    return entry
+
+
+class AssetInliner:
+    """
+    Replace static image URLs of rendered pages with data URIs.
+
+    Plain <img src> (no srcset, not the prioritized LCP image) and
+    data-lqip placeholders are inlined. Rewrites are memoized by tag,
+    like PictureUpgrader.
+    """
+
+    def __init__(self, assets: Dict[str, Dict], static_prefix: str = '/static/',
+                 max_entries: int = 512):
+        """
+        Initialize inliner.
+
+        Args:
+            assets: Inline asset manifest
+            static_prefix: URL prefix of the static folder
+            max_entries: Maximum number of memoized tags
+        """
+        self.assets = {path: entry for path, entry in assets.items() if entry.get('html')}
+        self.static_prefix = static_prefix
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def uri(self, url: str) -> Optional[str]:
+        """Data URI replacing a static URL on pages, if it is inlined."""
+        path = urlsplit(url).path
+        if not path.startswith(self.static_prefix):
+            return None
+        entry = lookup_inline_asset(self.assets, posixpath.normpath(path[len(self.static_prefix):]))
+        return entry['uri'] if entry else None
+
+    def _rewrite(self, tag: str) -> str:
+        with self._lock:
+            rewritten = self._entries.get(tag)
+            if rewritten is not None:
+                self._entries.move_to_end(tag)
+                return rewritten
+
+        attributes = _parse_attributes(tag)
+        replaced = []
+
+        # srcset candidates win over src; the LCP image has a matching preload
+        if ('srcset' not in attributes
+                and attributes.get('fetchpriority', '').lower() != 'high'):
+            replaced.append('src')
+        replaced.append('data-lqip')
+
+        add = [(name, self.uri(attributes[name])) for name in replaced if attributes.get(name)]
+        add = [(name, uri) for name, uri in add if uri]
+        rewritten = _with_attributes(tag, tuple(name for name, _ in add), add) if add else tag
+
+        with self._lock:
+            self._entries[tag] = rewritten
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return rewritten
+
+    def inline(self, html: str) -> str:
+        """
+        Inline a page's small images.
+
+        Args:
+            html: Rendered page
+
+        Returns:
+            str: Page with data URIs (html itself if none changed)
+        """
+        if not self.assets:
+            return html
+
+        pieces: List[str] = []
+        position = 0
+
+        for match in IMG_TAG_PATTERN.finditer(html):
+            tag = match.group(0)
+            rewritten = self._rewrite(tag)
+            if rewritten != tag:
+                pieces.append(html[position:match.start()])
+                pieces.append(rewritten)
+                position = match.end()
+
+        if not pieces:
+            return html
+
+        pieces.append(html[position:])
+        return ''.join(pieces)
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+
+def get_asset_inliner(app=None) -> Optional[AssetInliner]:
+    """
+    Get the asset inliner attached to an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        AssetInliner or None if inlining is disabled
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('asset_inliner')
+
+
+def init_asset_inliner(app) -> Optional[AssetInliner]:
+    """
+    Load the inline asset manifest and register the page response filter.
+
+    Call after the page cache and before the LCP hints are configured:
+    the filter then runs after the picture upgrade and the hints (which
+    need the static URLs) and cached pages are stored inlined.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        AssetInliner or None if INLINE_ASSETS_ENABLED is off
+    """
+    if not app.config.get('INLINE_ASSETS_ENABLED') or not app.has_static_folder:
+        return None
+
+    inliner = AssetInliner(load_inline_assets(app.static_folder),
+                           app.static_url_path.rstrip('/') + '/')
+    app.extensions['asset_inliner'] = inliner
+
+    @app.after_request
+    def inline_response_assets(response):
+        if (response.mimetype != 'text/html' or response.direct_passthrough
+                or response.is_streamed or response.content_encoding
+                or response.status_code in (204, 304) or request.method == 'HEAD'
+                or is_page_cache_hit()):
+            return response
+
+        html = response.get_data(as_text=True)
+        inlined = inliner.inline(html)
+        if inlined is not html:
+            response.set_data(inlined)
+        return response
+
+    return inliner
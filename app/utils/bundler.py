@@ -0,0 +1,784 @@
+# /app/utils/bundler.py
+"""
+CSS/JS bundler for Adaptive Auto Hub website.
+Pure-Python build of config.ASSET_BUNDLES: @import and ES module resolution,
+minification, fingerprinted outputs, source maps and incremental rebuilds.
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import jsmin
+except ImportError:  # pragma: no cover - listed in requirements.txt
+    jsmin = None
+
+from .css_image_set import rewrite_rule
+from .css_minifier import minify_css
+from .css_pruner import CSSPruner, get_pruner, split_css_rules
+from .media_split import media_slug, split_media_chunks
+from .picture_upgrade import ResponsiveImages
+from .precompress import ENCODINGS
+
+
+OUTPUT_DIR = 'gen'
+MANIFEST_NAME = 'bundles.json'
+PRUNE_REPORT_NAME = 'css-prune-report.json'
+
+CSS_IMPORT_PATTERN = re.compile(
+    r'@import\s+(?:url\(\s*)?([\'"]?)([^\'")\s;]+)\1\s*\)?\s*([^;]*);'
+)
+CSS_URL_PATTERN = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+JS_IMPORT_PATTERN = re.compile(
+    r'^[ \t]*import\s+(\w+)\s+from\s+([\'"])(\.{1,2}/[^\'"]+)\2\s*;?[ \t]*$', re.M
+)
+JS_EXPORT_DEFAULT_PATTERN = re.compile(r'^[ \t]*export\s+default\s+(\w+)\s*;?[ \t]*$', re.M)
+JS_MODULE_SYNTAX_PATTERN = re.compile(r'^[ \t]*(import|export)\b', re.M)
+
+BASE64_DIGITS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+# (source file, first source line, text) - one minified chunk per output line
+Chunk = Tuple[str, int, str]
+
+
+class BundleError(Exception):
+    """Raised when a bundle cannot be resolved or built."""
+
+
+def _is_local_url(url: str) -> bool:
+    """Check whether a CSS url() points at a file relative to the stylesheet."""
+    return not re.match(r'^(?:[a-z][a-z0-9+.-]*:|/|#)', url, re.I)
+
+
+def _encode_vlq(value: int) -> str:
+    """Encode an integer as a source map Base64 VLQ."""
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    encoded = ''
+
+    while True:
+        digit = value & 31
+        value >>= 5
+        if value:
+            digit |= 32
+        encoded += BASE64_DIGITS[digit]
+        if not value:
+            return encoded
+
+
+def _blank_out(match: re.Match) -> str:
+    """Replace a statement with newlines so later line numbers stay put."""
+    return '\n' * match.group(0).count('\n')
+
+
+class Bundler:
+    """
+    Build-time bundler for the static folder.
+
+    Each bundle lists its input files in cascade/execution order.
+    CSS @import statements are inlined with url() references rebased
+    to the output directory; JS files using default import/export are
+    ordered by their dependency graph and wrapped in a private scope.
+    CSS bundles with 'split_media': True get one extra stylesheet per
+    top-level @media condition; with image_set, background images that
+    have optimized variants are upgraded to image-set(), and url()s of
+    inline_assets become data URIs. The manifest
+    records every input's hash so unchanged bundles are skipped on the
+    next build, and the outputs of the last keep_generations builds of
+    each bundle, which stay on disk for pages cached before a deploy.
+    """
+
+    def __init__(self, static_folder: str, bundles: Dict[str, Dict],
+                 minify: bool = True, pruner: Optional[CSSPruner] = None,
+                 media_split_min_bytes: int = 0, image_set: bool = False,
+                 inline_assets: Optional[Dict[str, Dict]] = None,
+                 keep_generations: int = 2):
+        """
+        Initialize bundler.
+
+        Args:
+            static_folder: Path to Flask static folder
+            bundles: Bundle definitions ({'name': {'inputs': [...]}})
+            minify: Minify outputs (css_minifier/jsmin)
+            pruner: Unused-CSS pruner for bundles with 'prune': True
+            media_split_min_bytes: Smallest @media condition split into
+                                   its own stylesheet
+            image_set: Rewrite CSS background images to image-set() over
+                       the variants in images/optimized
+            inline_assets: Inline asset manifest (asset_inliner); entries
+                           allowed in CSS replace their url()s
+            keep_generations: Superseded builds of a bundle kept on disk
+        """
+        self.static_folder = static_folder
+        self.bundles = bundles
+        self.minify = minify
+        self.pruner = pruner
+        self.media_split_min_bytes = media_split_min_bytes
+        self.image_set = image_set
+        self._images: Optional[ResponsiveImages] = None
+        self.inline_assets = {path: entry for path, entry in (inline_assets or {}).items()
+                              if entry.get('css')}
+        self.keep_generations = keep_generations
+
+        self.output_dir = os.path.join(static_folder, OUTPUT_DIR)
+        self.manifest_path = os.path.join(self.output_dir, MANIFEST_NAME)
+
+    def load_manifest(self) -> Dict[str, Dict]:
+        """Load the manifest written by the last build (empty if none)."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def build(self, force: bool = False) -> Dict[str, str]:
+        """
+        Build every bundle whose inputs changed.
+
+        Args:
+            force: Rebuild all bundles regardless of the manifest
+
+        Returns:
+            dict: Bundle name to 'built' or 'unchanged'
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        previous = self.load_manifest()
+        manifest = {}
+        results = {}
+
+        for name, spec in self.bundles.items():
+            files = self.dependencies(name)
+            inputs = {path: self._hash_file(path) for path in files}
+            entry = previous.get(name)
+
+            if (not force and entry
+                    and entry.get('inputs') == inputs
+                    and entry.get('minified') == self.minify
+                    and entry.get('pruned') == self._prune_digest(name)
+                    and entry.get('split_media') == self._media_split_setting(name)
+                    and entry.get('image_set') == self._image_set_digest(name)
+                    and entry.get('inlined') == self._inline_digest(name)
+                    and all(os.path.exists(self._abs(path)) for path in _entry_files(entry))):
+                manifest[name] = entry
+                results[name] = 'unchanged'
+                continue
+
+            manifest[name] = self.build_bundle(name, inputs)
+            results[name] = 'built'
+
+            if entry:
+                # Pages cached before this build (HTTP caches, the service
+                # worker) still link the previous outputs
+                current = _entry_files(manifest[name])
+                generations = [[path for path in files if path not in current]
+                               for files in [_entry_files(entry)] + entry.get('previous', [])]
+                generations = [files for files in generations if files]
+                kept = generations[:self.keep_generations]
+                manifest[name]['previous'] = kept
+                in_use = set(current).union(*kept)
+                for files in generations[self.keep_generations:]:
+                    self._remove_files([path for path in files if path not in in_use])
+
+        # Bundles no longer defined leave no files behind
+        for name, entry in previous.items():
+            if name not in manifest:
+                for files in [_entry_files(entry)] + entry.get('previous', []):
+                    self._remove_files(files)
+
+        self._write_atomic(self.manifest_path,
+                           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+        if self.pruner is not None and self.pruner.report:
+            self._write_report(self.pruner.report)
+
+        return results
+
+    def dependencies(self, name: str) -> List[str]:
+        """
+        Get every file a bundle is built from, in output order.
+
+        Args:
+            name: Bundle name
+
+        Returns:
+            list: Static-relative paths (inputs plus imported files)
+        """
+        inputs = self.bundles[name]['inputs']
+
+        if self._bundle_type(name) == 'css':
+            files: List[str] = []
+            for path in inputs:
+                for source, _, _ in self._resolve_css(path, ()):
+                    if source not in files:
+                        files.append(source)
+            return files
+
+        return self._resolve_js(inputs)
+
+    def build_bundle(self, name: str, inputs: Dict[str, str]) -> Dict:
+        """
+        Build one bundle and write its outputs and source maps.
+
+        Args:
+            name: Bundle name
+            inputs: Hash of every dependency (recorded in the manifest)
+
+        Returns:
+            dict: Manifest entry
+        """
+        bundle_type = self._bundle_type(name)
+
+        if bundle_type == 'css':
+            chunks = self._css_chunks(name)
+            header = ''
+            footer = ''
+            if self.bundles[name].get('split_media'):
+                parts = split_media_chunks(chunks, self.media_split_min_bytes)
+            else:
+                parts = {'': chunks}
+        else:
+            chunks, is_module = self._js_chunks(name)
+            # Modules keep their top-level names out of the global scope
+            header = "(function(){'use strict';\n" if is_module else ''
+            footer = '\n})();' if is_module else ''
+            parts = {'': chunks}
+
+        entry = self._write_output(name, bundle_type, parts.pop(''), header, footer)
+        entry.update({
+            'inputs': inputs,
+            'minified': self.minify,
+            'pruned': self._prune_digest(name),
+            'split_media': self._media_split_setting(name),
+            'image_set': self._image_set_digest(name),
+            'inlined': self._inline_digest(name)
+        })
+
+        if parts:
+            entry['media'] = [
+                dict(self._write_output(f'{name}.{media_slug(media)}', bundle_type, part, '', ''),
+                     media=media)
+                for media, part in parts.items()
+            ]
+
+        return entry
+
+    def _write_output(self, stem: str, bundle_type: str, chunks: List[Chunk],
+                      header: str, footer: str) -> Dict:
+        """Write one fingerprinted output file and its source map."""
+        body = header + '\n'.join(text for _, _, text in chunks) + footer
+        digest = hashlib.md5(body.encode('utf-8')).hexdigest()[:8]
+
+        output = posixpath.join(OUTPUT_DIR, f'{stem}.{digest}.{bundle_type}')
+        map_name = f'{posixpath.basename(output)}.map'
+
+        if bundle_type == 'css':
+            comment = f'\n/*# sourceMappingURL={map_name} */\n'
+        else:
+            comment = f'\n//# sourceMappingURL={map_name}\n'
+
+        source_map = self._source_map(output, chunks, header.count('\n'))
+
+        self._write_atomic(self._abs(output), (body + comment).encode('utf-8'))
+        self._write_atomic(self._abs(output) + '.map',
+                           json.dumps(source_map, separators=(',', ':')).encode('utf-8'))
+
+        return {'output': output, 'map': output + '.map', 'bytes': len(body)}
+
+    def _resolve_css(self, path: str, stack: Tuple[str, ...]) -> List[Tuple[str, str, str]]:
+        """
+        Flatten a stylesheet and its @imports.
+
+        Returns:
+            list: (source path, text with @imports removed, media query) in cascade order
+        """
+        if path in stack:
+            raise BundleError(f"Circular @import: {' -> '.join(stack + (path,))}")
+
+        text = self._read(path)
+        parts = []
+
+        for match in CSS_IMPORT_PATTERN.finditer(text):
+            url, media = match.group(2), match.group(3).strip()
+            if not _is_local_url(url):
+                raise BundleError(f'{path}: remote @import {url} cannot be bundled')
+
+            imported = posixpath.normpath(posixpath.join(posixpath.dirname(path), url))
+            for source, imported_text, imported_media in self._resolve_css(imported, stack + (path,)):
+                parts.append((source, imported_text, imported_media or media))
+
+        parts.append((path, CSS_IMPORT_PATTERN.sub(_blank_out, text), ''))
+        return parts
+
+    def _css_chunks(self, name: str) -> List[Chunk]:
+        """Split, rebase, prune and minify a CSS bundle into top-level rule chunks."""
+        chunks = []
+        pruner = self._pruner_for(name)
+
+        for path in self.bundles[name]['inputs']:
+            for source, text, media in self._resolve_css(path, ()):
+                text = self._rebase_urls(source, text)
+                original = kept = 0
+
+                for line, rule in split_css_rules(text):
+                    if pruner is not None:
+                        original += len(rule.encode('utf-8'))
+                        rule = pruner.prune_rule(rule)
+                        kept += len(rule.encode('utf-8'))
+                    for rule in self._with_image_sets(self._inline_urls(rule)):
+                        if media and rule:
+                            rule = f'@media {media}{{{rule}}}'
+                        minified = self._minify_css(rule)
+                        if minified:
+                            chunks.append((source, line, minified))
+
+                if pruner is not None:
+                    pruner.record(source, original, kept)
+
+        return chunks
+
+    def _prune_digest(self, name: str) -> Optional[str]:
+        """Usage digest a pruned bundle was built against (None if unpruned)."""
+        pruner = self._pruner_for(name)
+        return pruner.digest if pruner is not None else None
+
+    def _media_split_setting(self, name: str) -> Optional[int]:
+        """Threshold a media-split bundle was built with (None if not split)."""
+        return self.media_split_min_bytes if self.bundles[name].get('split_media') else None
+
+    def _referenced_files(self, name: str) -> List[str]:
+        """Static paths a CSS bundle's sources point at with url()."""
+        paths = set()
+        for source in self.dependencies(name):
+            source_dir = posixpath.dirname(source)
+            for match in CSS_URL_PATTERN.finditer(self._read(source)):
+                url = match.group(2).strip()
+                if _is_local_url(url):
+                    url = url.split('?')[0].split('#')[0]
+                    paths.add(posixpath.normpath(posixpath.join(source_dir, url)))
+        return sorted(paths)
+
+    def _responsive_images(self) -> ResponsiveImages:
+        """Image variants, with URLs relative to the output directory."""
+        if self._images is None:
+            self._images = ResponsiveImages(self.static_folder, url_prefix='../')
+        return self._images
+
+    def _image_set_digest(self, name: str) -> Optional[str]:
+        """Variants a CSS bundle's image-set()s were built from (None if not rewritten)."""
+        if not self.image_set or self._bundle_type(name) != 'css':
+            return None
+
+        # Only the bundle's own images: variants of other images written
+        # by image processing leave it unchanged
+        images = self._responsive_images()
+        variants = {}
+        for path in self._referenced_files(name):
+            image = images.lookup(path)
+            variants[path] = image.variants if image is not None else None
+        return hashlib.md5(json.dumps(variants, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _with_image_sets(self, rule: str) -> List[str]:
+        """Upgrade a rule's background images; their @media rules follow it."""
+        if not self.image_set or not rule:
+            return [rule]
+
+        images = self._responsive_images()
+
+        def resolve(url: str):
+            if not _is_local_url(url):
+                return None
+            return images.lookup(posixpath.normpath(posixpath.join(OUTPUT_DIR, url)))
+
+        return rewrite_rule(rule, resolve)
+
+    def _inline_digest(self, name: str) -> Optional[str]:
+        """Inline assets a CSS bundle was built with (None if none)."""
+        if not self.inline_assets or self._bundle_type(name) != 'css':
+            return None
+
+        # Only the data URIs that end up in the bundle: selections for
+        # pages and other bundles leave it unchanged
+        used = {path: self.inline_assets[path]['uri']
+                for path in self._referenced_files(name) if path in self.inline_assets}
+        if not used:
+            return None
+        return hashlib.md5(json.dumps(used, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _inline_urls(self, rule: str) -> str:
+        """Replace url()s of inlined assets with their data URIs."""
+        if not self.inline_assets or 'url(' not in rule:
+            return rule
+
+        def inline(match: re.Match) -> str:
+            url = match.group(2).strip()
+            if not _is_local_url(url):
+                return match.group(0)
+
+            path = posixpath.normpath(posixpath.join(OUTPUT_DIR, url.split('?')[0].split('#')[0]))
+            entry = self.inline_assets.get(path)
+            return f'url("{entry["uri"]}")' if entry else match.group(0)
+
+        return CSS_URL_PATTERN.sub(inline, rule)
+
+    def _pruner_for(self, name: str) -> Optional[CSSPruner]:
+        """Get the pruner if the bundle opts into unused-CSS removal."""
+        return self.pruner if self.bundles[name].get('prune') else None
+
+    def _rebase_urls(self, source: str, text: str) -> str:
+        """Rewrite relative url() references for the output directory."""
+        source_dir = posixpath.dirname(source)
+
+        def rebase(match: re.Match) -> str:
+            quote, url = match.group(1), match.group(2).strip()
+            if not _is_local_url(url):
+                return match.group(0)
+
+            target = posixpath.normpath(posixpath.join(source_dir, url))
+            return f'url({quote}{posixpath.relpath(target, OUTPUT_DIR)}{quote})'
+
+        return CSS_URL_PATTERN.sub(rebase, text)
+
+    def _minify_css(self, css: str) -> str:
+        """Minify one CSS chunk."""
+        if not self.minify:
+            return css.strip()
+        return minify_css(css)
+
+    def _resolve_js(self, inputs: List[str]) -> List[str]:
+        """Order JS files so every imported module precedes its importers."""
+        ordered: List[str] = []
+
+        def visit(path: str, stack: Tuple[str, ...]) -> None:
+            if path in ordered:
+                return
+            if path in stack:
+                raise BundleError(f"Circular import: {' -> '.join(stack + (path,))}")
+
+            for match in JS_IMPORT_PATTERN.finditer(self._read(path)):
+                dependency = posixpath.normpath(
+                    posixpath.join(posixpath.dirname(path), match.group(3))
+                )
+                visit(dependency, stack + (path,))
+
+            ordered.append(path)
+
+        for path in inputs:
+            visit(path, ())
+
+        return ordered
+
+    def _js_chunks(self, name: str) -> Tuple[List[Chunk], bool]:
+        """Strip module syntax from and minify each file of a JS bundle."""
+        files = self._resolve_js(self.bundles[name]['inputs'])
+        exports = {}
+        chunks = []
+        is_module = False
+
+        for path in files:
+            text = self._read(path)
+
+            for match in JS_IMPORT_PATTERN.finditer(text):
+                dependency = posixpath.normpath(
+                    posixpath.join(posixpath.dirname(path), match.group(3))
+                )
+                if exports.get(dependency) != match.group(1):
+                    raise BundleError(
+                        f'{path}: import {match.group(1)} must match the default '
+                        f'export of {dependency}'
+                    )
+
+            export = JS_EXPORT_DEFAULT_PATTERN.search(text)
+            if export:
+                exports[path] = export.group(1)
+
+            stripped = JS_IMPORT_PATTERN.sub(_blank_out, text)
+            stripped = JS_EXPORT_DEFAULT_PATTERN.sub(_blank_out, stripped)
+
+            leftover = JS_MODULE_SYNTAX_PATTERN.search(stripped)
+            if leftover:
+                line = stripped.count('\n', 0, leftover.start()) + 1
+                raise BundleError(f'{path}:{line}: unsupported module syntax')
+
+            is_module = is_module or stripped != text
+
+            minified = self._minify_js(stripped)
+            chunks.extend(self._locate_lines(path, stripped, minified))
+
+        return chunks, is_module
+
+    def _minify_js(self, js: str) -> str:
+        """Minify one JS file."""
+        if self.minify and jsmin is not None:
+            # Keep a statement boundary between concatenated files
+            return jsmin.jsmin(js).strip().rstrip(';') + ';'
+        return js.strip()
+
+    @staticmethod
+    def _locate_lines(path: str, source: str, output: str) -> List[Chunk]:
+        """
+        Map each output line back to the source line it starts on.
+
+        Minifiers keep token order, so the first token of every output
+        line is searched forward from the previous match.
+        """
+        chunks = []
+        cursor = 0
+        line = 0
+
+        for text in output.split('\n'):
+            token = re.match(r'\s*(\w+|\S)', text)
+            if token:
+                found = source.find(token.group(1), cursor)
+                if found != -1:
+                    line += source.count('\n', cursor, found)
+                    cursor = found + len(token.group(1))
+            chunks.append((path, line, text))
+
+        return chunks
+
+    def _source_map(self, output: str, chunks: List[Chunk], offset: int) -> Dict:
+        """Build a line-granular source map (one segment per output line)."""
+        sources: List[str] = []
+        lines = [''] * offset
+        previous_source = 0
+        previous_line = 0
+
+        for source, line, _ in chunks:
+            if source not in sources:
+                sources.append(source)
+            index = sources.index(source)
+
+            lines.append('A' + _encode_vlq(index - previous_source)
+                         + _encode_vlq(line - previous_line) + 'A')
+            previous_source, previous_line = index, line
+
+        output_dir = posixpath.dirname(output)
+        return {
+            'version': 3,
+            'file': posixpath.basename(output),
+            'sources': [posixpath.relpath(source, output_dir) for source in sources],
+            'names': [],
+            'mappings': ';'.join(lines)
+        }
+
+    def _write_report(self, report: Dict[str, Dict[str, int]]) -> None:
+        """Merge this build's pruning figures into the saved report."""
+        path = os.path.join(self.output_dir, PRUNE_REPORT_NAME)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                merged = json.load(f)
+        except (IOError, OSError, ValueError):
+            merged = {}
+
+        merged.update(report)
+        self._write_atomic(path, json.dumps(merged, indent=2, sort_keys=True).encode('utf-8'))
+
+    def _remove_files(self, files: Sequence[str]) -> None:
+        """Delete outputs of a superseded bundle build with their compressed siblings."""
+        for relative in files:
+            path = self._abs(relative)
+            for candidate in [path] + [path + extension for extension in ENCODINGS]:
+                if os.path.exists(candidate):
+                    os.remove(candidate)
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        """Write a file so concurrent readers never see it half-written."""
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _bundle_type(self, name: str) -> str:
+        """Bundle type ('css' or 'js') from its first input."""
+        extension = posixpath.splitext(self.bundles[name]['inputs'][0])[1].lstrip('.')
+        if extension not in ('css', 'js'):
+            raise BundleError(f'Bundle {name}: unsupported input type .{extension}')
+        return extension
+
+    def _abs(self, path: str) -> str:
+        return os.path.join(self.static_folder, *path.split('/'))
+
+    def _read(self, path: str) -> str:
+        try:
+            with open(self._abs(path), 'r', encoding='utf-8') as f:
+                return f.read()
+        except (IOError, OSError) as e:
+            raise BundleError(f'Cannot read {path}: {e}') from e
+
+    def _hash_file(self, path: str) -> str:
+        with open(self._abs(path), 'rb') as f:
+            return hashlib.md5(f.read()).hexdigest()
+
+
+def _entry_files(entry: Dict) -> List[str]:
+    """Every output and source map a manifest entry points to."""
+    files = []
+    for output in [entry] + entry.get('media', []):
+        files.extend(output[key] for key in ('output', 'map') if output.get(key))
+    return files
+
+
+def get_bundle_definitions() -> Dict[str, Dict]:
+    """Get the single bundle definition from config.ASSET_BUNDLES."""
+    from config import ASSET_BUNDLES
+    return ASSET_BUNDLES
+
+
+def _app_bundle_definitions(app) -> Dict[str, Dict]:
+    """config.ASSET_BUNDLES plus the per-page JS bundles planned at startup."""
+    bundles = dict(get_bundle_definitions())
+    split = app.extensions.get('js_split')
+    if split is not None:
+        bundles.update(split.bundles)
+    return bundles
+
+
+def _make_bundler(app) -> Bundler:
+    """Create the application's bundler, with a pruner when enabled."""
+    bundles = _app_bundle_definitions(app)
+    pruner = None
+    inline_assets = None
+
+    if app.config.get('INLINE_ASSETS_ENABLED'):
+        from .asset_inliner import load_inline_assets
+        inline_assets = load_inline_assets(app.static_folder)
+
+    if app.config.get('CSS_PRUNE_ENABLED') and any(spec.get('prune') for spec in bundles.values()):
+        pruner = get_pruner(app)
+
+    return Bundler(app.static_folder, bundles,
+                   minify=not app.config.get('ASSETS_DEBUG', False), pruner=pruner,
+                   media_split_min_bytes=app.config.get('CSS_MEDIA_SPLIT_MIN_BYTES', 0),
+                   image_set=app.config.get('CSS_IMAGE_SET_ENABLED', False),
+                   inline_assets=inline_assets,
+                   keep_generations=app.config.get('BUNDLE_KEEP_GENERATIONS', 2))
+
+
+def build_bundles(app, force: bool = False) -> Dict[str, str]:
+    """
+    Build the application's bundles.
+
+    Args:
+        app: Flask application instance
+        force: Rebuild every bundle
+
+    Returns:
+        dict: Bundle name to 'built' or 'unchanged'
+    """
+    return _make_bundler(app).build(force=force)
+
+
+def init_bundles(app) -> None:
+    """
+    Load the bundle manifest and register the asset_urls template helper.
+
+    With ASSETS_DEBUG the source files are linked individually; with
+    ASSETS_AUTO_BUILD stale bundles (including the per-page JS bundles
+    of init_js_split) are rebuilt at startup.
+
+    Args:
+        app: Flask application instance
+    """
+    manifest = {}
+
+    if not app.config.get('ASSETS_DEBUG'):
+        bundler = _make_bundler(app)
+
+        if app.config.get('ASSETS_AUTO_BUILD'):
+            try:
+                bundler.build()
+            except (BundleError, OSError) as e:
+                app.logger.error(f'Asset bundle build failed: {e}')
+
+        manifest = bundler.load_manifest()
+        if not manifest:
+            app.logger.warning('No asset bundles built - run build.py; '
+                               'linking source files instead')
+
+    app.extensions['asset_bundles'] = manifest
+    app.jinja_env.globals['asset_urls'] = asset_urls
+
+
+def asset_links(name: str, app=None) -> List[Tuple[str, str]]:
+    """
+    Get the URLs a template should load for a bundle, with their media.
+
+    Args:
+        name: Bundle name from config.ASSET_BUNDLES
+        app: Flask application instance (optional)
+
+    Returns:
+        list: (URL, media query or '') for the fingerprinted bundle and its
+              media-split stylesheets, or for the input files when bundles
+              are not built (development)
+    """
+    from flask import url_for
+
+    if app is None:
+        from flask import current_app as app
+
+    entry = app.extensions.get('asset_bundles', {}).get(name)
+    if entry:
+        return [(url_for('static', filename=entry['output']), '')] + [
+            (url_for('static', filename=split['output']), split['media'])
+            for split in entry.get('media', [])
+        ]
+
+    # Browsers resolve @import and ES module imports of the inputs themselves
+    return [(url_for('static', filename=path), '')
+            for path in _app_bundle_definitions(app)[name]['inputs']]
+
+
+def asset_urls(name: str, app=None) -> List[str]:
+    """
+    Get the URLs a template should load for a bundle.
+
+    Args:
+        name: Bundle name from config.ASSET_BUNDLES
+        app: Flask application instance (optional)
+
+    Returns:
+        list: The fingerprinted bundle URLs, or the input file URLs when
+              bundles are not built (development)
+    """
+    return [url for url, _ in asset_links(name, app)]
+
+
+def bundle_fonts(name: str, app=None) -> List[str]:
+    """
+    Get the web fonts a built CSS bundle references.
+
+    Args:
+        name: Bundle name from config.ASSET_BUNDLES
+        app: Flask application instance (optional)
+
+    Returns:
+        list: Static paths of its .woff2 fonts (empty when not built)
+    """
+    if app is None:
+        from flask import current_app as app
+
+    entry = app.extensions.get('asset_bundles', {}).get(name)
+    if not entry or not entry['output'].endswith('.css'):
+        return []
+
+    try:
+        with open(os.path.join(app.static_folder, entry['output']), 'r', encoding='utf-8') as f:
+            css = f.read()
+    except (IOError, OSError):
+        return []
+
+    fonts = []
+    for match in CSS_URL_PATTERN.finditer(css):
+        url = match.group(2).strip().split('?')[0].split('#')[0]
+        if _is_local_url(url) and url.lower().endswith('.woff2'):
+            path = posixpath.normpath(posixpath.join(OUTPUT_DIR, url))
+            if path not in fonts:
+                fonts.append(path)
+    return fonts
@@ -0,0 +1,361 @@
+# /app/utils/critical_css.py
+"""
+Per-route critical CSS for Adaptive Auto Hub website.
+Extracts above-the-fold rules at build time and inlines them from memory at request time.
+"""
+
+import base64
+import hashlib
+import json
+import os
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from flask import g, request
+from markupsafe import Markup, escape
+
+from .bundler import OUTPUT_DIR, asset_links
+from .css_minifier import minify_css
+from .css_pruner import CSSPruner, SelectorUsage, split_css_rules
+from .fingerprint import get_fingerprints
+
+
+MANIFEST_NAME = 'critical-css.json'
+
+# Elements counted as above the fold when a page has no <section>
+FOLD_ELEMENT_LIMIT = 200
+
+# Elements whose contents never render
+HIDDEN_CONTAINERS = {'script', 'template', 'noscript', 'style'}
+
+
+class FoldParser(HTMLParser):
+    """
+    Collect the classes, ids and tags of a page's above-the-fold markup.
+
+    The fold is everything in <body> up to the end of the first <section>
+    (the page hero), which covers the skip link, the header and the
+    navigation. Stylesheets linked anywhere in the page are recorded too,
+    with their media attribute.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.usage = SelectorUsage()
+        self.stylesheets: List[Tuple[str, str]] = []
+        self._in_body = False
+        self._done = False
+        self._hidden_depth = 0
+        self._section_depth = 0
+        self._elements = 0
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+
+        if tag == 'link':
+            rel = (attributes.get('rel') or '').lower().split()
+            if attributes.get('href') and ('stylesheet' in rel or (
+                    'preload' in rel and attributes.get('as') == 'style')):
+                self.stylesheets.append((attributes['href'], attributes.get('media') or ''))
+            return
+
+        if tag == 'body':
+            self._in_body = True
+        if not self._in_body or self._done:
+            return
+
+        if tag in HIDDEN_CONTAINERS:
+            self._hidden_depth += 1
+        if self._hidden_depth:
+            return
+
+        self.usage.tags.add(tag)
+        self.usage.tokens.update((attributes.get('class') or '').split())
+        if attributes.get('id'):
+            self.usage.tokens.add(attributes['id'])
+
+        if tag == 'section':
+            self._section_depth += 1
+
+        self._elements += 1
+        if self._elements >= FOLD_ELEMENT_LIMIT:
+            self._done = True
+
+    def handle_endtag(self, tag):
+        if not self._in_body or self._done:
+            return
+
+        if tag in HIDDEN_CONTAINERS and self._hidden_depth:
+            self._hidden_depth -= 1
+        elif tag == 'section' and self._section_depth and not self._hidden_depth:
+            self._section_depth -= 1
+            if not self._section_depth:
+                self._done = True
+
+
+class CriticalCSS:
+    """
+    In-memory critical CSS blobs keyed by URL path and endpoint.
+
+    Pages sharing a template (every industry detail page) usually share
+    one blob, so blobs are stored once by content hash. The endpoint
+    entry serves URLs the build did not render.
+    """
+
+    def __init__(self, routes: Dict[str, str], endpoints: Dict[str, str],
+                 blobs: Dict[str, str]):
+        """
+        Initialize store.
+
+        Args:
+            routes: URL path to blob key
+            endpoints: Endpoint name to blob key
+            blobs: Blob key to minified CSS
+        """
+        self.routes = routes
+        self.endpoints = endpoints
+        self.blobs = blobs
+
+    @classmethod
+    def load(cls, path: str) -> Optional['CriticalCSS']:
+        """
+        Load a manifest written by build_critical_css().
+
+        Args:
+            path: Manifest path
+
+        Returns:
+            CriticalCSS or None if the manifest is missing or unreadable
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        return cls(data.get('routes', {}), data.get('endpoints', {}), data.get('blobs', {}))
+
+    def lookup(self, path: str, endpoint: Optional[str] = None) -> str:
+        """
+        Get the critical CSS of a page.
+
+        Args:
+            path: Request path
+            endpoint: Request endpoint, used when the path was not rendered
+
+        Returns:
+            str: Minified CSS or '' if the page has none
+        """
+        key = self.routes.get(path) or self.endpoints.get(endpoint or '')
+        return self.blobs.get(key, '') if key else ''
+
+    def csp_sources(self) -> List[str]:
+        """CSP style-src hash sources allowing every blob as an inline <style>."""
+        sources = []
+        for css in self.blobs.values():
+            digest = base64.b64encode(hashlib.sha256(css.encode('utf-8')).digest())
+            sources.append(f"'sha256-{digest.decode('ascii')}'")
+        return sorted(sources)
+
+    @property
+    def digest(self) -> str:
+        """Hash of every blob and its routes; changes with each rebuild."""
+        joined = json.dumps([self.routes, self.endpoints, self.blobs], sort_keys=True)
+        return hashlib.md5(joined.encode('utf-8')).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+
+def _read_stylesheet(app, href: str) -> Optional[str]:
+    """Read the static file a stylesheet URL points to."""
+    path = urlsplit(href).path
+    prefix = app.static_url_path.rstrip('/') + '/'
+    if not path.startswith(prefix):
+        return None
+
+    filename = path[len(prefix):]
+    fingerprints = get_fingerprints(app)
+    if fingerprints is not None and not os.path.isfile(os.path.join(app.static_folder, filename)):
+        filename, _ = fingerprints.resolve(filename)
+
+    try:
+        with open(os.path.join(app.static_folder, *filename.split('/')), 'r',
+                  encoding='utf-8') as f:
+            return f.read()
+    except (IOError, OSError):
+        return None
+
+
+def extract_critical_css(app, html: str) -> str:
+    """
+    Compute the critical CSS of one rendered page.
+
+    Args:
+        app: Flask application instance
+        html: Rendered page
+
+    Returns:
+        str: Minified rules that can match the page's above-the-fold markup
+    """
+    parser = FoldParser()
+    parser.feed(html)
+    parser.close()
+
+    pruner = CSSPruner(parser.usage)
+    rules = []
+
+    for href, media in dict.fromkeys(parser.stylesheets):
+        css = _read_stylesheet(app, href)
+        if css:
+            pruned = ''.join(pruner.prune_rule(rule) for _, rule in split_css_rules(css))
+            # Media-split stylesheets hold their rules unwrapped
+            if media and media.lower() != 'all' and pruned.strip():
+                pruned = f'@media {media}{{{pruned}}}'
+            rules.append(pruned)
+
+    return minify_css(''.join(rules))
+
+
+def build_critical_css(app, base_url: str = 'https://localhost') -> Dict[str, int]:
+    """
+    Render every page and write the per-route critical CSS manifest.
+
+    Args:
+        app: Flask application instance (with bundles loaded)
+        base_url: Site URL pages are rendered against
+
+    Returns:
+        dict: URL path to critical CSS size in bytes
+    """
+    from .freezer import collect_page_urls
+
+    urls, _ = collect_page_urls(app, base_url)
+    client = app.test_client()
+    adapter = app.url_map.bind('localhost')
+
+    routes: Dict[str, str] = {}
+    endpoints: Dict[str, str] = {}
+    blobs: Dict[str, str] = {}
+    sizes: Dict[str, int] = {}
+
+    for url in urls:
+        response = client.get(url, base_url=base_url, headers={'Accept-Encoding': 'identity'})
+        if response.status_code != 200 or response.mimetype != 'text/html':
+            continue
+
+        css = extract_critical_css(app, response.get_data(as_text=True))
+        if not css:
+            continue
+
+        key = hashlib.md5(css.encode('utf-8')).hexdigest()[:8]
+        blobs[key] = css
+        routes[url] = key
+        endpoints.setdefault(adapter.match(url)[0], key)
+        sizes[url] = len(css.encode('utf-8'))
+
+    output_dir = os.path.join(app.static_folder, OUTPUT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'routes': routes, 'endpoints': endpoints, 'blobs': blobs}, f,
+                  indent=2, sort_keys=True)
+
+    return sizes
+
+
+def get_critical_css(app=None) -> Optional[CriticalCSS]:
+    """
+    Get the critical CSS store attached to an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        CriticalCSS or None if critical CSS is disabled or not built
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('critical_css')
+
+
+def critical_css() -> Markup:
+    """
+    Get the current page's critical CSS for an inline <style>.
+
+    Once a page has inlined its critical CSS, stylesheet_tags() stops
+    render-blocking and defers the full stylesheets.
+
+    Returns:
+        Markup: Minified CSS or '' if the page has none
+    """
+    store = get_critical_css()
+    css = store.lookup(request.path, request.endpoint) if store is not None else ''
+    g.critical_css_inlined = bool(css)
+    return Markup(css)
+
+
+def stylesheet_tags(bundle: str) -> Markup:
+    """
+    Link a CSS bundle, without blocking render when critical CSS is inlined.
+
+    With critical CSS the bundle is only preloaded here and applied by
+    deferred_stylesheet_tags() at the end of <body>, which needs no
+    inline script (the CSP allows none). Media-split stylesheets carry
+    their media attribute, so browsers fetch non-matching ones at low
+    priority without blocking render.
+
+    Args:
+        bundle: Bundle name from config.ASSET_BUNDLES
+
+    Returns:
+        Markup: <link> tags
+    """
+    links = [(escape(url), f' media="{escape(media)}"' if media else '')
+             for url, media in asset_links(bundle)]
+
+    if not g.get('critical_css_inlined'):
+        return Markup('\n'.join(f'<link rel="stylesheet" href="{url}"{media}>'
+                                for url, media in links))
+
+    g.setdefault('deferred_stylesheets', []).extend(links)
+    return Markup('\n'.join(f'<link rel="preload" href="{url}" as="style"{media}>'
+                            for url, media in links))
+
+
+def deferred_stylesheet_tags() -> Markup:
+    """Apply the stylesheets stylesheet_tags() preloaded (end of <body>)."""
+    return Markup('\n'.join(f'<link rel="stylesheet" href="{url}"{media}>'
+                            for url, media in g.get('deferred_stylesheets', [])))
+
+
+def init_critical_css(app) -> Optional[CriticalCSS]:
+    """
+    Load built critical CSS into memory and register the template helpers.
+
+    Pages are served with the stylesheets linked normally until build.py
+    has written the manifest.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        CriticalCSS or None if disabled or not built
+    """
+    store = None
+
+    if app.config.get('CRITICAL_CSS_ENABLED') and not app.config.get('ASSETS_DEBUG'):
+        store = CriticalCSS.load(os.path.join(app.static_folder, OUTPUT_DIR, MANIFEST_NAME))
+        if store is None:
+            app.logger.warning('No critical CSS built - run build.py; '
+                               'stylesheets will block rendering')
+        else:
+            app.extensions['critical_css'] = store
+
+    app.jinja_env.globals.update(
+        critical_css=critical_css,
+        stylesheet_tags=stylesheet_tags,
+        deferred_stylesheet_tags=deferred_stylesheet_tags
+    )
+    return store
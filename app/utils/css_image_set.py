@@ -0,0 +1,111 @@
+# /app/utils/css_image_set.py
+"""
+CSS background image upgrade for Adaptive Auto Hub website.
+Rewrites background url() references to image-set() over the optimized variants, per viewport width.
+"""
+
+import re
+from typing import Callable, List, Optional
+
+from .css_pruner import COMMENT_PATTERN, GROUPING_AT_RULES, split_css_rules
+from .picture_upgrade import ResponsiveImage, SOURCE_TYPES
+
+
+URL_PATTERN = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)', re.I)
+
+# background / background-image declarations of a style rule body
+BACKGROUND_DECLARATION_PATTERN = re.compile(
+    r'(?P<lead>^|[;{])(?P<space>\s*)(?P<property>background(?:-image)?)\s*:(?P<value>[^;{}]*)',
+    re.I
+)
+
+# image-set() types, best first; JPEG variants are the last resort
+IMAGE_SET_TYPES = SOURCE_TYPES + (('jpg', 'image/jpeg'),)
+
+Resolver = Callable[[str], Optional[ResponsiveImage]]
+
+
+def image_set(image: ResponsiveImage, width: int) -> str:
+    """
+    Build the image-set() of one variant width.
+
+    Args:
+        image: Variants of the image
+        width: Variant width
+
+    Returns:
+        str: image-set() listing each format available at that width
+    """
+    candidates = []
+    for image_format, mimetype in IMAGE_SET_TYPES:
+        url = dict(image.variants.get(image_format, [])).get(width)
+        if url:
+            candidates.append(f'url("{url}") type("{mimetype}")')
+    return f'image-set({", ".join(candidates)})'
+
+
+def _widths(image: ResponsiveImage) -> List[int]:
+    """Variant widths with a JPEG fallback, narrowest first."""
+    return [width for width, _ in image.variants.get('jpg', [])]
+
+
+def rewrite_rule(rule: str, resolve: Resolver) -> List[str]:
+    """
+    Upgrade the background images of one top-level CSS rule.
+
+    A background or background-image declaration with a single url()
+    that has variants keeps its url() as the fallback and is followed
+    by a background-image: image-set() of the widest variants. An
+    @media (max-width) rule per narrower variant width follows the
+    rule, so small viewports download small images; inside grouping
+    at-rules (@media, @supports) they are nested in the same block.
+
+    Args:
+        rule: One top-level rule (url() values as they appear in the output)
+        resolve: Maps a url() value to its variants (None if it has none)
+
+    Returns:
+        list: The rewritten rule followed by its @media rules
+    """
+    brace = rule.find('{')
+    if brace == -1 or 'url(' not in rule.lower():
+        return [rule]
+
+    header = ' '.join(COMMENT_PATTERN.sub('', rule[:brace]).split())
+    end = rule.rfind('}')
+
+    if header.startswith('@'):
+        if not header.lower().startswith(GROUPING_AT_RULES):
+            return [rule]
+        inner = [rewritten for _, text in split_css_rules(rule[brace + 1:end])
+                 for rewritten in rewrite_rule(text, resolve)]
+        return [rule[:brace + 1] + ''.join(inner) + rule[end:]]
+
+    overrides = []
+
+    def upgrade(match: re.Match) -> str:
+        value = match.group('value')
+        urls = URL_PATTERN.findall(value)
+        if len(urls) != 1 or 'image-set(' in value.lower():
+            return match.group(0)
+
+        image = resolve(urls[0][1].strip())
+        widths = _widths(image) if image is not None else []
+        if not widths:
+            return match.group(0)
+
+        important = ' !important' if '!important' in value.lower() else ''
+        overrides.append((image, important))
+        return (f'{match.group(0).rstrip()};{match.group("space")}'
+                f'background-image: {image_set(image, widths[-1])}{important}')
+
+    rules = [rule[:brace] + BACKGROUND_DECLARATION_PATTERN.sub(upgrade, rule[brace:end])
+             + rule[end:]]
+
+    # Widest first: the narrowest matching max-width comes last and wins
+    for image, important in overrides:
+        for width in reversed(_widths(image)[:-1]):
+            rules.append(f'@media (max-width: {width}px) {{ {header} {{ '
+                         f'background-image: {image_set(image, width)}{important} }} }}')
+
+    return rules
@@ -0,0 +1,285 @@
+# /app/utils/css_minifier.py
+"""
+CSS minifier for Adaptive Auto Hub website.
+Single-pass tokenizing minifier that keeps strings, url() values and calc() spacing intact.
+"""
+
+import re
+from typing import List, Tuple, Union
+
+
+# One linear scan splits the stylesheet into free text and four token
+# kinds: atoms copied verbatim (comments, strings, unquoted url()), plain
+# declaration blocks (no strings or comments, minified in one go) and the
+# { } ; separators everything else is assembled from. The leading
+# lookahead lets the regex engine skip plain text at C speed.
+TOKEN_PATTERN = re.compile(r'''
+    (?=[/"'uU{};])
+    (?:
+        (?P<atom>/\*.*?(?:\*/|\Z)
+               |"(?:[^"\\\n]|\\.)*"?
+               |'(?:[^'\\\n]|\\.)*'?
+               |url\(\s*[^\s"'()]*\s*\))
+      | \{(?P<block>[^{}"'/]*(?:/(?!\*)[^{}"'/]*)*)\}
+      | (?P<separator>[{};])
+    )
+''', re.S | re.X | re.I)
+
+URL_PATTERN = re.compile(r'(url\([^)]*\))', re.I)
+
+# Spaces that carry no meaning once whitespace runs are collapsed to one.
+# str.replace() and patterns starting with a literal keep this at C speed.
+SELECTOR_SPACES = (' ,', ', ', ' >', '> ', ' +', '+ ', ' ~', '~ ', '( ', ' )', ': ')
+# At-rule preludes may hold calc() and friends, where + and - need their spaces
+AT_RULE_SPACES = (' ,', ', ', '( ', ' )', ': ')
+DECLARATION_SPACES_AFTER = (': ', ', ', '; ', '! ', '( ')
+DECLARATION_SPACE_BEFORE_PATTERN = re.compile(r' (?=[;,:!)])')
+
+HEX_COLOR_PATTERN = re.compile(r'#((?:[0-9a-f]{3}){1,2}|[0-9a-f]{4}|[0-9a-f]{8})(?![\w-])', re.I)
+# Zero lengths outside parentheses: calc() and friends reject unitless zeros
+ZERO_UNIT_PATTERN = re.compile(
+    r'([\s:,])[+-]?(?:0+\.?0*|\.0+)(?:px|em|rem|ex|ch|vw|vh|vmin|vmax|cm|mm|in|pt|pc)'
+    r'(?![\w%.])(?![^(]*\))', re.I
+)
+LEADING_ZERO_PATTERN = re.compile(r'([\s:,(*/+-])0+(?=\.\d)')
+
+# Blocks whose contents are rules rather than declarations
+GROUPING_AT_RULES = ('@media', '@supports', '@document', '@layer', '@container',
+                     '@keyframes', '@-webkit-keyframes', '@-moz-keyframes')
+
+# No space is needed after these characters...
+SELECTOR_DROP_AFTER = ';,>+~(:'
+AT_RULE_DROP_AFTER = ';,(:'
+DECLARATION_DROP_AFTER = ';,:!('
+# ...or before these
+SELECTOR_DROP_BEFORE = ',>+~)'
+AT_RULE_DROP_BEFORE = ',)'
+DECLARATION_DROP_BEFORE = ',:!)'
+
+# A rule is either raw text (at-rules, comments) or (selector, declarations)
+Item = Union[str, Tuple[str, str]]
+
+
+def _short_hex(match) -> str:
+    digits = match.group(1).lower()
+    if len(digits) in (6, 8) and all(digits[i] == digits[i + 1] for i in range(0, len(digits), 2)):
+        digits = digits[::2]
+    return '#' + digits
+
+
+def _drop_spaces(text: str, spaces: Tuple[str, ...]) -> str:
+    """Remove the spaces in collapsed text that carry no meaning."""
+    for pair in spaces:
+        if pair in text:
+            text = text.replace(pair, pair.strip())
+    return text
+
+
+def _minify_declaration_text(text: str) -> str:
+    """Collapse whitespace in declaration text and drop what is not needed."""
+    text = ' '.join(text.split())
+    if ' ' in text:
+        text = _drop_spaces(DECLARATION_SPACE_BEFORE_PATTERN.sub('', text),
+                            DECLARATION_SPACES_AFTER)
+    return text
+
+
+def _shorten_values(text: str, custom_property: bool = False) -> str:
+    """Shorten colours and numbers in collapsed declaration text."""
+    if '#' in text:
+        text = HEX_COLOR_PATTERN.sub(_short_hex, text)
+
+    if '0' in text:
+        # Custom properties may end up in calc(); keep their units
+        if '--' not in text:
+            if not custom_property:
+                text = ZERO_UNIT_PATTERN.sub(r'\g<1>0', ':' + text)[1:]
+        else:
+            text = ';'.join(
+                part if part.startswith('--') else ZERO_UNIT_PATTERN.sub(r'\g<1>0', ':' + part)[1:]
+                for part in text.split(';')
+            )
+
+    if '.' in text:
+        text = LEADING_ZERO_PATTERN.sub(r'\1', ':' + text)[1:]
+
+    return text
+
+
+def _minify_declarations(block: str) -> str:
+    """Minify a declaration block that contains no strings or comments."""
+    text = _minify_declaration_text(block)
+
+    if 'url(' in text or 'URL(' in text:
+        # Unquoted url() values are kept verbatim
+        pieces = URL_PATTERN.split(text)
+        pieces[::2] = [_shorten_values(piece) for piece in pieces[::2]]
+        pieces[1::2] = ['url(' + piece[4:-1].strip() + ')' for piece in pieces[1::2]]
+        text = ''.join(pieces)
+    else:
+        text = _shorten_values(text)
+
+    if ';;' in text:
+        text = re.sub(';{2,}', ';', text)
+    return text.strip(';')
+
+
+def _add_rule(items: List[Item], selector: str, declarations: str) -> None:
+    """Append a rule, merging it into an identical neighbour."""
+    if items and type(items[-1]) is tuple:
+        last_selector, last_declarations = items[-1]
+
+        if last_selector == selector:
+            if last_declarations != declarations:
+                items[-1] = (selector, f'{last_declarations};{declarations}')
+            return
+
+        # One unknown vendor pseudo-class would invalidate the whole list
+        if (last_declarations == declarations
+                and ':-' not in last_selector and ':-' not in selector):
+            items[-1] = (f'{last_selector},{selector}', declarations)
+            return
+
+    items.append((selector, declarations))
+
+
+def _render(items: List[Item]) -> str:
+    return ''.join(item if type(item) is str else f'{item[0]}{{{item[1]}}}' for item in items)
+
+
+def minify_css(css: str) -> str:
+    """
+    Minify a stylesheet in one pass.
+
+    Comments are removed (except /*! license comments at the top level),
+    whitespace is dropped wherever it carries no meaning, colours and
+    zero lengths are shortened, empty rules are removed and adjacent
+    rules with the same selector or the same declarations are merged.
+    Strings and url() values are never changed, and the spaces calc()
+    needs around + and - are kept, in declarations and at-rule preludes
+    alike (only selector combinators are compacted).
+
+    Args:
+        css: Stylesheet source
+
+    Returns:
+        str: Minified stylesheet
+    """
+    # Each level: [holds declarations, prelude, items]
+    levels = [[False, '', []]]
+    items = levels[0][2]
+    declarations = False
+
+    current: List[str] = []
+    space = False
+    custom_property = False
+
+    # split() yields (text, atom, block, separator) groups; the trailing
+    # ';' flushes text after the last token
+    parts = iter(TOKEN_PATTERN.split(css + ';'))
+
+    for text, atom, block, separator in zip(parts, parts, parts, parts):
+        if text:
+            collapsed = _minify_declaration_text(text) if declarations else ' '.join(text.split())
+
+            if collapsed:
+                if declarations:
+                    if not current:
+                        custom_property = collapsed.startswith('--')
+                    collapsed = _shorten_values(collapsed, custom_property)
+                    drop_after, drop_before = DECLARATION_DROP_AFTER, DECLARATION_DROP_BEFORE
+                elif (current[0] if current else collapsed).startswith('@'):
+                    if ' ' in collapsed:
+                        collapsed = _drop_spaces(collapsed, AT_RULE_SPACES)
+                    drop_after, drop_before = AT_RULE_DROP_AFTER, AT_RULE_DROP_BEFORE
+                else:
+                    if ' ' in collapsed:
+                        collapsed = _drop_spaces(collapsed, SELECTOR_SPACES)
+                    drop_after, drop_before = SELECTOR_DROP_AFTER, SELECTOR_DROP_BEFORE
+
+                if ((space or text[0].isspace()) and current
+                        and current[-1][-1] not in drop_after and collapsed[0] not in drop_before):
+                    current.append(' ')
+                current.append(collapsed)
+                space = text[-1].isspace()
+            else:
+                space = True
+
+        if atom:
+            if atom[1] == '*':
+                if atom.startswith('/*!') and not current and not declarations:
+                    items.append(atom)
+                continue
+
+            if atom[0] in 'uU':
+                atom = 'url(' + atom[4:-1].strip() + ')'
+
+            if declarations:
+                drop_after = DECLARATION_DROP_AFTER
+            elif current and current[0].startswith('@'):
+                drop_after = AT_RULE_DROP_AFTER
+            else:
+                drop_after = SELECTOR_DROP_AFTER
+            if space and current and current[-1][-1] not in drop_after:
+                current.append(' ')
+            current.append(atom)
+            space = False
+            continue
+
+        space = False
+
+        if block is not None:
+            prelude = ''.join(current)
+            current = []
+            if prelude.lower().startswith(GROUPING_AT_RULES):
+                inner = ' '.join(block.split())
+                if inner:
+                    items.append(f'{prelude}{{{inner}}}')
+            else:
+                body = _minify_declarations(block)
+                if body:
+                    _add_rule(items, prelude, body)
+
+        elif separator == '{':
+            prelude = ''.join(current)
+            declarations = not prelude.lower().startswith(GROUPING_AT_RULES)
+            levels.append([declarations, prelude, []])
+            items = levels[-1][2]
+            current = []
+
+        elif separator == '}':
+            if len(levels) > 1:
+                holds_declarations, prelude, children = levels.pop()
+                items = levels[-1][2]
+
+                if holds_declarations:
+                    body = ''.join(current).rstrip(';')
+                    if body:
+                        _add_rule(items, prelude, body)
+                else:
+                    if current:
+                        children.append(''.join(current))
+                    inner = _render(children)
+                    if inner:
+                        items.append(f'{prelude}{{{inner}}}')
+
+                declarations = levels[-1][0]
+            current = []
+
+        elif declarations:
+            if current and current[-1][-1] != ';':
+                current.append(';')
+
+        elif current:
+            items.append(''.join(current) + ';')
+            current = []
+
+    # Unbalanced input: close the blocks still open
+    while len(levels) > 1:
+        holds_declarations, prelude, children = levels.pop()
+        body = (_render(children) + ''.join(current)).rstrip(';')
+        current = []
+        if body:
+            levels[-1][2].append(f'{prelude}{{{body}}}')
+
+    return _render(levels[0][2])
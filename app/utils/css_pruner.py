@@ -0,0 +1,319 @@
+# /app/utils/css_pruner.py
+"""
+Unused CSS pruning for Adaptive Auto Hub website.
+Removes rules whose selectors match nothing in the templates, scripts or view code.
+"""
+
+import fnmatch
+import hashlib
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+STRING_PATTERN = re.compile(r'"((?:[^"\\\n]|\\.)*)"|\'((?:[^\'\\\n]|\\.)*)\'|`((?:[^`\\]|\\.)*)`')
+TOKEN_PATTERN = re.compile(r'[A-Za-z_][\w-]*')
+TAG_PATTERN = re.compile(r'<([a-zA-Z][a-zA-Z0-9-]*)')
+COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.S)
+
+# Selector pieces that never restrict matching
+SELECTOR_NOISE_PATTERN = re.compile(r'\[[^\]]*\]|::?[\w-]+(?:\([^)]*\))?')
+CLASS_PATTERN = re.compile(r'\.((?:[\w-]|\\.)+)')
+ID_PATTERN = re.compile(r'#((?:[\w-]|\\.)+)')
+TYPE_PATTERN = re.compile(r'(?:^|[\s>+~(,])([a-zA-Z][a-zA-Z0-9-]*)')
+
+# Type selectors present on every page
+ALWAYS_USED_TAGS = {'html', 'body', 'head'}
+
+# At-rules whose blocks contain ordinary rules to prune
+GROUPING_AT_RULES = ('@media', '@supports', '@layer', '@container', '@document')
+
+USAGE_SOURCES = (
+    ('templates', ('.html', '.xml', '.j2')),
+    ('blueprints', ('.html', '.py')),
+    (os.path.join('static', 'js'), ('.js', '.mjs')),
+    ('utils', ('.py',))
+)
+
+
+def split_css_rules(text: str) -> List[Tuple[int, str]]:
+    """
+    Split CSS into top-level statements and blocks.
+
+    Args:
+        text: Stylesheet source
+
+    Returns:
+        list: (0-based line of the first significant character, text)
+    """
+    rules = []
+    depth = 0
+    start = 0
+    first_line: Optional[int] = None
+    line = 0
+    i = 0
+    length = len(text)
+
+    while i < length:
+        char = text[i]
+
+        if char == '/' and text.startswith('*', i + 1):
+            end = text.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            line += text.count('\n', i, end)
+            i = end
+            continue
+
+        if char == '\n':
+            line += 1
+        elif not char.isspace() and first_line is None:
+            first_line = line
+
+        if char in ('"', "'"):
+            end = i + 1
+            while end < length and text[end] != char:
+                end += 2 if text[end] == '\\' else 1
+            line += text.count('\n', i, end)
+            i = end + 1
+            continue
+
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        if (char == '}' and depth == 0) or (char == ';' and depth == 0):
+            rules.append((first_line or 0, text[start:i + 1]))
+            start = i + 1
+            first_line = None
+
+        i += 1
+
+    if first_line is not None and text[start:].strip():
+        rules.append((first_line, text[start:]))
+
+    return rules
+
+
+def _split_selector_list(header: str) -> List[str]:
+    """Split a selector list on top-level commas."""
+    selectors = []
+    depth = 0
+    current = ''
+
+    for char in header:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char == ',' and depth == 0:
+            selectors.append(current)
+            current = ''
+        else:
+            current += char
+
+    selectors.append(current)
+    return [selector.strip() for selector in selectors if selector.strip()]
+
+
+class SelectorUsage:
+    """
+    Class names, ids and tags the site can put into the DOM.
+
+    Collected conservatively: every word inside a string literal of a
+    template, script or view module counts as a possible class or id,
+    and words ending in '-' or '_' (e.g. 'icon--' before a Jinja
+    expression) match any name with that prefix.
+    """
+
+    def __init__(self):
+        self.tokens: Set[str] = set()
+        self.prefixes: Set[str] = set()
+        self.tags: Set[str] = set(ALWAYS_USED_TAGS)
+
+    def add_source(self, text: str) -> None:
+        """
+        Record the names used by one template, script or module.
+
+        Args:
+            text: File contents
+        """
+        self.tags.update(tag.lower() for tag in TAG_PATTERN.findall(text))
+
+        for match in STRING_PATTERN.finditer(text):
+            literal = next(group for group in match.groups() if group is not None)
+            self.tags.update(tag.lower() for tag in TAG_PATTERN.findall(literal))
+
+            for token in TOKEN_PATTERN.findall(literal):
+                if token.endswith(('-', '_')):
+                    self.prefixes.add(token)
+                else:
+                    self.tokens.add(token)
+
+    def has_name(self, name: str) -> bool:
+        """Check whether a class or id may appear in the DOM."""
+        return name in self.tokens or any(name.startswith(prefix) for prefix in self.prefixes)
+
+    def has_tag(self, tag: str) -> bool:
+        """Check whether an element type may appear in the DOM."""
+        tag = tag.lower()
+        return tag in self.tags or tag in self.tokens
+
+    @property
+    def digest(self) -> str:
+        """Hash of the collected names; changes when any source does."""
+        joined = '\n'.join(sorted(self.tokens) + ['-'] + sorted(self.prefixes)
+                           + ['-'] + sorted(self.tags))
+        return hashlib.md5(joined.encode('utf-8')).hexdigest()
+
+
+def collect_usage(app_root: str) -> SelectorUsage:
+    """
+    Scan templates, scripts and view code for selector usage.
+
+    Args:
+        app_root: Path of the app package (Flask app.root_path)
+
+    Returns:
+        SelectorUsage
+    """
+    usage = SelectorUsage()
+
+    for relative_dir, extensions in USAGE_SOURCES:
+        for root, dirs, files in os.walk(os.path.join(app_root, relative_dir)):
+            dirs[:] = [d for d in dirs if d != '__pycache__']
+            for name in files:
+                if name.endswith(extensions):
+                    with open(os.path.join(root, name), 'r', encoding='utf-8',
+                              errors='replace') as f:
+                        usage.add_source(f.read())
+
+    return usage
+
+
+class CSSPruner:
+    """
+    Drop CSS rules and selectors that cannot match any page.
+
+    Grouping at-rules (@media, @supports) are pruned recursively and
+    removed when empty; @font-face, @keyframes and other at-rules are
+    always kept. Names matching a safelist pattern are never pruned.
+    """
+
+    def __init__(self, usage: SelectorUsage, safelist: Iterable[str] = ()):
+        """
+        Initialize pruner.
+
+        Args:
+            usage: Names found in templates and scripts
+            safelist: fnmatch patterns of class/id names to always keep
+        """
+        self.usage = usage
+        self.safelist = list(safelist)
+        self.report: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def digest(self) -> str:
+        """Identify the usage data and safelist a pruned output depends on."""
+        return hashlib.md5(
+            f"{self.usage.digest}:{','.join(self.safelist)}".encode('utf-8')
+        ).hexdigest()
+
+    def _name_used(self, name: str) -> bool:
+        name = name.replace('\\', '')
+        return (self.usage.has_name(name)
+                or any(fnmatch.fnmatchcase(name, pattern) for pattern in self.safelist))
+
+    def selector_used(self, selector: str) -> bool:
+        """
+        Check whether a single complex selector may match something.
+
+        Args:
+            selector: Selector such as '.nav__menu > li a:hover'
+
+        Returns:
+            bool: False only if a class, id or tag in it is never used
+        """
+        simple = SELECTOR_NOISE_PATTERN.sub(' ', selector)
+
+        for name in CLASS_PATTERN.findall(simple) + ID_PATTERN.findall(simple):
+            if not self._name_used(name):
+                return False
+
+        without_names = CLASS_PATTERN.sub(' ', ID_PATTERN.sub(' ', simple))
+        for tag in TYPE_PATTERN.findall(without_names):
+            if not self.usage.has_tag(tag):
+                return False
+
+        return True
+
+    def prune_rule(self, rule: str) -> str:
+        """
+        Prune one top-level rule or at-rule.
+
+        Args:
+            rule: Rule text as returned by split_css_rules
+
+        Returns:
+            str: Pruned rule text ('' if nothing is left)
+        """
+        brace = rule.find('{')
+        if brace == -1:
+            return rule
+
+        header = COMMENT_PATTERN.sub('', rule[:brace]).strip()
+        body = rule[brace:]
+
+        if header.startswith('@'):
+            if not header.lower().startswith(GROUPING_AT_RULES):
+                return rule
+
+            children = [child for _, child in split_css_rules(body[1:body.rfind('}')])]
+            pruned = [self.prune_rule(child) for child in children]
+            if pruned == children:
+                return rule
+            return f"{header}{{{''.join(pruned)}}}" if ''.join(pruned).strip() else ''
+
+        selectors = _split_selector_list(header)
+        kept = [selector for selector in selectors if self.selector_used(selector)]
+        if len(kept) == len(selectors):
+            return rule
+        if not kept:
+            return ''
+
+        return ','.join(kept) + body
+
+    def prune(self, css: str, source: str = '') -> str:
+        """
+        Prune a stylesheet and record removed bytes for the report.
+
+        Args:
+            css: Stylesheet text
+            source: Name used in the report
+
+        Returns:
+            str: Pruned stylesheet
+        """
+        pruned = ''.join(self.prune_rule(rule) for _, rule in split_css_rules(css))
+        self.record(source, len(css.encode('utf-8')), len(pruned.encode('utf-8')))
+        return pruned
+
+    def record(self, source: str, original: int, pruned: int) -> None:
+        """Add a file's byte counts to the per-file report."""
+        entry = self.report.setdefault(source, {'original_bytes': 0, 'pruned_bytes': 0})
+        entry['original_bytes'] += original
+        entry['pruned_bytes'] += pruned
+        entry['removed_bytes'] = entry['original_bytes'] - entry['pruned_bytes']
+
+
+def get_pruner(app) -> CSSPruner:
+    """
+    Build a pruner from the application's templates, scripts and safelist.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        CSSPruner
+    """
+    return CSSPruner(collect_usage(app.root_path),
+                     safelist=app.config.get('CSS_PRUNE_SAFELIST', []))
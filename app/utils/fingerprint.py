@@ -0,0 +1,151 @@
+# /app/utils/fingerprint.py
+"""
+Static asset fingerprinting for Adaptive Auto Hub website.
+Maps static files to content-hashed URLs ('css/style.3f2a9c1b.css') for immutable caching.
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from .precompress import ENCODINGS
+
+
+# Cache lifetime for fingerprinted URLs (their content can never change)
+FINGERPRINT_MAX_AGE = 31536000
+
+HASHED_NAME_PATTERN = re.compile(r'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{8})(?P<ext>\.[^./]+)$')
+
+
+class StaticFingerprints:
+    """
+    In-memory map of static file paths to content hashes.
+
+    Built once at startup by walking the static folder; a deploy
+    restarts the app, so the map always matches the files on disk.
+    """
+
+    HASH_LENGTH = 8
+
+    def __init__(self, static_folder: str):
+        """
+        Initialize and build the fingerprint map.
+
+        Args:
+            static_folder: Path to Flask static folder
+        """
+        self.static_folder = static_folder
+        self._hashes: Dict[str, str] = {}
+        self._prehashed: Set[str] = set()
+        self.build()
+
+    def build(self) -> None:
+        """Hash every static file (precompressed siblings excluded)."""
+        hashes = {}
+        prehashed = set()
+
+        for root, _, files in os.walk(self.static_folder):
+            for name in files:
+                if name.endswith(tuple(ENCODINGS)) or not os.path.splitext(name)[1]:
+                    continue
+
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, self.static_folder).replace(os.sep, '/')
+
+                # Build outputs (bundles) already carry their content hash,
+                # and their source maps are named after them
+                if HASHED_NAME_PATTERN.match(name) or (
+                        name.endswith('.map') and HASHED_NAME_PATTERN.match(name[:-len('.map')])):
+                    prehashed.add(relative)
+                else:
+                    hashes[relative] = self._hash_file(path)
+
+        self._hashes = hashes
+        self._prehashed = prehashed
+
+    def _hash_file(self, path: str) -> str:
+        """MD5 of a file's contents, truncated to HASH_LENGTH hex digits."""
+        digest = hashlib.md5()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+        return digest.hexdigest()[:self.HASH_LENGTH]
+
+    def get_hash(self, filename: str) -> Optional[str]:
+        """Get the content hash of a static file, if known."""
+        return self._hashes.get(filename)
+
+    def hashed_filename(self, filename: str) -> str:
+        """
+        Get the fingerprinted name of a static file.
+
+        Args:
+            filename: Path relative to the static folder
+
+        Returns:
+            str: 'css/style.3f2a9c1b.css', or filename unchanged if unknown
+        """
+        file_hash = self._hashes.get(filename)
+        if file_hash is None:
+            return filename
+
+        stem, extension = posixpath.splitext(filename)
+        return f'{stem}.{file_hash}{extension}'
+
+    def is_prehashed(self, filename: str) -> bool:
+        """Check whether a file on disk is already named by its content hash."""
+        return filename in self._prehashed
+
+    def resolve(self, filename: str) -> Tuple[str, bool]:
+        """
+        Map a requested (possibly fingerprinted) name to the file on disk.
+
+        Args:
+            filename: Requested path relative to the static folder
+
+        Returns:
+            tuple: (original filename, True if the hash matches current content)
+        """
+        match = HASHED_NAME_PATTERN.match(filename)
+        if match is None:
+            return filename, False
+
+        original = match.group('stem') + match.group('ext')
+        file_hash = self._hashes.get(original)
+
+        if file_hash is None:
+            return filename, False
+
+        # A stale hash (page cached before a deploy) still gets the current file
+        return original, file_hash == match.group('hash')
+
+    def filenames(self) -> List[str]:
+        """Get every fingerprinted static path."""
+        return sorted(self._hashes)
+
+    @property
+    def digest(self) -> str:
+        """Hash of the whole map; changes whenever any static file does."""
+        joined = ';'.join(f'{name}={value}' for name, value in sorted(self._hashes.items()))
+        return hashlib.md5(joined.encode('utf-8')).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+def get_fingerprints(app=None) -> Optional[StaticFingerprints]:
+    """
+    Get the fingerprint map attached to an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        StaticFingerprints or None if fingerprinting is disabled
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('static_fingerprints')
@@ -0,0 +1,147 @@
+# /app/utils/fragments.py
+"""
+Lazy HTML fragments for Adaptive Auto Hub website.
+Serves below-the-fold page sections from their own cached endpoint, loaded by lazy-load.js when scrolled near.
+"""
+
+import re
+from typing import Callable, Dict, Optional
+
+from flask import current_app, render_template, url_for
+from markupsafe import Markup, escape
+
+
+# fragments/<blueprint>/<section>.html renders fragment '<blueprint>.<section>'
+FRAGMENT_FOLDER = 'fragments'
+
+# fragment('main.testimonials') calls in templates
+FRAGMENT_CALL_PATTERN = re.compile(r'''\bfragment\(\s*['"]([\w-]+\.[\w-]+)['"]''')
+
+# Placeholder attribute lazy-load.js fetches the fragment URL from
+PLACEHOLDER_ATTRIBUTE = 'data-lazy-content'
+
+DOCUMENT_PATTERN = re.compile(r'\s*(?:<!--.*?-->\s*)*<!doctype html', re.I | re.S)
+
+ContextProvider = Callable[[], Dict]
+
+
+def fragment_template(name: str) -> str:
+    """
+    Get the template of a fragment.
+
+    Args:
+        name: Fragment name ('main.testimonials')
+
+    Returns:
+        str: Template name ('fragments/main/testimonials.html')
+    """
+    blueprint, _, section = name.partition('.')
+    return f'{FRAGMENT_FOLDER}/{blueprint}/{section}.html'
+
+
+def is_document(html: str) -> bool:
+    """Check whether rendered HTML is a whole page rather than a fragment."""
+    return DOCUMENT_PATTERN.match(html) is not None
+
+
+def register_fragment(blueprint, section: str):
+    """
+    Decorator registering a blueprint's context provider for a fragment.
+
+    The fragment renders fragments/<blueprint>/<section>.html with the
+    provider's context; the page template places it with
+    {{ fragment('<blueprint>.<section>') }} and its view no longer
+    computes that context.
+
+    Example:
+        @register_fragment(main_bp, 'testimonials')
+        def testimonials_fragment():
+            return {'testimonials': get_testimonials()}
+
+    Args:
+        blueprint: Flask Blueprint the section belongs to
+        section: Section name
+
+    Returns:
+        Decorator returning the provider unchanged
+    """
+    name = f'{blueprint.name}.{section}'
+
+    def decorator(provider: ContextProvider) -> ContextProvider:
+        blueprint.record_once(
+            lambda state: state.app.extensions.setdefault('fragments', {}).update({name: provider})
+        )
+        return provider
+
+    return decorator
+
+
+def get_fragments(app=None) -> Dict[str, ContextProvider]:
+    """
+    Get the fragments registered with an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        dict: Fragment name to context provider
+    """
+    if app is None:
+        app = current_app
+
+    return app.extensions.get('fragments', {})
+
+
+def render_fragment(name: str) -> Optional[str]:
+    """
+    Render a fragment on its own.
+
+    Args:
+        name: Fragment name
+
+    Returns:
+        str: Fragment HTML or None if no such fragment is registered
+    """
+    provider = get_fragments().get(name)
+    if provider is None:
+        return None
+    return render_template(fragment_template(name), **provider())
+
+
+def fragment(name: str) -> Markup:
+    """
+    Template helper: place a fragment in a page.
+
+    With FRAGMENTS_LAZY_ENABLED the page carries an empty placeholder
+    that lazy-load.js fills from the fragment endpoint when it nears the
+    viewport; otherwise the fragment renders inline.
+
+    Args:
+        name: Fragment name ('main.testimonials')
+
+    Returns:
+        Markup: Placeholder or fragment HTML ('' if not registered)
+    """
+    if name not in get_fragments():
+        current_app.logger.warning(f'Unknown fragment: {name}')
+        return Markup('')
+
+    if not current_app.config.get('FRAGMENTS_LAZY_ENABLED'):
+        return Markup(render_fragment(name))
+
+    url = url_for('main.fragment', name=name)
+    return Markup(f'<div class="lazy-fragment" {PLACEHOLDER_ATTRIBUTE}="{escape(url)}" '
+                  f'data-fragment="{escape(name)}"></div>')
+
+
+def init_fragments(app) -> None:
+    """
+    Register the fragment() template helper.
+
+    Fragments themselves register with their blueprints (register_fragment).
+
+    Args:
+        app: Flask application instance
+    """
+    app.extensions.setdefault('fragments', {})
+    app.jinja_env.globals['fragment'] = fragment
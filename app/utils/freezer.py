@@ -0,0 +1,534 @@
+# /app/utils/freezer.py
+"""
+Static site export for Adaptive Auto Hub website.
+Renders every content route to files with precompressed siblings and Apache rewrite rules.
+"""
+
+import fnmatch
+import json
+import os
+import posixpath
+import re
+import shutil
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from flask import url_for
+
+from .asset_graph import unreferenced_images
+from .bundler import OUTPUT_DIR
+from .fingerprint import FINGERPRINT_MAX_AGE, get_fingerprints
+from .partial_navigation import PARTIAL_HEADER
+from .precompress import is_compressible, precompress_tree
+
+
+MANIFEST_NAME = 'freeze-manifest.json'
+
+# File extension for extensionless URLs, by response mimetype
+MIMETYPE_EXTENSIONS = {
+    'text/html': '.html',
+    'application/json': '.json',
+    'application/xml': '.xml',
+    'text/xml': '.xml',
+    'text/plain': '.txt'
+}
+
+# Response headers repeated by Apache for every frozen file
+SECURITY_HEADERS = (
+    'Strict-Transport-Security',
+    'X-Frame-Options',
+    'X-Content-Type-Options',
+    'Referrer-Policy',
+    'Content-Security-Policy'
+)
+
+NONCE_PATTERN = re.compile(r"\s*'nonce-[^']*'")
+
+# Page swap payload of a frozen page: 'about/index.html' -> 'about/index.partial.html'
+PARTIAL_SUFFIX = '.partial'
+
+# Build manifests and reports in the static folder, read by the app and
+# build.py only: left out of the export and denied to clients
+BUILD_METADATA_PATTERN = f'{OUTPUT_DIR}/*.json'
+
+# Endpoint -> callable returning the URL arguments of every page it serves
+UrlGenerator = Callable[[], Iterable[Dict[str, str]]]
+
+
+def _default_url_generators() -> Dict[str, UrlGenerator]:
+    """URL arguments for the routes with dynamic slugs."""
+    from ..blueprints.industries.routes import get_industries_data
+    from ..blueprints.partnerships.routes import get_partnerships_data
+    from .fragments import get_fragments
+    from .og_cards import get_card_digest, get_og_card_specs
+
+    return {
+        'industries.industry_detail': lambda: [
+            {'industry': item['id']} for item in get_industries_data()
+        ],
+        'partnerships.detail': lambda: [
+            {'partner_id': partner_id} for partner_id in get_partnerships_data()
+        ],
+        'products.api_specifications': lambda: [
+            {'product': product} for product in ('aura', 'aegis')
+        ],
+        'main.og_card': lambda: [
+            {'card': name, 'digest': get_card_digest(name)} for name in get_og_card_specs()
+        ],
+        'main.fragment': lambda: [{'name': name} for name in get_fragments()]
+    }
+
+
+def collect_page_urls(app, base_url: str,
+                      url_generators: Optional[Dict[str, UrlGenerator]] = None,
+                      exclude_endpoints: Iterable[str] = ()) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Walk the URL map and expand dynamic routes into page URLs.
+
+    Args:
+        app: Flask application instance
+        base_url: Site URL the URLs are built against
+        url_generators: URL arguments per dynamic endpoint (defaults if None)
+        exclude_endpoints: Endpoints to leave out
+
+    Returns:
+        tuple: (sorted URLs, {rule: reason} for routes left out)
+    """
+    if url_generators is None:
+        url_generators = _default_url_generators()
+    exclude_endpoints = set(exclude_endpoints)
+
+    urls = set()
+    skipped = {}
+
+    with app.test_request_context(base_url=base_url):
+        for rule in app.url_map.iter_rules():
+            endpoint = rule.endpoint
+
+            if endpoint == 'static' or endpoint.endswith('.static'):
+                continue
+            if 'GET' not in rule.methods:
+                skipped[rule.rule] = 'not a GET route'
+                continue
+            if endpoint in exclude_endpoints:
+                skipped[rule.rule] = 'excluded in FREEZE_EXCLUDE_ENDPOINTS'
+                continue
+
+            if not rule.arguments:
+                urls.add(url_for(endpoint))
+            elif endpoint in url_generators:
+                for values in url_generators[endpoint]():
+                    urls.add(url_for(endpoint, **values))
+            else:
+                skipped[rule.rule] = 'dynamic route without URL generator'
+
+    return sorted(urls), skipped
+
+
+class SiteFreezer:
+    """
+    Export every cacheable GET route of the application to static files.
+
+    Pages are rendered through the Flask test client, so the output is
+    byte-identical to what the live app serves. Routes that take POST
+    only, need per-visitor state or are excluded in config are left to
+    Flask; the generated .htaccess forwards them there.
+    """
+
+    def __init__(self, app, output_dir: str, base_url: Optional[str] = None,
+                 include_static: bool = True):
+        """
+        Initialize freezer.
+
+        Args:
+            app: Flask application instance
+            output_dir: Directory the site is written to (Apache document root)
+            base_url: Public site URL used for absolute links (FREEZE_BASE_URL if None)
+            include_static: Copy the static folder into the output tree
+        """
+        self.app = app
+        self.output_dir = os.path.abspath(output_dir)
+        self.base_url = (base_url or app.config.get('FREEZE_BASE_URL')
+                         or 'http://localhost').rstrip('/')
+        self.include_static = include_static
+        self.exclude_endpoints = set(app.config.get('FREEZE_EXCLUDE_ENDPOINTS', []))
+
+        self.url_generators = _default_url_generators()
+
+        self.pages: Dict[str, Dict] = {}
+        self.redirects: Dict[str, str] = {}
+        self.skipped: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self._headers: Dict[str, Dict[str, str]] = {}
+
+    def add_url_generator(self, endpoint: str, generator: UrlGenerator) -> None:
+        """
+        Register URL arguments for a route with path variables.
+
+        Args:
+            endpoint: Flask endpoint name
+            generator: Callable returning a list of URL argument dicts
+        """
+        self.url_generators[endpoint] = generator
+
+    def collect_urls(self) -> List[str]:
+        """
+        Walk the URL map and expand dynamic routes.
+
+        Returns:
+            list: Sorted URLs to render
+        """
+        urls, skipped = collect_page_urls(self.app, self.base_url, self.url_generators,
+                                          self.exclude_endpoints)
+        self.skipped.update(skipped)
+        return urls
+
+    def freeze(self) -> Dict:
+        """
+        Render the site into the output directory.
+
+        Returns:
+            dict: The freeze manifest (pages, redirects, skipped routes, errors)
+        """
+        self._prepare_output_dir()
+
+        client = self.app.test_client()
+
+        partial_navigation = self.app.config.get('PARTIAL_NAVIGATION_ENABLED')
+
+        for url in self.collect_urls():
+            response = client.get(url, base_url=self.base_url,
+                                  headers={'Accept-Encoding': 'identity'})
+            self._store(url, response)
+
+            # Page swaps of js/partial-navigation.js get their own file
+            if partial_navigation and self.pages.get(url, {}).get('mimetype') == 'text/html':
+                partial = client.get(url, base_url=self.base_url,
+                                     headers={'Accept-Encoding': 'identity', PARTIAL_HEADER: '1'})
+                self._store_partial(url, partial)
+
+        if self.include_static and self.app.static_folder:
+            self._copy_static()
+
+        compression = precompress_tree(self.output_dir)
+
+        with open(os.path.join(self.output_dir, '.htaccess'), 'w', encoding='utf-8') as f:
+            f.write(self.generate_htaccess())
+
+        manifest = {
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'base_url': self.base_url,
+            'pages': self.pages,
+            'redirects': self.redirects,
+            'skipped': self.skipped,
+            'errors': self.errors,
+            'compression': compression
+        }
+
+        with open(os.path.join(self.output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+        return manifest
+
+    def _prepare_output_dir(self) -> None:
+        """Empty the output directory, refusing to wipe one freeze did not create."""
+        if os.path.isdir(self.output_dir) and os.listdir(self.output_dir):
+            if not os.path.exists(os.path.join(self.output_dir, MANIFEST_NAME)):
+                raise RuntimeError(
+                    f'{self.output_dir} is not empty and was not created by freeze'
+                )
+            shutil.rmtree(self.output_dir)
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def _copy_static(self) -> None:
+        """Copy the static folder, adding fingerprinted copies of each file."""
+        static_dir = os.path.join(self.output_dir, self.app.static_url_path.strip('/'))
+        compressed = shutil.ignore_patterns('*.br', '*.gz')
+
+        # Images the asset graph found nothing referencing (build.py) stay behind
+        skipped = set()
+        if self.app.config.get('FREEZE_SKIP_UNREFERENCED_IMAGES'):
+            skipped = unreferenced_images(self.app.static_folder)
+
+        def is_excluded(filename: str) -> bool:
+            return filename in skipped or fnmatch.fnmatch(filename, BUILD_METADATA_PATTERN)
+
+        def ignore(directory, names):
+            relative = os.path.relpath(directory, self.app.static_folder).replace(os.sep, '/')
+            return set(compressed(directory, names)) | {
+                name for name in names
+                if is_excluded(posixpath.normpath(posixpath.join(relative, name)))
+            }
+
+        shutil.copytree(self.app.static_folder, static_dir, dirs_exist_ok=True, ignore=ignore)
+
+        fingerprints = get_fingerprints(self.app)
+        if fingerprints is None:
+            return
+
+        for filename in fingerprints.filenames():
+            if is_excluded(filename):
+                continue
+            shutil.copy2(os.path.join(static_dir, filename),
+                         os.path.join(static_dir, fingerprints.hashed_filename(filename)))
+
+    def _store(self, url: str, response) -> None:
+        """Write a rendered response, or record why it was not frozen."""
+        if response.status_code in (301, 302, 303, 307, 308):
+            location = urlsplit(response.headers.get('Location', '/'))
+            self.redirects[url] = location.path + (f'?{location.query}' if location.query else '')
+            return
+
+        if response.status_code != 200:
+            self.errors[url] = f'HTTP {response.status_code}'
+            return
+
+        cache_control = response.cache_control
+        if 'Set-Cookie' in response.headers or cache_control.private or cache_control.no_store:
+            self.skipped[url] = 'per-visitor response'
+            return
+
+        relative_path = self.output_path(url, response.mimetype)
+        path = os.path.join(self.output_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'wb') as f:
+            f.write(response.get_data())
+
+        self.pages[url] = {
+            'file': relative_path,
+            'mimetype': response.mimetype,
+            'bytes': os.path.getsize(path)
+        }
+        self._headers[url] = {
+            name: value for name, value in response.headers.items()
+            if name in SECURITY_HEADERS or name == 'Cache-Control'
+        }
+
+    def _store_partial(self, url: str, response) -> None:
+        """Write the partial page of a frozen HTML page next to it."""
+        if response.status_code != 200 or response.mimetype != 'text/html':
+            return
+
+        page_file = self.pages[url]['file']
+        with open(os.path.join(self.output_dir, page_file), 'rb') as f:
+            # Fragments and pages not built on base.html have no partial form
+            if f.read() == response.get_data():
+                return
+
+        stem, extension = os.path.splitext(page_file)
+        relative_path = stem + PARTIAL_SUFFIX + extension
+        with open(os.path.join(self.output_dir, relative_path), 'wb') as f:
+            f.write(response.get_data())
+
+        self.pages[url]['partial'] = relative_path
+
+    @staticmethod
+    def output_path(url: str, mimetype: str) -> str:
+        """
+        Map a URL to a file path relative to the output directory.
+
+        '/' -> 'index.html', '/products/' -> 'products/index.html',
+        '/products/aura' -> 'products/aura.html', '/sitemap.xml' unchanged.
+
+        Args:
+            url: Site-relative URL
+            mimetype: Response mimetype
+
+        Returns:
+            str: Relative file path
+        """
+        path = urlsplit(url).path.lstrip('/')
+        extension = MIMETYPE_EXTENSIONS.get(mimetype, '')
+
+        if not path or path.endswith('/'):
+            return f'{path}index{extension or ".html"}'
+
+        if os.path.splitext(path.rsplit('/', 1)[-1])[1]:
+            return path
+
+        return path + extension
+
+    def generate_htaccess(self) -> str:
+        """
+        Build Apache rules serving frozen files and their compressed siblings.
+
+        GET/HEAD requests without a query string for a frozen URL are
+        rewritten to its file (its partial page for page swaps); everything
+        else falls through to Passenger (Flask).
+
+        Returns:
+            str: .htaccess contents
+        """
+        page_rules = []
+        partial_rules = []
+        for url, page in sorted(self.pages.items()):
+            path = urlsplit(url).path.lstrip('/')
+            if path != page['file']:
+                page_rules.append(f"RewriteRule ^{re.escape(path)}$ {page['file']} [L]")
+            if page.get('partial'):
+                partial_rules += [f'RewriteCond %{{HTTP:{PARTIAL_HEADER}}} =1',
+                                  f"RewriteRule ^{re.escape(path)}$ {page['partial']} [L]"]
+
+        redirect_rules = [
+            f'RewriteRule ^{re.escape(url.lstrip("/"))}$ {target} [R=302,L]'
+            for url, target in sorted(self.redirects.items())
+        ]
+
+        rules = partial_rules + page_rules + redirect_rules
+        extensions = sorted({
+            os.path.splitext(page['file'])[1].lstrip('.')
+            for page in self.pages.values() if is_compressible(page['file'])
+        } | {'css', 'js', 'svg'})
+        extension_pattern = '|'.join(extensions)
+
+        lines = [
+            f'# Generated by freeze.py on {datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC',
+            '# Keep the Passenger directives written by cPanel above this block;',
+            '# requests not matched here fall through to the Flask application.',
+            '# BEGIN frozen site',
+            'Options -MultiViews',
+            '',
+            '<IfModule mod_rewrite.c>',
+            'RewriteEngine On',
+            'RewriteBase /',
+            '',
+            '# Build manifests and reports are not public',
+            f'RewriteRule ^{re.escape(self.app.static_url_path.strip("/"))}/'
+            f'{re.escape(OUTPUT_DIR)}/[^/]+\\.json$ - [F]',
+            '',
+            '# POST, query strings and per-visitor routes go to Flask',
+            'RewriteCond %{REQUEST_METHOD} !^(GET|HEAD)$ [OR]',
+            'RewriteCond %{QUERY_STRING} .',
+            # S= counts the rules skipped, not their conditions
+            f"RewriteRule ^ - [S={sum(rule.startswith('RewriteRule') for rule in rules)}]",
+            *rules,
+            '',
+            '# Serve precompressed siblings when the client accepts them',
+            'RewriteCond %{HTTP:Accept-Encoding} \\bbr\\b',
+            'RewriteCond %{REQUEST_FILENAME}.br -f',
+            f'RewriteRule ^(.+\\.({extension_pattern}))$ $1.br [L]',
+            'RewriteCond %{HTTP:Accept-Encoding} \\bgzip\\b',
+            'RewriteCond %{REQUEST_FILENAME}.gz -f',
+            f'RewriteRule ^(.+\\.({extension_pattern}))$ $1.gz [L]',
+            'RewriteRule \\.(br|gz)$ - [E=no-gzip:1,E=no-brotli:1]',
+            '</IfModule>',
+            '',
+            '<IfModule mod_mime.c>',
+            'RemoveType .br .gz',
+            'RemoveEncoding .br .gz',
+            '</IfModule>',
+            ''
+        ]
+
+        for extension in extensions:
+            mimetype = self._mimetype_for(extension)
+            lines += [
+                f'<FilesMatch "\\.{extension}\\.(br|gz)$">',
+                f'    ForceType {mimetype}',
+                '</FilesMatch>'
+            ]
+
+        lines += [
+            '',
+            '<IfModule mod_headers.c>',
+            '<FilesMatch "\\.br$">',
+            '    Header set Content-Encoding br',
+            '</FilesMatch>',
+            '<FilesMatch "\\.gz$">',
+            '    Header set Content-Encoding gzip',
+            '</FilesMatch>',
+            f'<FilesMatch "\\.({extension_pattern})(\\.(br|gz))?$">',
+            '    Header append Vary Accept-Encoding',
+            '</FilesMatch>'
+        ]
+
+        if partial_rules:
+            # Full pages and page swaps share their URLs
+            lines += [
+                '<FilesMatch "\\.html(\\.(br|gz))?$">',
+                f'    Header append Vary {PARTIAL_HEADER}',
+                '</FilesMatch>'
+            ]
+
+        # Only the files freeze wrote: other static files of the same type
+        # (a non-fingerprinted .jpg, every .js besides sw.js) keep their own policy
+        for cache_control, paths in self._cache_control_by_path():
+            pattern = '|'.join(re.escape(path) for path in paths)
+            lines += [
+                f'<If "%{{REQUEST_URI}} =~ m#^/({pattern})(\\.(br|gz))?$#">',
+                f'    Header set Cache-Control "{cache_control}"',
+                '</If>'
+            ]
+
+        if get_fingerprints(self.app) is not None:
+            lines += [
+                '<FilesMatch "\\.[0-9a-f]{8}\\.[A-Za-z0-9]+(\\.(br|gz))?$">',
+                f'    Header set Cache-Control "public, max-age={FINGERPRINT_MAX_AGE}, immutable"',
+                '</FilesMatch>'
+            ]
+
+        for name, value in self._security_headers():
+            lines.append(f'Header always set {name} "{value}"')
+
+        lines += [
+            '</IfModule>',
+            '',
+            f'<Files "{MANIFEST_NAME}">',
+            '    Require all denied',
+            '</Files>',
+            '# END frozen site',
+            ''
+        ]
+
+        return '\n'.join(lines)
+
+    def _mimetype_for(self, extension: str) -> str:
+        """Content type Apache must report for a compressed sibling."""
+        for page in self.pages.values():
+            if page['file'].endswith(f'.{extension}'):
+                mimetype = page['mimetype']
+                return f'{mimetype};charset=utf-8' if mimetype.startswith('text/') else mimetype
+
+        return {
+            'css': 'text/css;charset=utf-8',
+            'js': 'application/javascript;charset=utf-8',
+            'svg': 'image/svg+xml'
+        }.get(extension, 'application/octet-stream')
+
+    def _cache_control_by_path(self) -> List[Tuple[str, List[str]]]:
+        """
+        Group the frozen files by the Cache-Control the app sent for them.
+
+        Each page is listed under its URL path and the files it was
+        written to, since the rewrite rules serve one from the other.
+        """
+        paths: Dict[str, set] = {}
+
+        for url, page in self.pages.items():
+            cache_control = self._headers[url].get('Cache-Control')
+            if cache_control:
+                paths.setdefault(cache_control, set()).update(
+                    path for path in (urlsplit(url).path.lstrip('/'), page['file'],
+                                      page.get('partial')) if path is not None
+                )
+
+        return [(cache_control, sorted(group)) for cache_control, group in sorted(paths.items())]
+
+    def _security_headers(self) -> List[Tuple[str, str]]:
+        """Security headers of the homepage, minus its per-request CSP nonce."""
+        headers = self._headers.get('/', {})
+        result = []
+
+        for name in SECURITY_HEADERS:
+            value = headers.get(name)
+            if not value:
+                continue
+            if name == 'Content-Security-Policy':
+                # A frozen file cannot carry a fresh nonce per request
+                value = NONCE_PATTERN.sub('', value)
+            result.append((name, value.replace('"', '\\"')))
+
+        return result
@@ -0,0 +1,221 @@
+# /app/utils/html_minifier.py
+"""
+HTML minification for Adaptive Auto Hub website.
+Minifies template source once at compile time and, optionally, rendered pages with memoized output.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from flask import request
+from jinja2 import BaseLoader
+
+from .page_cache import is_page_cache_hit
+
+
+# Template source: Jinja raw blocks and tags, raw elements, comments
+TEMPLATE_TOKEN_PATTERN = re.compile(r'''
+    \{%-?\s*raw\s*-?%\}.*?\{%-?\s*endraw\s*-?%\}
+  | \{\{.*?\}\} | \{%.*?%\} | \{\#.*?\#\}
+  | <(pre|textarea|script|style)\b.*?</\1\s*>
+  | <!--.*?-->
+''', re.S | re.I | re.X)
+
+# Rendered HTML: raw elements and comments
+HTML_TOKEN_PATTERN = re.compile(
+    r'<(pre|textarea|script|style)\b.*?</\1\s*>|<!--.*?-->', re.S | re.I
+)
+
+# A whitespace run with a line break becomes one newline, others one space
+NEWLINE_RUN_PATTERN = re.compile(r'[ \t\r\f\v]*\n\s*')
+SPACE_RUN_PATTERN = re.compile(r'[ \t\r\f\v]{2,}')
+
+# Whitespace next to elements that never render is dropped entirely
+HEAD_TAG_SPACE_PATTERN = re.compile(
+    r'\s+(?=<(?:!doctype|/?html|/?head|/?body|meta|link|title|base)\b)'
+    r'|(?<=>)\s+(?=<(?:meta|link|title|base|/head|body)\b)', re.I
+)
+
+MINIFIED_EXTENSIONS = ('.html', '.xml')
+
+
+def _collapse(text: str) -> str:
+    """Collapse the whitespace runs of markup without raw elements."""
+    if '\n' in text:
+        text = NEWLINE_RUN_PATTERN.sub('\n', text)
+    if '  ' in text or '\t' in text:
+        text = SPACE_RUN_PATTERN.sub(' ', text)
+    return text
+
+
+def _minify(source: str, pattern: re.Pattern, keep_comment: Callable[[str], bool]) -> str:
+    """Collapse whitespace and drop comments outside the pattern's verbatim tokens."""
+    pieces = []
+    position = 0
+
+    for match in pattern.finditer(source):
+        pieces.append(_collapse(source[position:match.start()]))
+        token = match.group(0)
+        if not token.startswith('<!--') or keep_comment(token):
+            pieces.append(token)
+        position = match.end()
+
+    pieces.append(_collapse(source[position:]))
+    return HEAD_TAG_SPACE_PATTERN.sub('', ''.join(pieces)).strip()
+
+
+def _is_conditional_comment(comment: str) -> bool:
+    return comment.startswith(('<!--[if', '<!--<![endif]', '<!--!'))
+
+
+def minify_template_source(source: str) -> str:
+    """
+    Minify Jinja template source.
+
+    Whitespace runs are collapsed and HTML comments removed; Jinja tags
+    and comments, {% raw %} blocks and <pre>, <textarea>, <script> and
+    <style> elements are kept verbatim, as are HTML comments wrapping
+    Jinja statements or comments (the template structure depends on them).
+
+    Args:
+        source: Template source
+
+    Returns:
+        str: Minified source
+    """
+    return _minify(source, TEMPLATE_TOKEN_PATTERN,
+                   lambda comment: _is_conditional_comment(comment)
+                   or '{%' in comment or '{#' in comment)
+
+
+def minify_html(html: str) -> str:
+    """
+    Minify rendered HTML.
+
+    Args:
+        html: Page markup
+
+    Returns:
+        str: Markup with whitespace runs collapsed and comments removed,
+             leaving <pre>, <textarea>, <script> and <style> untouched
+    """
+    return _minify(html, HTML_TOKEN_PATTERN, _is_conditional_comment)
+
+
+class MinifyingLoader(BaseLoader):
+    """
+    Jinja loader minifying the source of the templates it wraps.
+
+    Jinja compiles each template once (and again only when auto-reload
+    sees it change), so minification costs nothing per render.
+    """
+
+    def __init__(self, loader: BaseLoader):
+        """
+        Initialize loader.
+
+        Args:
+            loader: Loader the templates come from
+        """
+        self.loader = loader
+
+    def get_source(self, environment, template: str) -> Tuple[str, Optional[str], Optional[Callable]]:
+        source, filename, uptodate = self.loader.get_source(environment, template)
+        if template.endswith(MINIFIED_EXTENSIONS):
+            source = minify_template_source(source)
+        return source, filename, uptodate
+
+    def list_templates(self):
+        return self.loader.list_templates()
+
+
+class HTMLMinifier:
+    """
+    Memoizing minifier for rendered pages.
+
+    Most pages render identical markup for every visitor, so results
+    are kept by body hash (least recently used evicted first).
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize minifier.
+
+        Args:
+            max_entries: Maximum number of memoized pages
+        """
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[bytes, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def minify(self, body: bytes) -> bytes:
+        """
+        Minify a UTF-8 page, reusing the result for a body seen before.
+
+        Args:
+            body: Rendered page
+
+        Returns:
+            bytes: Minified page
+        """
+        key = hashlib.md5(body).digest()
+
+        with self._lock:
+            minified = self._entries.get(key)
+            if minified is not None:
+                self._entries.move_to_end(key)
+                return minified
+
+        minified = minify_html(body.decode('utf-8')).encode('utf-8')
+
+        with self._lock:
+            self._entries[key] = minified
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return minified
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def init_html_minifier(app) -> Optional[HTMLMinifier]:
+    """
+    Minify templates at compile time and, optionally, rendered pages.
+
+    Call after the page cache is configured: the response filter is
+    then registered last and runs first among the application's
+    after_request handlers, so compression and the page cache see the
+    minified page.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        HTMLMinifier or None if HTML_MINIFY_RESPONSES is off
+    """
+    if app.config.get('HTML_MINIFY_TEMPLATES'):
+        app.jinja_env.loader = MinifyingLoader(app.jinja_env.loader)
+
+    if not app.config.get('HTML_MINIFY_RESPONSES'):
+        return None
+
+    minifier = HTMLMinifier(max_entries=app.config.get('HTML_MINIFY_CACHE_ENTRIES', 256))
+    app.extensions['html_minifier'] = minifier
+
+    @app.after_request
+    def minify_response(response):
+        # Page cache hits were minified before they were stored
+        if (response.mimetype != 'text/html' or response.direct_passthrough
+                or response.is_streamed or response.content_encoding
+                or response.status_code in (204, 304) or request.method == 'HEAD'
+                or is_page_cache_hit()):
+            return response
+
+        response.set_data(minifier.minify(response.get_data()))
+        return response
+
+    return minifier
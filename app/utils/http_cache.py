@@ -0,0 +1,323 @@
+# /app/utils/http_cache.py
+"""
+HTTP caching policy layer for Adaptive Auto Hub website.
+Declarative Cache-Control, strong ETag and Last-Modified handling with early 304s.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Optional
+
+from flask import current_app, make_response, request
+
+from .partial_navigation import is_partial_navigation
+
+
+# Suffixes Flask-Compress appends inside ETags ("abc:gzip")
+ENCODING_ETAG_SUFFIXES = (':br', ':gzip', ':deflate')
+
+# Headers a 304 must repeat from the full response
+NOT_MODIFIED_HEADERS = ('etag', 'cache-control', 'last-modified', 'vary', 'expires')
+
+
+def get_content_version(app=None) -> dict:
+    """
+    Get the deploy-level content version of the application.
+
+    Every page is a pure function of the code and templates, so the
+    newest mtime under the app package (plus APP_VERSION) identifies
+    the content a response was rendered from. Computed once per process.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        dict: 'hash' (hex digest) and 'last_modified' (aware datetime)
+    """
+    if app is None:
+        app = current_app
+
+    version = app.extensions.get('content_version')
+    if version is not None:
+        return version
+
+    newest = 0.0
+    for root, dirs, files in os.walk(app.root_path):
+        dirs[:] = [d for d in dirs if d not in ('static', '__pycache__')]
+        for name in files:
+            if name.endswith(('.py', '.html', '.xml', '.txt', '.json')):
+                newest = max(newest, os.path.getmtime(os.path.join(root, name)))
+
+    # Pages embed fingerprinted static URLs, so static edits change them too
+    fingerprints = app.extensions.get('static_fingerprints')
+    static_digest = fingerprints.digest if fingerprints is not None else ''
+
+    # ...and inline their per-route critical CSS
+    critical = app.extensions.get('critical_css')
+    if critical is not None:
+        static_digest += critical.digest
+
+    digest = hashlib.md5(
+        f"{app.config.get('APP_VERSION', '')}:{newest}:{static_digest}".encode('utf-8')
+    ).hexdigest()
+
+    version = {
+        'hash': digest,
+        'last_modified': datetime.fromtimestamp(int(newest), tz=timezone.utc)
+    }
+    app.extensions['content_version'] = version
+    return version
+
+
+def etag_matches(etag: str) -> bool:
+    """
+    Check a strong ETag against the request's If-None-Match header.
+
+    Tolerates the encoding suffixes Flask-Compress adds, so validators
+    stored from gzip/br responses still match.
+
+    Args:
+        etag: ETag value, quoted or unquoted
+
+    Returns:
+        bool: True if the client already holds this representation
+    """
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+
+    wanted = _normalize_etag(etag)
+
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or _normalize_etag(candidate) == wanted:
+            return True
+
+    return False
+
+
+def _normalize_etag(etag: str) -> str:
+    """Strip weakness prefix, quotes and compression suffix from an ETag."""
+    etag = etag.strip()
+    if etag.startswith('W/'):
+        etag = etag[2:]
+    etag = etag.strip('"')
+
+    for suffix in ENCODING_ETAG_SUFFIXES:
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)]
+
+    return etag
+
+
+def not_modified_response(headers):
+    """
+    Build a bodiless 304 response.
+
+    Args:
+        headers: Iterable of (name, value) pairs from the full response
+
+    Returns:
+        Response with status 304
+    """
+    kept = [(name, value) for name, value in headers
+            if name.lower() in NOT_MODIFIED_HEADERS]
+    return current_app.response_class(status=304, headers=kept)
+
+
+class CachePolicy:
+    """
+    Declarative HTTP caching policy for a route or blueprint.
+
+    ETag modes:
+        'content' - derived from the content version, request URL and
+                    navigation mode, known before rendering so 304s
+                    skip the view
+        'body'    - MD5 of the rendered body
+        None      - no validator
+    """
+
+    def __init__(self, max_age: Optional[int] = None,
+                 stale_while_revalidate: Optional[int] = None,
+                 public: bool = True, etag: Optional[str] = 'content',
+                 last_modified: bool = True, no_store: bool = False):
+        """
+        Initialize caching policy.
+
+        Args:
+            max_age: Freshness lifetime in seconds (HTTP_CACHE_MAX_AGE if None)
+            stale_while_revalidate: Seconds a stale copy may be served while
+                revalidating (HTTP_CACHE_STALE_WHILE_REVALIDATE if None)
+            public: Allow shared caches (proxies) to store the response
+            etag: ETag mode ('content', 'body' or None)
+            last_modified: Send the content version's Last-Modified
+            no_store: Forbid caching entirely (per-visitor pages)
+        """
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.public = public
+        self.etag = etag
+        self.last_modified = last_modified
+        self.no_store = no_store
+
+    @staticmethod
+    def enabled() -> bool:
+        """Check whether HTTP caching headers are enabled for this app."""
+        return current_app.config.get('HTTP_CACHE_ENABLED', True)
+
+    def content_etag(self) -> str:
+        """Compute the pre-render ETag for the current request."""
+        version = get_content_version()['hash']
+        # Partial pages are a separate representation of the URL
+        variant = ':partial' if is_partial_navigation() else ''
+        return hashlib.md5(
+            f'{version}:{request.host}:{request.full_path}{variant}'.encode('utf-8')
+        ).hexdigest()
+
+    def check_not_modified(self):
+        """
+        Answer conditional requests before the view renders.
+
+        Returns:
+            304 Response if the client copy is current, otherwise None
+        """
+        if self.no_store or request.method not in ('GET', 'HEAD'):
+            return None
+
+        if self.etag == 'content':
+            etag = self.content_etag()
+            if etag_matches(etag):
+                return self.apply(current_app.response_class(status=304), etag=etag)
+            if 'If-None-Match' in request.headers:
+                return None
+
+        if self.last_modified and self.etag != 'body' and request.if_modified_since:
+            last_modified = get_content_version()['last_modified']
+            if last_modified <= request.if_modified_since:
+                return self.apply(current_app.response_class(status=304))
+
+        return None
+
+    def apply(self, response, etag: Optional[str] = None):
+        """
+        Set caching headers on a response.
+
+        Args:
+            response: Flask response (200 or 304)
+            etag: Precomputed ETag (computed from the policy if None)
+
+        Returns:
+            The response, converted to a 304 when a body ETag matches
+        """
+        if self.no_store:
+            response.headers['Cache-Control'] = 'private, no-store'
+            return response
+
+        config = current_app.config
+        max_age = self.max_age if self.max_age is not None else \
+            config.get('HTTP_CACHE_MAX_AGE', 300)
+        stale = self.stale_while_revalidate if self.stale_while_revalidate is not None else \
+            config.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', 86400)
+
+        directives = ['public' if self.public else 'private', f'max-age={max_age}']
+        if stale:
+            directives.append(f'stale-while-revalidate={stale}')
+        response.headers['Cache-Control'] = ', '.join(directives)
+
+        if self.last_modified:
+            response.last_modified = get_content_version()['last_modified']
+
+        if etag is None and response.status_code == 200:
+            if self.etag == 'content':
+                etag = self.content_etag()
+            elif self.etag == 'body' and not response.direct_passthrough:
+                etag = hashlib.md5(response.get_data()).hexdigest()
+
+        if etag:
+            response.set_etag(etag)
+
+            if response.status_code == 200 and etag_matches(etag):
+                return not_modified_response(response.headers.items())
+
+        return response
+
+
+def _view_policy(endpoint: Optional[str]) -> Optional[CachePolicy]:
+    """Get the policy attached to an endpoint's view by @cache_policy."""
+    view = current_app.view_functions.get(endpoint) if endpoint else None
+    return getattr(view, 'cache_policy', None)
+
+
+def cache_policy(**policy_kwargs):
+    """
+    Decorator applying a CachePolicy to a single route.
+
+    Example:
+        @products_bp.route('/aura')
+        @cache_policy(max_age=600)
+        def aura(): ...
+
+    Args:
+        **policy_kwargs: CachePolicy arguments
+
+    Returns:
+        Decorated view function
+    """
+    policy = CachePolicy(**policy_kwargs)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if not CachePolicy.enabled():
+                return view(*args, **kwargs)
+
+            not_modified = policy.check_not_modified()
+            if not_modified is not None:
+                return not_modified
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            return policy.apply(response)
+
+        wrapped.cache_policy = policy
+        return wrapped
+
+    return decorator
+
+
+def apply_cache_policy(blueprint, **policy_kwargs) -> CachePolicy:
+    """
+    Install a default CachePolicy for every GET route of a blueprint.
+
+    Routes decorated with @cache_policy keep their own policy, and
+    responses that already carry Cache-Control are left untouched.
+
+    Args:
+        blueprint: Flask Blueprint
+        **policy_kwargs: CachePolicy arguments
+
+    Returns:
+        CachePolicy: The blueprint default policy
+    """
+    policy = CachePolicy(**policy_kwargs)
+
+    @blueprint.before_request
+    def answer_not_modified():
+        if not CachePolicy.enabled() or _view_policy(request.endpoint) is not None:
+            return None
+        return policy.check_not_modified()
+
+    @blueprint.after_request
+    def set_cache_headers(response):
+        if (not CachePolicy.enabled()
+                or request.method not in ('GET', 'HEAD')
+                or response.status_code != 200
+                or 'Cache-Control' in response.headers
+                or _view_policy(request.endpoint) is not None):
+            return response
+        return policy.apply(response)
+
+    return policy
@@ -236,14 +236,19 @@ class ImageOptimizer:
     
     def get_picture_element_html(self, image_data: Dict, 
                                css_class: str = '', 
-                               loading: str = 'lazy') -> str:
+                               loading: str = 'lazy',
+                               fetchpriority: Optional[str] = None) -> str:
         """
         Generate HTML picture element with responsive sources.
         
+        The img element carries the intrinsic width and height of the
+        largest size, so the browser reserves its box before loading.
+        
         Args:
             image_data: Processed image metadata
             css_class: CSS classes for img element
             loading: Loading strategy ('lazy', 'eager')
+            fetchpriority: Fetch priority hint ('high' for the LCP image)
             
         Returns:
             HTML picture element string
@@ -281,13 +286,20 @@ class ImageOptimizer:
         fallback_src = image_data['sizes'][0]['jpeg']['url']
         lqip_src = image_data.get('lqip', {}).get('base64', '')
         
+        largest = image_data['sizes'][-1]
+        
         img_attrs = [
             f'src="{fallback_src}"',
             f'alt="{image_data.get("alt_text", "")}"',
+            f'width="{largest["width"]}"',
+            f'height="{largest["height"]}"',
             f'loading="{loading}"',
             f'decoding="async"'
         ]
         
+        if fetchpriority:
+            img_attrs.append(f'fetchpriority="{fetchpriority}"')
+        
         if css_class:
             img_attrs.append(f'class="{css_class}"')
         
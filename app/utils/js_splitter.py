@@ -0,0 +1,335 @@
+# /app/utils/js_splitter.py
+"""
+Per-page JavaScript splitting for Adaptive Auto Hub website.
+Maps page templates to the script features they use and links a shared chunk plus one bundle per page.
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Set
+
+from flask import before_render_template, g, url_for
+from jinja2 import TemplateError, meta
+from markupsafe import Markup, escape
+
+from .bundler import JS_MODULE_SYNTAX_PATTERN, asset_urls
+from .css_pruner import SelectorUsage
+from .fragments import FRAGMENT_CALL_PATTERN, PLACEHOLDER_ATTRIBUTE, fragment_template
+
+
+SHARED_BUNDLE = 'js_shared'
+PAGE_BUNDLE_PREFIX = 'js_page_'
+
+# Explicit feature markers: {# js: hero, counters #}
+FEATURE_COMMENT_PATTERN = re.compile(r'\{#\s*js:\s*([\w\s,-]+?)\s*#\}')
+RENDER_TEMPLATE_PATTERN = re.compile(r'render_template\(\s*[\'"]([^\'"]+\.(?:html|xml))[\'"]')
+
+
+class TemplateAnalyzer:
+    """
+    Find the script features a template needs.
+
+    A template needs a feature when it, or any template it extends,
+    includes, imports or places as a fragment, contains one of the
+    feature's markers: a '.class' or '#id' used in the markup, an
+    '[attribute]' name, or an explicit {# js: name #} comment.
+    """
+
+    def __init__(self, env, features: Dict[str, Dict]):
+        """
+        Initialize analyzer.
+
+        Args:
+            env: Jinja environment the templates are loaded from
+            features: Feature definitions ({'name': {'inputs': [...], 'markers': [...]}})
+        """
+        self.env = env
+        self.features = features
+        self._sources: Dict[str, str] = {}
+        self._references: Dict[str, List[str]] = {}
+
+    def _source(self, name: str) -> str:
+        if name not in self._sources:
+            try:
+                self._sources[name] = self.env.loader.get_source(self.env, name)[0]
+            except TemplateError:
+                self._sources[name] = ''
+        return self._sources[name]
+
+    def _referenced(self, name: str) -> List[str]:
+        if name not in self._references:
+            try:
+                found = meta.find_referenced_templates(self.env.parse(self._source(name)))
+                self._references[name] = [reference for reference in found if reference]
+            except TemplateError:
+                self._references[name] = []
+            # Fragments load into the page that places them
+            self._references[name] += [fragment_template(fragment) for fragment
+                                       in FRAGMENT_CALL_PATTERN.findall(self._source(name))]
+        return self._references[name]
+
+    def chain(self, name: str) -> List[str]:
+        """
+        Get a template and every template it pulls in, recursively.
+
+        Args:
+            name: Template name
+
+        Returns:
+            list: Template names, starting with name
+        """
+        chain = [name]
+        for template in chain:
+            chain.extend(reference for reference in self._referenced(template)
+                         if reference not in chain)
+        return chain
+
+    def features_for(self, name: str) -> List[str]:
+        """
+        Get the features a template needs.
+
+        Args:
+            name: Template name
+
+        Returns:
+            list: Feature names in config.JS_FEATURES order
+        """
+        usage = SelectorUsage()
+        text = ''
+        marked: Set[str] = set()
+
+        for template in self.chain(name):
+            source = self._source(template)
+            usage.add_source(source)
+            text += source + '\n'
+            if FRAGMENT_CALL_PATTERN.search(source):
+                # The placeholder fragment() renders
+                text += PLACEHOLDER_ATTRIBUTE + '\n'
+            for match in FEATURE_COMMENT_PATTERN.finditer(source):
+                marked.update(feature.strip() for feature in match.group(1).split(','))
+
+        return [feature for feature, spec in self.features.items()
+                if feature in marked or any(self._has_marker(marker, usage, text)
+                                            for marker in spec.get('markers', []))]
+
+    @staticmethod
+    def _has_marker(marker: str, usage: SelectorUsage, text: str) -> bool:
+        if marker.startswith(('.', '#')):
+            return usage.has_name(marker[1:])
+        if marker.startswith('['):
+            attribute = re.escape(marker.strip('[]'))
+            return re.search(rf'(?<![\w-]){attribute}(?![\w-])', text) is not None
+        return marker in text
+
+
+def find_page_templates(app) -> List[str]:
+    """
+    Find the templates views render as whole pages.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        list: Template names passed literally to render_template()
+    """
+    pages: List[str] = []
+
+    for root, dirs, files in os.walk(app.root_path):
+        dirs[:] = [d for d in dirs if d not in ('__pycache__', 'static', 'templates')]
+        for name in sorted(files):
+            if name.endswith('.py'):
+                with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                    pages.extend(template for template in RENDER_TEMPLATE_PATTERN.findall(f.read())
+                                 if template not in pages)
+
+    return pages
+
+
+class JSSplit:
+    """
+    Per-page script bundles derived from the templates.
+
+    Features every page needs form the shared chunk; each page's other
+    features form a page bundle, shared by all pages needing exactly
+    that set. Bundles are built by the asset bundler like those of
+    config.ASSET_BUNDLES.
+    """
+
+    def __init__(self, bundles: Dict[str, Dict], templates: Dict[str, List[str]],
+                 features: Dict[str, List[str]], modules: Set[str]):
+        """
+        Initialize split.
+
+        Args:
+            bundles: Bundle name to definition ({'inputs': [...]})
+            templates: Template name to bundle names, in load order
+            features: Template name to feature names
+            modules: Input files using ES module syntax
+        """
+        self.bundles = bundles
+        self.templates = templates
+        self.features = features
+        self.modules = modules
+
+    def bundles_for(self, template: Optional[str]) -> List[str]:
+        """
+        Get the bundles a page loads.
+
+        Args:
+            template: Template the view rendered
+
+        Returns:
+            list: Bundle names, shared chunk first
+        """
+        default = [SHARED_BUNDLE] if SHARED_BUNDLE in self.bundles else []
+        return self.templates.get(template or '', default)
+
+
+def get_feature_definitions() -> Dict[str, Dict]:
+    """Get the script features from config.JS_FEATURES."""
+    from config import JS_FEATURES
+    return JS_FEATURES
+
+
+def plan_js_split(app, features: Optional[Dict[str, Dict]] = None) -> JSSplit:
+    """
+    Analyze the templates and plan the shared and per-page bundles.
+
+    Args:
+        app: Flask application instance
+        features: Feature definitions (default: config.JS_FEATURES)
+
+    Returns:
+        JSSplit
+    """
+    features = features if features is not None else get_feature_definitions()
+    analyzer = TemplateAnalyzer(app.jinja_env, features)
+
+    def inputs(names: List[str], exclude: Set[str] = frozenset()) -> List[str]:
+        paths = [path for name in names for path in features[name]['inputs']]
+        return [path for path in dict.fromkeys(paths) if path not in exclude]
+
+    # Only pages get bundles: partials reach them through their
+    # include/extends chain, which features_for() follows
+    available = set(app.jinja_env.list_templates(extensions=['html']))
+    template_features = {name: analyzer.features_for(name)
+                         for name in find_page_templates(app) if name in available}
+
+    pages = list(template_features)
+    shared = [feature for feature in features
+              if pages and all(feature in template_features[page] for page in pages)]
+
+    bundles: Dict[str, Dict] = {}
+    if shared:
+        bundles[SHARED_BUNDLE] = {'inputs': inputs(shared)}
+    shared_inputs = set(bundles.get(SHARED_BUNDLE, {}).get('inputs', []))
+
+    templates: Dict[str, List[str]] = {}
+    for name, needed in template_features.items():
+        own = [feature for feature in needed if feature not in shared]
+        page_inputs = inputs(own, shared_inputs)
+
+        templates[name] = [SHARED_BUNDLE] if shared else []
+        if page_inputs:
+            bundle = PAGE_BUNDLE_PREFIX + '_'.join(own)
+            bundles.setdefault(bundle, {'inputs': page_inputs})
+            templates[name].append(bundle)
+
+    modules = set()
+    for bundle in bundles.values():
+        for path in bundle['inputs']:
+            try:
+                with open(os.path.join(app.static_folder, *path.split('/')), 'r',
+                          encoding='utf-8') as f:
+                    if JS_MODULE_SYNTAX_PATTERN.search(f.read()):
+                        modules.add(path)
+            except (IOError, OSError):
+                app.logger.warning(f'JS feature input not found: {path}')
+
+    return JSSplit(bundles, templates, template_features, modules)
+
+
+def get_js_split(app=None) -> Optional[JSSplit]:
+    """
+    Get the JavaScript split attached to an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        JSSplit or None if splitting is not configured
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('js_split')
+
+
+def script_tags() -> Markup:
+    """
+    Get the <script> tags of the current page.
+
+    Built bundles are loaded with defer; when bundles are not built
+    (development) the input files are linked directly, as type=module
+    if they use import/export. The shared chunk's tags carry data-shared:
+    js/partial-navigation.js runs it once per document and the page
+    bundles again on every page swap.
+
+    Returns:
+        Markup: <script> tags, shared chunk first
+    """
+    split = get_js_split()
+    if split is None:
+        return Markup('')
+
+    from flask import current_app
+
+    built = current_app.extensions.get('asset_bundles', {})
+    tags = []
+
+    for name in split.bundles_for(g.get('page_template')):
+        shared = ' data-shared' if name == SHARED_BUNDLE else ''
+
+        if name in built:
+            tags.extend(f'<script src="{escape(url)}" defer{shared}></script>'
+                        for url in asset_urls(name))
+            continue
+
+        for path in split.bundles[name]['inputs']:
+            url = escape(url_for('static', filename=path))
+            if path in split.modules:
+                tags.append(f'<script type="module" src="{url}"{shared}></script>')
+            else:
+                tags.append(f'<script src="{url}" defer{shared}></script>')
+
+    return Markup('\n'.join(tags))
+
+
+def init_js_split(app) -> Optional[JSSplit]:
+    """
+    Plan the per-page script bundles and register the script_tags helper.
+
+    Must run before the asset bundles are loaded, which build the
+    planned bundles along with config.ASSET_BUNDLES.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        JSSplit or None if JS_SPLIT_ENABLED is off
+    """
+    split = None
+
+    if app.config.get('JS_SPLIT_ENABLED'):
+        split = plan_js_split(app)
+        app.extensions['js_split'] = split
+
+        def record_page_template(sender, template, context, **extra):
+            # The first template rendered in a request is the page itself
+            if 'page_template' not in g:
+                g.page_template = template.name
+
+        before_render_template.connect(record_page_template, app, weak=False)
+
+    app.jinja_env.globals['script_tags'] = script_tags
+    return split
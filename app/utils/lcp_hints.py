@@ -0,0 +1,369 @@
+# /app/utils/lcp_hints.py
+"""
+LCP hints for Adaptive Auto Hub website.
+Adds intrinsic image dimensions and prioritizes and preloads each page's above-the-fold hero image.
+"""
+
+import os
+import posixpath
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from flask import request
+from markupsafe import escape
+from PIL import Image
+
+from .fingerprint import HASHED_NAME_PATTERN
+from .fragments import is_document
+from .page_cache import is_page_cache_hit
+
+
+RASTER_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif')
+
+# Elements tracked while scanning a page for its fold and its images
+PAGE_TAG_PATTERN = re.compile(
+    r'<(/?)(body|section|noscript|template|picture)\b[^>]*>|<(img|source)\b[^>]*>', re.I
+)
+TAG_NAME_PATTERN = re.compile(r'<[\w-]*')
+ATTRIBUTE_PATTERN = re.compile(r'''([^\s"'=<>/]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'=<>`]+))?''')
+HEAD_RESOURCE_PATTERN = re.compile(r'<(?:link|style|script)\b|</head>', re.I)
+
+SVG_ROOT_PATTERN = re.compile(r'<svg\b[^>]*>', re.I)
+SVG_LENGTH_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(?:px)?\s*$')
+
+
+def _svg_size(path: str) -> Optional[Tuple[int, int]]:
+    """Size of an SVG from its root width/height, falling back to the viewBox."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        root = SVG_ROOT_PATTERN.search(f.read(4096))
+    if root is None:
+        return None
+
+    attributes = _parse_attributes(root.group(0))
+    width = SVG_LENGTH_PATTERN.match(attributes.get('width', ''))
+    height = SVG_LENGTH_PATTERN.match(attributes.get('height', ''))
+    if width and height:
+        return round(float(width.group(1))), round(float(height.group(1)))
+
+    view_box = attributes.get('viewbox', '').replace(',', ' ').split()
+    if len(view_box) == 4:
+        try:
+            return round(float(view_box[2])), round(float(view_box[3]))
+        except ValueError:
+            return None
+    return None
+
+
+def _parse_attributes(tag: str) -> Dict[str, str]:
+    """Attributes of a start tag (names lowercased, values unquoted)."""
+    attributes = {}
+    for name, value in ATTRIBUTE_PATTERN.findall(tag, TAG_NAME_PATTERN.match(tag).end()):
+        name = name.lower()
+        if name not in attributes:
+            attributes[name] = value[1:-1] if value[:1] in ('"', "'") else value
+    return attributes
+
+
+class ImageDimensions:
+    """
+    In-memory map of static images to their intrinsic size.
+
+    Built once at startup by reading the header of every image under
+    the static images folder, like the fingerprint map; a deploy
+    restarts the app, so the map always matches the files on disk.
+    """
+
+    def __init__(self, static_folder: str, folder: str = 'images'):
+        """
+        Initialize and build the dimension map.
+
+        Args:
+            static_folder: Path to Flask static folder
+            folder: Images folder, relative to the static folder
+        """
+        self.static_folder = static_folder
+        self.folder = folder
+        self._sizes: Dict[str, Tuple[int, int]] = {}
+        self.build()
+
+    def build(self) -> None:
+        """Read the size of every raster and SVG image."""
+        sizes = {}
+
+        for root, _, files in os.walk(os.path.join(self.static_folder, self.folder)):
+            for name in files:
+                extension = os.path.splitext(name)[1].lower()
+                if extension not in RASTER_EXTENSIONS and extension != '.svg':
+                    continue
+
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, self.static_folder).replace(os.sep, '/')
+                try:
+                    if extension == '.svg':
+                        size = _svg_size(path)
+                    else:
+                        # Only the header is read
+                        with Image.open(path) as image:
+                            size = image.size
+                except (IOError, OSError, SyntaxError, ValueError):
+                    size = None
+
+                if size and size[0] > 0 and size[1] > 0:
+                    sizes[relative] = size
+
+        self._sizes = sizes
+
+    def lookup(self, filename: str) -> Optional[Tuple[int, int]]:
+        """
+        Get the intrinsic size of a static image.
+
+        Args:
+            filename: Path relative to the static folder (may be fingerprinted)
+
+        Returns:
+            tuple: (width, height), or None if unknown
+        """
+        size = self._sizes.get(filename)
+        if size is None:
+            match = HASHED_NAME_PATTERN.match(filename)
+            if match:
+                size = self._sizes.get(match.group('stem') + match.group('ext'))
+        return size
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+
+class PageImage(NamedTuple):
+    """An <img> found while scanning a page."""
+    match: re.Match
+    attributes: Dict[str, str]
+    in_fold: bool
+    sources: List[Dict[str, str]]  # <source> siblings inside a <picture>
+
+
+def find_page_images(html: str) -> List[PageImage]:
+    """
+    Find a page's images and whether each is above the fold.
+
+    The fold is everything in <body> up to the end of the first
+    <section> (the page hero), as for critical CSS. Images in
+    <noscript> and <template> are skipped.
+
+    Args:
+        html: Rendered page
+
+    Returns:
+        list: Images in document order
+    """
+    images: List[PageImage] = []
+    in_body = False
+    fold_done = False
+    hidden_depth = 0
+    section_depth = 0
+    sources: Optional[List[Dict[str, str]]] = None
+
+    for match in PAGE_TAG_PATTERN.finditer(html):
+        closing, container, element = match.group(1), (match.group(2) or '').lower(), match.group(3)
+
+        if element:
+            if hidden_depth or not in_body:
+                continue
+            attributes = _parse_attributes(match.group(0))
+            if element.lower() == 'source':
+                if sources is not None:
+                    sources.append(attributes)
+            else:
+                images.append(PageImage(match, attributes, not fold_done, sources or []))
+            continue
+
+        if container == 'body':
+            in_body = not closing
+        elif container in ('noscript', 'template'):
+            hidden_depth = max(hidden_depth + (-1 if closing else 1), 0)
+        elif container == 'picture':
+            sources = None if closing else []
+        elif container == 'section' and in_body and not hidden_depth:
+            section_depth += -1 if closing else 1
+            if closing and section_depth <= 0:
+                fold_done = True
+
+    return images
+
+
+def _static_filename(src: str, static_prefix: str) -> Optional[str]:
+    """Static folder path of an image URL ('images/hero.png'), if it is one."""
+    path = urlsplit(src).path
+    if not path.startswith(static_prefix + 'images/'):
+        return None
+    return posixpath.normpath(path[len(static_prefix):])
+
+
+def _with_attributes(tag: str, remove: Tuple[str, ...], add: List[Tuple[str, str]]) -> str:
+    """Rewrite a start tag, dropping some attributes and appending others."""
+    for name in remove:
+        tag = re.sub(rf'''\s+{name}(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?(?=[\s/>])''',
+                     '', tag, flags=re.I)
+
+    end = len(tag) - (2 if tag.endswith('/>') else 1)
+    added = ''.join(f' {name}="{escape(value)}"' for name, value in add)
+    return tag[:end].rstrip() + added + tag[end:]
+
+
+def _preload_tag(image: PageImage) -> str:
+    """<link rel=preload> matching what the browser will fetch for an image."""
+    attributes = image.attributes
+
+    # A <picture> loads its first <source> of a type the browser supports;
+    # every supported browser takes the leading modern-format source
+    source = next((source for source in image.sources
+                   if source.get('srcset') and not source.get('media')), None)
+
+    if source is not None:
+        link = [('imagesrcset', source['srcset'])]
+        if source.get('sizes') or attributes.get('sizes'):
+            link.append(('imagesizes', source.get('sizes') or attributes['sizes']))
+        if source.get('type'):
+            link.append(('type', source['type']))
+    elif attributes.get('srcset'):
+        link = [('imagesrcset', attributes['srcset'])]
+        if attributes.get('sizes'):
+            link.append(('imagesizes', attributes['sizes']))
+    else:
+        link = [('href', attributes['src'])]
+
+    rendered = ''.join(f' {name}="{escape(value)}"' for name, value in link)
+    return f'<link rel="preload" as="image"{rendered} fetchpriority="high">'
+
+
+def add_lcp_hints(html: str, dimensions: ImageDimensions, static_prefix: str = '/static/',
+                  min_area: int = 40000) -> str:
+    """
+    Add image dimensions and LCP hints to a rendered page.
+
+    Every static <img> missing width or height gets the image's
+    intrinsic size (so it reserves its box before loading). The first
+    image above the fold rendered at least min_area CSS pixels is taken
+    as the LCP candidate: it loads eagerly with fetchpriority="high" and
+    a matching <link rel="preload"> is added to <head>.
+
+    Args:
+        html: Rendered page
+        dimensions: Intrinsic image sizes
+        static_prefix: URL prefix of the static folder
+        min_area: Smallest rendered area (width x height) of a hero image
+
+    Returns:
+        str: Page with hints added
+    """
+    pieces: List[str] = []
+    position = 0
+    preload = None
+
+    for image in find_page_images(html):
+        attributes = image.attributes
+        src = attributes.get('src', '')
+        filename = _static_filename(src, static_prefix) if src else None
+        if filename is None:
+            continue
+
+        add: List[Tuple[str, str]] = []
+        remove: Tuple[str, ...] = ()
+
+        width, height = attributes.get('width', ''), attributes.get('height', '')
+        if not (width.isdigit() and height.isdigit()):
+            size = dimensions.lookup(filename)
+            if size is None:
+                continue
+            # Keep an authored width or height and derive the other from the ratio
+            if width.isdigit():
+                size = (int(width), max(1, round(int(width) * size[1] / size[0])))
+            elif height.isdigit():
+                size = (max(1, round(int(height) * size[0] / size[1])), int(height))
+            width, height = str(size[0]), str(size[1])
+            remove += ('width', 'height')
+            add += [('width', width), ('height', height)]
+
+        if (preload is None and image.in_fold and int(width) * int(height) >= min_area
+                and attributes.get('fetchpriority', '').lower() != 'low'):
+            preload = _preload_tag(image)
+            remove += ('loading', 'fetchpriority', 'data-lqip')
+            add += [('loading', 'eager'), ('fetchpriority', 'high')]
+
+        if add:
+            pieces.append(html[position:image.match.start()])
+            pieces.append(_with_attributes(image.match.group(0), remove, add))
+            position = image.match.end()
+
+    if not pieces and preload is None:
+        return html
+
+    pieces.append(html[position:])
+    html = ''.join(pieces)
+
+    # A page hinted before keeps a single preload
+    if preload is not None and preload not in html:
+        head = HEAD_RESOURCE_PATTERN.search(html)
+        if head is not None:
+            html = html[:head.start()] + preload + html[head.start():]
+
+    return html
+
+
+def get_image_dimensions(app=None) -> Optional[ImageDimensions]:
+    """
+    Get the image dimension map attached to an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        ImageDimensions or None if LCP hints are disabled
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('image_dimensions')
+
+
+def init_lcp_hints(app) -> Optional[ImageDimensions]:
+    """
+    Read the static image sizes and register the LCP hint response filter.
+
+    Call after the page cache is configured, so cached pages are stored
+    with their hints.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        ImageDimensions or None if LCP_HINTS_ENABLED is off
+    """
+    if not app.config.get('LCP_HINTS_ENABLED') or not app.has_static_folder:
+        return None
+
+    dimensions = ImageDimensions(app.static_folder)
+    app.extensions['image_dimensions'] = dimensions
+
+    static_prefix = app.static_url_path.rstrip('/') + '/'
+    min_area = app.config.get('LCP_HINT_MIN_AREA', 40000)
+
+    @app.after_request
+    def add_lcp_hints_to_response(response):
+        if (response.mimetype != 'text/html' or response.direct_passthrough
+                or response.is_streamed or response.content_encoding
+                or response.status_code in (204, 304) or request.method == 'HEAD'
+                or is_page_cache_hit()):
+            return response
+
+        html = response.get_data(as_text=True)
+        if not is_document(html):
+            # Fragments load below the fold, after the page's LCP
+            return response
+        hinted = add_lcp_hints(html, dimensions, static_prefix, min_area)
+        if hinted is not html:
+            response.set_data(hinted)
+        return response
+
+    return dimensions
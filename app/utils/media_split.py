@@ -0,0 +1,175 @@
+# /app/utils/media_split.py
+"""
+Media query splitting for Adaptive Auto Hub website.
+Partitions bundled CSS by top-level @media condition into separately linked stylesheets.
+"""
+
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from .css_pruner import COMMENT_PATTERN, GROUPING_AT_RULES, _split_selector_list, split_css_rules
+
+
+MEDIA_PATTERN = re.compile(r'@media\s+([^{;]+?)\s*\{', re.I)
+COMBINATOR_PATTERN = re.compile(r'\s*[>+~]\s*|\s+')
+
+# Selector pieces counted for specificity: ids, classes, types
+ID_SELECTOR_PATTERN = re.compile(r'#[\w-]+')
+CLASS_SELECTOR_PATTERN = re.compile(r'\.[\w-]+|\[[^\]]*\]|(?<!:):(?!not\(|is\()[\w-]+')
+TYPE_SELECTOR_PATTERN = re.compile(r'(?:^|(?<=[\s>+~(]))[a-zA-Z][\w-]*|::[\w-]+')
+
+# Conditions every screen matches: a separate file would still block
+ALWAYS_MATCHING_MEDIA = {'all', 'screen', 'only screen'}
+
+# Shorthands whose longhands do not share their prefix
+PROPERTY_FAMILIES = {
+    'top': 'inset', 'right': 'inset', 'bottom': 'inset', 'left': 'inset',
+    'row-gap': 'gap', 'column-gap': 'gap'
+}
+
+# (source file, first source line, text), as produced by the bundler
+Chunk = Tuple[str, int, str]
+
+
+def split_media_rule(text: str) -> Optional[Tuple[str, str]]:
+    """
+    Unwrap a top-level @media block.
+
+    Args:
+        text: One top-level rule
+
+    Returns:
+        tuple: (condition, inner CSS), or None if the rule is not @media
+    """
+    text = text.strip()
+    match = MEDIA_PATTERN.match(text)
+    if not match or not text.endswith('}'):
+        return None
+    return ' '.join(match.group(1).split()), text[match.end():-1]
+
+
+def media_slug(condition: str) -> str:
+    """Filename-safe form of a media condition ('max-width-768px')."""
+    return re.sub(r'[^a-z0-9]+', '-', condition.lower()).strip('-') or 'media'
+
+
+def _property_family(declaration: str) -> str:
+    """Shorthand a declaration's property belongs to ('margin-top' -> 'margin')."""
+    name = declaration.split(':', 1)[0].strip().lower()
+    if name.startswith('--'):
+        return name
+
+    name = re.sub(r'^-[a-z]+-', '', name)
+    return PROPERTY_FAMILIES.get(name, name.split('-', 1)[0])
+
+
+def _specificity(selector: str) -> str:
+    """Selector specificity as 'ids,classes,types'."""
+    return ','.join(str(len(pattern.findall(selector)))
+                    for pattern in (ID_SELECTOR_PATTERN, CLASS_SELECTOR_PATTERN,
+                                    TYPE_SELECTOR_PATTERN))
+
+
+def rule_keys(css: str) -> Set[str]:
+    """
+    Get what the rules of a CSS fragment set, for cascade-order checks.
+
+    Style rules are keyed by the last compound of each selector (the
+    element the declarations apply to), its specificity and each
+    property's shorthand family and importance; other at-rules by their
+    prelude. Source order only decides between rules sharing a key.
+
+    Args:
+        css: CSS rules
+
+    Returns:
+        set: Keys such as '.nav__menu 0,2,0 padding', 'a:hover 0,1,1 color!'
+             or '@keyframes spin'
+    """
+    keys: Set[str] = set()
+
+    for _, rule in split_css_rules(css):
+        brace = rule.find('{')
+        if brace == -1:
+            continue
+
+        header = ' '.join(COMMENT_PATTERN.sub('', rule[:brace]).split())
+        if header.startswith('@'):
+            if header.lower().startswith(GROUPING_AT_RULES):
+                keys |= rule_keys(rule[brace + 1:rule.rfind('}')])
+            else:
+                keys.add(header)
+            continue
+
+        families = {_property_family(declaration) + ('!' if '!important' in declaration else '')
+                    for declaration in rule[brace + 1:rule.rfind('}')].split(';')
+                    if ':' in declaration}
+        for selector in _split_selector_list(header):
+            prefix = f'{COMBINATOR_PATTERN.split(selector)[-1]} {_specificity(selector)}'
+            keys.update(f'{prefix} {family}' for family in families)
+
+    return keys
+
+
+def split_media_chunks(chunks: List[Chunk], min_bytes: int = 0) -> Dict[str, List[Chunk]]:
+    """
+    Partition bundle chunks by top-level @media condition.
+
+    Each condition's rules move, unwrapped, into their own stylesheet,
+    linked after the base one with a media attribute. A rule stays in
+    the base stylesheet when a later rule outside its new file sets the
+    same property of the same element (moving it would change which
+    one wins), or when
+    its condition has less than min_bytes of CSS (not worth a request).
+
+    Args:
+        chunks: Bundle chunks in cascade order
+        min_bytes: Smallest condition worth a stylesheet of its own
+
+    Returns:
+        dict: '' (base) and each media condition, in link order, to chunks
+    """
+    unwrapped = [split_media_rule(text) for _, _, text in chunks]
+
+    conditions: List[str] = []
+    for media in unwrapped:
+        if media and media[0].lower() not in ALWAYS_MATCHING_MEDIA and media[0] not in conditions:
+            conditions.append(media[0])
+
+    # Output index per chunk: 0 is the base stylesheet
+    targets = [conditions.index(media[0]) + 1 if media and media[0] in conditions else 0
+               for media in unwrapped]
+    keys = [rule_keys(media[1] if media else text)
+            for media, (_, _, text) in zip(unwrapped, chunks)]
+
+    changed = True
+    while changed:
+        changed = False
+
+        sizes = [0] * (len(conditions) + 1)
+        for index, target in enumerate(targets):
+            if target:
+                sizes[target] += len(unwrapped[index][1])
+        for index, target in enumerate(targets):
+            if target and sizes[target] < min_bytes:
+                targets[index] = 0
+                changed = True
+
+        # Walking backwards, a rule must not load after a later rule for
+        # the same element; pinning it to the base can only affect
+        # earlier rules, which are checked next
+        later: List[Set[str]] = [set() for _ in range(len(conditions) + 1)]
+        for index in range(len(chunks) - 1, -1, -1):
+            target = targets[index]
+            if target and any(keys[index] & later[output] for output in range(target)):
+                targets[index] = target = 0
+                changed = True
+            later[target] |= keys[index]
+
+    parts: List[List[Chunk]] = [[] for _ in range(len(conditions) + 1)]
+    for (source, line, text), media, target in zip(chunks, unwrapped, targets):
+        parts[target].append((source, line, media[1] if target else text))
+
+    result = {'': parts[0]}
+    result.update((condition, part) for condition, part in zip(conditions, parts[1:]) if part)
+    return result
@@ -0,0 +1,502 @@
+# /app/utils/og_cards.py
+"""
+Open Graph card renderer for Adaptive Auto Hub website.
+Composites page title, subtitle and hero imagery into 1200x630 social cards.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+
+class OGCardRenderer:
+    """
+    Renders and caches per-page Open Graph cards.
+
+    Cards are keyed by a content hash of their inputs (text, imagery
+    and layout version), so a card is only ever rendered once per
+    distinct input set and its URL can be served as immutable.
+    """
+
+    CARD_SIZE = (1200, 630)
+    LAYOUT_VERSION = '1'
+
+    BACKGROUND_COLOR = (15, 23, 42)
+    ACCENT_COLOR = (30, 64, 175)
+    TEXT_COLOR = (255, 255, 255)
+    MUTED_TEXT_COLOR = (203, 213, 225)
+
+    DEFAULT_BACKGROUND = 'images/hero-drone.jpg'
+    LOGO = 'images/logo.png'
+
+    FONT_CANDIDATES = [
+        '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+        '/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf',
+        'DejaVuSans-Bold.ttf',
+        'Arial Bold.ttf',
+        'arialbd.ttf'
+    ]
+
+    def __init__(self, static_folder: str, quality: int = 85):
+        """
+        Initialize renderer with static folder path.
+
+        Args:
+            static_folder: Path to Flask static folder
+            quality: JPEG quality for rendered cards
+        """
+        self.static_folder = static_folder
+        self.output_folder = os.path.join(static_folder, 'gen', 'og')
+        self.quality = quality
+
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._file_hashes: Dict[str, str] = {}
+
+    def card_key(self, title: str, subtitle: str = '',
+                 image: Optional[str] = None) -> str:
+        """
+        Compute the content hash identifying a card.
+
+        Args:
+            title: Card headline
+            subtitle: Secondary line of text
+            image: Static-relative path of the background image
+
+        Returns:
+            16 character hex digest
+        """
+        payload = json.dumps({
+            'layout': self.LAYOUT_VERSION,
+            'size': self.CARD_SIZE,
+            'quality': self.quality,
+            'title': title,
+            'subtitle': subtitle,
+            'image': image,
+            'image_hash': self._hash_static_file(image),
+            'logo_hash': self._hash_static_file(self.LOGO)
+        }, sort_keys=True)
+
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def card_path(self, key: str) -> str:
+        """Get the on-disk path of a rendered card."""
+        return os.path.join(self.output_folder, f'{key}.jpg')
+
+    def render(self, title: str, subtitle: str = '',
+               image: Optional[str] = None) -> str:
+        """
+        Render a card unless a cached copy already exists.
+
+        Concurrent requests for the same card wait on a per-key lock,
+        so each card is rendered at most once per process; the file is
+        written atomically so other workers never see a partial image.
+
+        Args:
+            title: Card headline
+            subtitle: Secondary line of text
+            image: Static-relative path of the background image
+
+        Returns:
+            Path to the rendered JPEG file
+        """
+        key = self.card_key(title, subtitle, image)
+        path = self.card_path(key)
+
+        if os.path.exists(path):
+            return path
+
+        with self._lock_for(key):
+            if os.path.exists(path):
+                return path
+
+            card = self._compose(title, subtitle, image)
+
+            os.makedirs(self.output_folder, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            card.save(tmp_path, 'JPEG', quality=self.quality,
+                      optimize=True, progressive=True)
+            os.replace(tmp_path, path)
+
+        return path
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        """Get (or create) the render lock for a card key."""
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _hash_static_file(self, relative_path: Optional[str]) -> str:
+        """
+        Hash a static file's content, memoized per process.
+
+        Args:
+            relative_path: Path relative to the static folder
+
+        Returns:
+            MD5 hex digest, or empty string if the file is missing
+        """
+        if not relative_path:
+            return ''
+
+        if relative_path not in self._file_hashes:
+            file_path = os.path.join(self.static_folder, relative_path)
+            try:
+                with open(file_path, 'rb') as f:
+                    digest = hashlib.md5(f.read()).hexdigest()
+            except (IOError, OSError):
+                digest = ''
+            self._file_hashes[relative_path] = digest
+
+        return self._file_hashes[relative_path]
+
+    def _open_static_image(self, relative_path: Optional[str]) -> Optional[Image.Image]:
+        """Open a static image, returning None if missing or unreadable."""
+        if not relative_path:
+            return None
+
+        try:
+            img = Image.open(os.path.join(self.static_folder, relative_path))
+            img.load()
+            return img
+        except (IOError, OSError):
+            return None
+
+    def _compose(self, title: str, subtitle: str,
+                 image: Optional[str]) -> Image.Image:
+        """
+        Composite the card image.
+
+        Args:
+            title: Card headline
+            subtitle: Secondary line of text
+            image: Static-relative path of the background image
+
+        Returns:
+            RGB PIL Image of CARD_SIZE
+        """
+        width, height = self.CARD_SIZE
+        card = Image.new('RGB', self.CARD_SIZE, self.BACKGROUND_COLOR)
+
+        background = (self._open_static_image(image) or
+                      self._open_static_image(self.DEFAULT_BACKGROUND))
+        if background is not None:
+            background = ImageOps.fit(
+                background.convert('RGB'),
+                self.CARD_SIZE,
+                Image.Resampling.LANCZOS
+            )
+            card.paste(background, (0, 0))
+
+        # Darken the left side so text stays legible on any photo
+        shade = Image.new('L', self.CARD_SIZE)
+        shade_draw = ImageDraw.Draw(shade)
+        for x in range(width):
+            shade_draw.line([(x, 0), (x, height)],
+                            fill=int(230 - 150 * (x / width)))
+        card.paste(Image.new('RGB', self.CARD_SIZE, self.BACKGROUND_COLOR),
+                   (0, 0), shade)
+
+        draw = ImageDraw.Draw(card)
+        margin = 72
+
+        # Accent bar
+        draw.rectangle([(0, 0), (16, height)], fill=self.ACCENT_COLOR)
+
+        # Logo
+        logo = self._open_static_image(self.LOGO)
+        if logo is not None:
+            logo = logo.convert('RGBA')
+            logo.thumbnail((220, 72), Image.Resampling.LANCZOS)
+            card.paste(logo, (margin, margin), logo)
+
+        # Title and subtitle, bottom-aligned
+        title_font = self._load_font(64)
+        subtitle_font = self._load_font(32)
+        max_text_width = width - 2 * margin
+
+        title_lines = self._wrap_text(draw, title, title_font,
+                                      max_text_width, max_lines=3)
+        subtitle_lines = self._wrap_text(draw, subtitle, subtitle_font,
+                                         max_text_width, max_lines=2)
+
+        y = height - margin
+        for line in reversed(subtitle_lines):
+            y -= 42
+            draw.text((margin, y), line, font=subtitle_font,
+                      fill=self.MUTED_TEXT_COLOR)
+
+        if subtitle_lines:
+            y -= 20
+
+        for line in reversed(title_lines):
+            y -= 76
+            draw.text((margin, y), line, font=title_font,
+                      fill=self.TEXT_COLOR)
+
+        return card
+
+    def _load_font(self, size: int) -> ImageFont.ImageFont:
+        """Load a bold TrueType font, falling back to Pillow's default."""
+        for candidate in self.FONT_CANDIDATES:
+            try:
+                return ImageFont.truetype(candidate, size)
+            except (IOError, OSError):
+                continue
+
+        try:
+            return ImageFont.load_default(size=size)
+        except TypeError:
+            return ImageFont.load_default()
+
+    @staticmethod
+    def _wrap_text(draw: ImageDraw.ImageDraw, text: str,
+                   font: ImageFont.ImageFont, max_width: int,
+                   max_lines: int) -> List[str]:
+        """
+        Greedy word wrap constrained to a pixel width.
+
+        Args:
+            draw: Drawing context used for measurement
+            text: Text to wrap
+            font: Font used for measurement
+            max_width: Maximum line width in pixels
+            max_lines: Lines kept before truncating with an ellipsis
+
+        Returns:
+            List of wrapped lines
+        """
+        lines = []
+        current = ''
+
+        for word in (text or '').split():
+            candidate = f'{current} {word}'.strip()
+            if draw.textlength(candidate, font=font) <= max_width or not current:
+                current = candidate
+            else:
+                lines.append(current)
+                current = word
+
+        if current:
+            lines.append(current)
+
+        if len(lines) > max_lines:
+            lines = lines[:max_lines]
+            lines[-1] = lines[-1].rstrip('.,;:') + '…'
+
+        return lines
+
+
+def _static_relative(url: Optional[str]) -> Optional[str]:
+    """Convert a '/static/...' URL into a static-folder relative path."""
+    if url and url.startswith('/static/'):
+        return url[len('/static/'):]
+    return url
+
+
+def get_og_card_specs() -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Build the card specification for every page that has one.
+
+    Card names mirror URL paths ('products/aura', 'industries/oil-gas')
+    and each spec holds the title, subtitle and background image.
+
+    Returns:
+        Dictionary mapping card name to its spec
+    """
+    from ..blueprints.products.routes import (
+        get_aura_data, get_aegis_data, get_products_data
+    )
+    from ..blueprints.industries.routes import get_industries_data
+    from ..blueprints.partnerships.routes import get_partnerships_data
+
+    specs = {
+        'home': {
+            'title': 'AI-Driven Drone Solutions',
+            'subtitle': 'for Infrastructure & Defense',
+            'image': 'images/hero-drone.jpg'
+        },
+        'products': {
+            'title': 'Aura Analytics & Aegis Defense',
+            'subtitle': 'AI-driven drone products',
+            'image': _static_relative(get_products_data()[0]['image'])
+        },
+        'industries': {
+            'title': 'Industries We Serve',
+            'subtitle': 'Oil & gas, infrastructure, defense and construction',
+            'image': 'images/industries/oil-gas.jpg'
+        },
+        'partnerships': {
+            'title': 'Strategic Partnerships',
+            'subtitle': 'Elphel Inc. and InterProInvest',
+            'image': 'images/hero-drone.jpg'
+        }
+    }
+
+    for product_id, data in (('aura', get_aura_data()),
+                             ('aegis', get_aegis_data())):
+        specs[f'products/{product_id}'] = {
+            'title': data['name'],
+            'subtitle': data['tagline'],
+            'image': _static_relative(data['hero_image'])
+        }
+
+    for industry in get_industries_data():
+        specs[f"industries/{industry['id']}"] = {
+            'title': industry['title'],
+            'subtitle': industry['name'],
+            'image': _static_relative(industry['hero_image'])
+        }
+
+    for partner_id, partner in get_partnerships_data().items():
+        specs[f'partnerships/{partner_id}'] = {
+            'title': f"{partner['name']} Partnership",
+            'subtitle': partner['type'],
+            'image': 'images/hero-drone.jpg'
+        }
+
+    return specs
+
+
+def card_name_for_endpoint(endpoint: Optional[str],
+                           view_args: Optional[Dict] = None) -> str:
+    """
+    Map a request endpoint to its Open Graph card name.
+
+    Args:
+        endpoint: Flask endpoint name
+        view_args: URL view arguments
+
+    Returns:
+        Card name, 'home' for pages without a dedicated card
+    """
+    view_args = view_args or {}
+
+    endpoint_cards = {
+        'products.index': 'products',
+        'products.aura': 'products/aura',
+        'products.aegis': 'products/aegis',
+        'industries.index': 'industries',
+        'partnerships.index': 'partnerships'
+    }
+
+    if endpoint in endpoint_cards:
+        return endpoint_cards[endpoint]
+
+    if endpoint == 'industries.industry_detail' and 'industry' in view_args:
+        return f"industries/{view_args['industry']}"
+
+    if endpoint == 'partnerships.detail' and 'partner_id' in view_args:
+        return f"partnerships/{view_args['partner_id']}"
+
+    return 'home'
+
+
+# Spec table, built once (specs only depend on the code)
+_specs_cache = None
+
+
+def get_renderer(app=None) -> OGCardRenderer:
+    """
+    Get the card renderer attached to an application, creating it on first use.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        OGCardRenderer writing to the application's static/gen/og
+    """
+    if app is None:
+        from flask import current_app as app
+
+    renderer = app.extensions.get('og_cards')
+    if renderer is None:
+        renderer = OGCardRenderer(app.static_folder,
+                                  quality=app.config.get('OG_CARD_QUALITY', 85))
+        app.extensions['og_cards'] = renderer
+    return renderer
+
+
+def get_card_spec(name: str) -> Optional[Dict[str, Optional[str]]]:
+    """Get a card spec by name, building the spec table once."""
+    global _specs_cache
+
+    if _specs_cache is None:
+        _specs_cache = get_og_card_specs()
+
+    return _specs_cache.get(name)
+
+
+def get_card_digest(name: str, app=None) -> Optional[str]:
+    """
+    Get the content digest used in a card's URL.
+
+    Args:
+        name: Card name
+        app: Flask application instance (optional)
+
+    Returns:
+        Digest string or None for unknown cards
+    """
+    spec = get_card_spec(name)
+    if spec is None:
+        return None
+    return get_renderer(app).card_key(spec['title'], spec['subtitle'], spec['image'])
+
+
+def og_card_url(card: str = 'home') -> str:
+    """
+    Template helper: absolute URL of a rendered card.
+
+    Args:
+        card: Card name (unknown names get the homepage card)
+
+    Returns:
+        str: https://.../og/<card>.<digest>.jpg
+    """
+    from flask import url_for
+
+    digest = get_card_digest(card)
+    if digest is None:
+        card = 'home'
+        digest = get_card_digest(card)
+    return url_for('main.og_card', card=card, digest=digest, _external=True)
+
+
+def render_all_cards(static_folder: str, quality: int = 85) -> List[str]:
+    """
+    Pre-render every known card (build-time bulk rendering).
+
+    Args:
+        static_folder: Path to Flask static folder
+        quality: JPEG quality for rendered cards
+
+    Returns:
+        List of rendered card file paths
+    """
+    renderer = OGCardRenderer(static_folder, quality=quality)
+    paths = []
+
+    for spec in get_og_card_specs().values():
+        paths.append(renderer.render(spec['title'], spec['subtitle'], spec['image']))
+
+    return paths
+
+
+def init_og_cards(app) -> OGCardRenderer:
+    """
+    Attach the card renderer and register the og_card_url() template helper.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        OGCardRenderer: The application's renderer
+    """
+    app.jinja_env.globals['og_card_url'] = og_card_url
+    return get_renderer(app)
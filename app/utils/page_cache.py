@@ -0,0 +1,415 @@
+# /app/utils/page_cache.py
+"""
+Full-page response cache for Adaptive Auto Hub website.
+Stores final (compressed) GET responses in-process with TTL and LRU eviction.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from flask import g, has_request_context, request, session
+
+from .http_cache import etag_matches, get_content_version, not_modified_response
+from .partial_navigation import is_partial_navigation
+from .shared_cache import SharedCache, get_shared_cache
+
+
+# Cached entry: (status, headers, body, expires_at)
+CachedPage = Tuple[int, List[Tuple[str, str]], bytes, float]
+
+MOBILE_UA_PATTERN = re.compile(r'Mobi|Android|iPhone|iPad|iPod|Opera Mini|IEMobile', re.I)
+
+# Headers never replayed from the cache
+UNCACHED_HEADERS = {'set-cookie', 'x-cache', 'date'}
+
+
+class PageCache:
+    """
+    Thread-safe in-process page cache.
+
+    Entries expire after a TTL and the least recently used entry is
+    evicted once the cache holds max_entries pages.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: int = 3600):
+        """
+        Initialize page cache.
+
+        Args:
+            max_entries: Maximum number of cached pages
+            ttl: Seconds before a cached page expires
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries: 'OrderedDict[str, CachedPage]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'bypassed': 0,
+            'evictions': 0,
+            'expired': 0
+        }
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        """
+        Look up a cached page, counting the hit or miss.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached page tuple or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[3] < time.time():
+                del self._entries[key]
+                self._stats['expired'] += 1
+                entry = None
+
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry
+
+    def set(self, key: str, status: int, headers: List[Tuple[str, str]],
+            body: bytes) -> None:
+        """
+        Store a page, evicting least recently used entries if full.
+
+        Args:
+            key: Cache key
+            status: HTTP status code
+            headers: Response headers to replay
+            body: Final response body bytes
+        """
+        with self._lock:
+            self._entries[key] = (status, headers, body, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def record_bypass(self) -> None:
+        """Count a request or response that skipped the cache."""
+        with self._lock:
+            self._stats['bypassed'] += 1
+
+    def clear(self) -> None:
+        """Drop every cached page."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hit/miss/bypass/eviction counters and current size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = sum(len(entry[2]) for entry in self._entries.values())
+            return stats
+
+
+class SharedPageCache(PageCache):
+    """
+    Page cache stored in a SharedCache.
+
+    Pages rendered by one worker process are served by every other
+    worker on the host; hit/miss counters remain per process.
+    """
+
+    KEY_PREFIX = 'page:'
+
+    # Content version of the build that filled the cache (outside KEY_PREFIX)
+    VERSION_KEY = 'page-cache:version'
+
+    def __init__(self, shared: SharedCache, ttl: int = 3600):
+        """
+        Initialize shared page cache.
+
+        Args:
+            shared: Backing cross-process store
+            ttl: Seconds before a cached page expires
+        """
+        super().__init__(max_entries=0, ttl=ttl)
+        self.shared = shared
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        data = self.shared.get(self.KEY_PREFIX + key)
+
+        with self._lock:
+            self._stats['hits' if data is not None else 'misses'] += 1
+
+        if data is None:
+            return None
+
+        meta, body = data.split(b'\n', 1)
+        meta = json.loads(meta)
+        headers = [(name, value) for name, value in meta['headers']]
+        return (meta['status'], headers, body, meta['expires_at'])
+
+    def set(self, key: str, status: int, headers: List[Tuple[str, str]],
+            body: bytes) -> None:
+        meta = json.dumps({
+            'status': status,
+            'headers': headers,
+            'expires_at': time.time() + self.ttl
+        }).encode('utf-8')
+        self.shared.set(self.KEY_PREFIX + key, meta + b'\n' + body, ttl=self.ttl)
+
+    def clear(self) -> None:
+        self.shared.clear(prefix=self.KEY_PREFIX)
+
+    def reset_for_version(self, version: str) -> bool:
+        """
+        Drop pages cached by a different build.
+
+        The store outlives worker restarts, so pages rendered by the
+        previous deploy (linking its fingerprinted bundles) are cleared
+        when the first worker of a new build starts.
+
+        Args:
+            version: Content version of the running build
+
+        Returns:
+            bool: True if the cache held pages of another build
+        """
+        version = version.encode('utf-8')
+        if self.shared.get(self.VERSION_KEY) == version:
+            return False
+
+        self.clear()
+        self.shared.set(self.VERSION_KEY, version)
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(self.shared.get_stats())
+        return stats
+
+
+def get_device_class(user_agent: str) -> str:
+    """Classify a User-Agent string as 'mobile' or 'desktop'."""
+    return 'mobile' if MOBILE_UA_PATTERN.search(user_agent or '') else 'desktop'
+
+
+def _negotiated_encoding(app) -> str:
+    """Reduce Accept-Encoding to the encoding Flask-Compress would pick."""
+    accept_encoding = request.headers.get('Accept-Encoding', '')
+    compress = app.extensions.get('compress')
+
+    if compress is not None:
+        return compress._choose_compress_algorithm(accept_encoding) or 'identity'
+
+    return 'identity'
+
+
+def make_cache_key(app) -> str:
+    """
+    Build the cache key for the current request.
+
+    Combines host, path, query string, negotiated content encoding,
+    device class, navigation mode (full or partial page) and content
+    version (so a shared cache never serves pages rendered by a
+    previous deploy).
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        str: Cache key
+    """
+    return '|'.join([
+        request.host,
+        request.path,
+        request.query_string.decode('latin-1'),
+        _negotiated_encoding(app),
+        get_device_class(request.headers.get('User-Agent', '')),
+        'partial' if is_partial_navigation() else 'page',
+        get_content_version(app)['hash']
+    ])
+
+
+def _is_cacheable_request(app) -> bool:
+    """Check whether the current request may be served from the cache."""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+
+    if request.endpoint is None:
+        return False
+
+    if request.endpoint in app.config.get('PAGE_CACHE_EXEMPT_ENDPOINTS', []):
+        return False
+
+    # Authenticated requests always go to the view
+    if 'Authorization' in request.headers:
+        return False
+
+    return True
+
+
+def _is_cacheable_response(response) -> bool:
+    """Check whether a final response can be shared between visitors."""
+    if response.status_code != 200:
+        return False
+
+    if response.direct_passthrough or response.is_streamed:
+        return False
+
+    if 'Set-Cookie' in response.headers:
+        return False
+
+    cache_control = response.cache_control
+    if cache_control.private or cache_control.no_store or cache_control.no_cache:
+        return False
+
+    # Anything that touched the session (CSRF tokens, flashed messages)
+    # is per-visitor
+    if session.accessed:
+        return False
+
+    return True
+
+
+def is_page_cache_hit() -> bool:
+    """
+    Check whether the current request is answered from the page cache.
+
+    Cached pages were stored after every HTML response filter ran, so
+    the filters skip hits instead of rewriting the page a second time.
+
+    Returns:
+        bool: True for page cache hits
+    """
+    return has_request_context() and bool(g.get('page_cache_hit'))
+
+
+def init_page_cache(app) -> PageCache:
+    """
+    Attach the page cache to a Flask application.
+
+    Call after compression is configured: the body inspection hook then
+    runs before compression, while the store hook is placed first in the
+    after_request chain so it runs last and caches the final bytes and
+    headers.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        PageCache: The configured cache
+    """
+    ttl = app.config.get('PAGE_CACHE_TTL', 3600)
+    shared = None
+
+    if app.config.get('PAGE_CACHE_BACKEND') == 'shared':
+        shared = get_shared_cache(app)
+        if shared is None:
+            app.logger.warning("PAGE_CACHE_BACKEND is 'shared' but SHARED_CACHE_PATH "
+                               "is not set - using in-process page cache")
+
+    if shared is not None:
+        cache = SharedPageCache(shared, ttl=ttl)
+        if cache.reset_for_version(get_content_version(app)['hash']):
+            app.logger.info('Page cache cleared: filled by another build')
+    else:
+        cache = PageCache(
+            max_entries=app.config.get('PAGE_CACHE_MAX_ENTRIES', 512),
+            ttl=ttl
+        )
+    app.extensions['page_cache'] = cache
+
+    def serve_cached_page():
+        g.page_cache_key = None
+        g.page_cache_hit = False
+        g.page_cache_bypass = False
+
+        if not _is_cacheable_request(app):
+            return None
+
+        key = make_cache_key(app)
+        g.page_cache_key = key
+
+        entry = cache.get(key)
+        if entry is None:
+            return None
+
+        status, headers, body, _ = entry
+        g.page_cache_hit = True
+
+        etag = next((value for name, value in headers if name.lower() == 'etag'), None)
+        if etag and etag_matches(etag):
+            response = not_modified_response(headers)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+
+        response = app.response_class(body, status=status, headers=headers)
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+    def inspect_page(response):
+        # Form-bearing pages carry per-visitor state; check before compression
+        if getattr(g, 'page_cache_key', None) and not g.page_cache_hit:
+            if (response.mimetype == 'text/html' and not response.direct_passthrough
+                    and b'<form' in response.get_data()):
+                g.page_cache_bypass = True
+        return response
+
+    def store_cached_page(response):
+        key = getattr(g, 'page_cache_key', None)
+
+        if key is None or g.page_cache_hit:
+            return response
+
+        if g.page_cache_bypass or not _is_cacheable_response(response):
+            cache.record_bypass()
+            response.headers['X-Cache'] = 'BYPASS'
+            return response
+
+        headers = [
+            (name, value) for name, value in response.headers.items()
+            if name.lower() not in UNCACHED_HEADERS
+        ]
+        cache.set(key, response.status_code, headers, response.get_data())
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+    app.before_request(serve_cached_page)
+    app.after_request(inspect_page)
+
+    # after_request handlers run in reverse order; storing must run last
+    app.after_request_funcs.setdefault(None, []).insert(0, store_cached_page)
+
+    return cache
+
+
+def get_page_cache(app=None) -> Optional[PageCache]:
+    """
+    Get the page cache attached to an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        PageCache or None if caching is disabled
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('page_cache')
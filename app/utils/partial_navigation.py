@@ -0,0 +1,67 @@
+# /app/utils/partial_navigation.py
+"""
+Partial page navigation for Adaptive Auto Hub website.
+Answers client-side page swaps with the page's title, meta, content and scripts instead of the whole base.html shell.
+"""
+
+from flask import current_app, has_request_context, request
+from markupsafe import Markup, escape
+
+
+# Request header js/partial-navigation.js sends ('1') to ask for a page swap
+PARTIAL_HEADER = 'X-Partial-Navigation'
+
+
+def is_partial_navigation() -> bool:
+    """
+    Check whether the current request asks for a partial page.
+
+    base.html then renders only the page's own head (title, description,
+    canonical URL, extra_head), its <main> content and its scripts.
+
+    Returns:
+        bool: True if PARTIAL_NAVIGATION_ENABLED and the request carries the header
+    """
+    return (has_request_context()
+            and bool(current_app.config.get('PARTIAL_NAVIGATION_ENABLED'))
+            and request.headers.get(PARTIAL_HEADER) == '1')
+
+
+def partial_navigation_tag() -> Markup:
+    """
+    Get the <meta> js/partial-navigation.js reads the request header from.
+
+    Without it the script leaves links to full page loads.
+
+    Returns:
+        Markup: <meta name="partial-navigation"> or '' if disabled
+    """
+    if not current_app.config.get('PARTIAL_NAVIGATION_ENABLED'):
+        return Markup('')
+    return Markup(f'<meta name="partial-navigation" content="{escape(PARTIAL_HEADER)}">')
+
+
+def init_partial_navigation(app) -> None:
+    """
+    Register the template helpers and the Vary response filter.
+
+    Every HTML response varies on the request header, so browsers and
+    shared caches keep full pages and swap payloads of a URL apart (the
+    page cache and content ETags do the same server-side).
+
+    Args:
+        app: Flask application instance
+    """
+    app.jinja_env.globals.update(
+        is_partial_navigation=is_partial_navigation,
+        partial_navigation_tag=partial_navigation_tag
+    )
+
+    if not app.config.get('PARTIAL_NAVIGATION_ENABLED'):
+        return
+
+    @app.after_request
+    def vary_on_partial_navigation(response):
+        if response.mimetype == 'text/html':
+            response.vary.add(PARTIAL_HEADER)
+        return response
@@ -0,0 +1,374 @@
+# /app/utils/picture_upgrade.py
+"""
+Responsive picture upgrade for Adaptive Auto Hub website.
+Rewrites plain static <img> tags into <picture> markup over the variants process_images.py generated.
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from flask import request
+from markupsafe import escape
+from PIL import Image
+
+from .fingerprint import HASHED_NAME_PATTERN, get_fingerprints
+from .lcp_hints import _parse_attributes, _with_attributes
+from .page_cache import is_page_cache_hit
+
+
+# Variants written by ImageOptimizer: 'aura-hero_800w_e9c791de.webp'
+VARIANT_NAME_PATTERN = re.compile(r'^.+_(\d+)w_([0-9a-f]{8})\.(avif|webp|jpg)$')
+PLACEHOLDER_NAME_PATTERN = re.compile(r'^.+_lqip_([0-9a-f]{8})\.jpg$')
+
+ORIGINAL_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+GENERATED_FOLDERS = ('optimized', 'placeholders', 'original')
+
+# <source> order: the browser takes the first type it supports
+SOURCE_TYPES = (('avif', 'image/avif'), ('webp', 'image/webp'))
+
+PICTURE_TAG_PATTERN = re.compile(r'<(/?)(picture|noscript|template)\b[^>]*>|<img\b[^>]*>', re.I)
+
+
+class ResponsiveImage:
+    """Generated variants of one original image."""
+
+    def __init__(self, size: Tuple[int, int], variants: Dict[str, List[Tuple[int, str]]],
+                 placeholder: Optional[str]):
+        """
+        Initialize image entry.
+
+        Args:
+            size: Intrinsic (width, height) of the original
+            variants: Format ('avif', 'webp', 'jpg') to (width, URL) pairs, narrowest first
+            placeholder: LQIP URL, if generated
+        """
+        self.size = size
+        self.variants = variants
+        self.placeholder = placeholder
+
+    def srcset(self, image_format: str) -> str:
+        """srcset of one format's variants."""
+        return ', '.join(f'{url} {width}w' for width, url in self.variants.get(image_format, []))
+
+    def fallback(self, width: Optional[int]) -> Optional[str]:
+        """Narrowest JPEG at least width wide (the widest if none is)."""
+        jpegs = self.variants.get('jpg', [])
+        if not jpegs:
+            return None
+        return next((url for variant_width, url in jpegs if width and variant_width >= width),
+                    jpegs[-1][1])
+
+
+class ResponsiveImages:
+    """
+    In-memory manifest of static images with optimized variants.
+
+    Variants are named after the MD5 of the original they were made
+    from, so an original (or any copy of it) is matched by content.
+    Built once at startup; run process_images.py and restart to pick
+    up new variants.
+    """
+
+    def __init__(self, static_folder: str, url_prefix: str = '/static/', fingerprints=None):
+        """
+        Initialize and build the manifest.
+
+        Args:
+            static_folder: Path to Flask static folder
+            url_prefix: URL prefix of the static folder
+            fingerprints: StaticFingerprints for hashed variant URLs (optional)
+        """
+        self.static_folder = static_folder
+        self.url_prefix = url_prefix
+        self.fingerprints = fingerprints
+        self._images: Dict[str, ResponsiveImage] = {}
+        self.build()
+
+    def _url(self, filename: str) -> str:
+        if self.fingerprints is not None:
+            filename = self.fingerprints.hashed_filename(filename)
+        return self.url_prefix + filename
+
+    def _content_hash(self, relative: str) -> str:
+        if self.fingerprints is not None and self.fingerprints.get_hash(relative):
+            return self.fingerprints.get_hash(relative)
+
+        digest = hashlib.md5()
+        with open(os.path.join(self.static_folder, relative), 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+        return digest.hexdigest()[:8]
+
+    def build(self) -> None:
+        """Match every original image to its variants and placeholder."""
+        images_folder = os.path.join(self.static_folder, 'images')
+        variants: Dict[str, Dict[str, Dict[int, str]]] = {}
+        placeholders: Dict[str, str] = {}
+
+        for folder, pattern in (('optimized', VARIANT_NAME_PATTERN),
+                                ('placeholders', PLACEHOLDER_NAME_PATTERN)):
+            path = os.path.join(images_folder, folder)
+            for name in sorted(os.listdir(path)) if os.path.isdir(path) else []:
+                match = pattern.match(name)
+                if match is None:
+                    continue
+                url = self._url(f'images/{folder}/{name}')
+                if folder == 'placeholders':
+                    placeholders[match.group(1)] = url
+                else:
+                    # Copies of one original share their variants; one URL per width
+                    width, content_hash, image_format = match.groups()
+                    variants.setdefault(content_hash, {}).setdefault(image_format, {}).setdefault(
+                        int(width), url)
+
+        images = {}
+        for root, dirs, files in os.walk(images_folder):
+            dirs[:] = [d for d in dirs if d not in GENERATED_FOLDERS]
+            for name in files:
+                if not name.lower().endswith(ORIGINAL_EXTENSIONS):
+                    continue
+
+                relative = os.path.relpath(os.path.join(root, name),
+                                           self.static_folder).replace(os.sep, '/')
+                try:
+                    content_hash = self._content_hash(relative)
+                    found = variants.get(content_hash)
+                    if not found:
+                        continue
+                    with Image.open(os.path.join(root, name)) as image:
+                        # Variants are flattened to RGB; keep transparent originals as they are
+                        if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+                            continue
+                        size = image.size
+                except (IOError, OSError, SyntaxError, ValueError):
+                    continue
+
+                images[relative] = ResponsiveImage(
+                    size,
+                    {image_format: sorted(urls.items()) for image_format, urls in found.items()},
+                    placeholders.get(content_hash)
+                )
+
+        self._images = images
+
+    def lookup(self, filename: str) -> Optional[ResponsiveImage]:
+        """
+        Get the variants of a static image.
+
+        Args:
+            filename: Path relative to the static folder (may be fingerprinted)
+
+        Returns:
+            ResponsiveImage or None if the image has no variants
+        """
+        image = self._images.get(filename)
+        if image is None:
+            match = HASHED_NAME_PATTERN.match(filename)
+            if match:
+                image = self._images.get(match.group('stem') + match.group('ext'))
+        return image
+
+    def placeholders(self) -> List[str]:
+        """LQIP URLs of every image with variants."""
+        return sorted({image.placeholder for image in self._images.values() if image.placeholder})
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+
+def picture_markup(tag: str, image: ResponsiveImage) -> str:
+    """
+    Build the <picture> replacing a plain <img>.
+
+    The <img> keeps its attributes (and any authored width/height) and
+    gets a JPEG src/srcset; modern formats come first as <source>s.
+    Lazy images get the placeholder as data-lqip.
+
+    Args:
+        tag: <img> start tag
+        image: Variants of its source image
+
+    Returns:
+        str: <picture> markup
+    """
+    attributes = _parse_attributes(tag)
+
+    width, height = attributes.get('width', ''), attributes.get('height', '')
+    add: List[Tuple[str, str]] = []
+    remove = ('src', 'srcset', 'sizes')
+
+    if not (width.isdigit() and height.isdigit()):
+        width, height = str(image.size[0]), str(image.size[1])
+        remove += ('width', 'height')
+        add += [('width', width), ('height', height)]
+
+    sizes = attributes.get('sizes') or f'(max-width: {width}px) 100vw, {width}px'
+    fallback = image.fallback(int(width))
+    if fallback is None:
+        return tag
+
+    add = [('src', fallback), ('srcset', image.srcset('jpg')), ('sizes', sizes)] + add
+    if (image.placeholder and attributes.get('loading', '').lower() == 'lazy'
+            and 'data-lqip' not in attributes):
+        add.append(('data-lqip', image.placeholder))
+
+    sources = ''.join(
+        f'<source type="{mimetype}" srcset="{escape(image.srcset(image_format))}" '
+        f'sizes="{escape(sizes)}">'
+        for image_format, mimetype in SOURCE_TYPES if image.variants.get(image_format)
+    )
+    return f'<picture>{sources}{_with_attributes(tag, remove, add)}</picture>'
+
+
+class PictureUpgrader:
+    """
+    Rewrite plain static <img> tags of rendered pages into <picture>s.
+
+    Rewrites are memoized by tag: a template renders the same <img>
+    markup on every request, so each is built once (least recently used
+    evicted first).
+    """
+
+    def __init__(self, images: ResponsiveImages, max_entries: int = 512):
+        """
+        Initialize upgrader.
+
+        Args:
+            images: Manifest of images with variants
+            max_entries: Maximum number of memoized tags
+        """
+        self.images = images
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _rewrite(self, tag: str) -> str:
+        with self._lock:
+            rewritten = self._entries.get(tag)
+            if rewritten is not None:
+                self._entries.move_to_end(tag)
+                return rewritten
+
+        rewritten = tag
+        attributes = _parse_attributes(tag)
+        path = urlsplit(attributes.get('src', '')).path
+        prefix = self.images.url_prefix + 'images/'
+
+        if path.startswith(prefix) and 'srcset' not in attributes:
+            image = self.images.lookup(posixpath.normpath(path[len(self.images.url_prefix):]))
+            if image is not None:
+                rewritten = picture_markup(tag, image)
+
+        with self._lock:
+            self._entries[tag] = rewritten
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return rewritten
+
+    def upgrade(self, html: str) -> str:
+        """
+        Upgrade a page's <img> tags.
+
+        Images already inside a <picture>, with a srcset, or inside
+        <noscript>/<template> are left alone.
+
+        Args:
+            html: Rendered page
+
+        Returns:
+            str: Page with upgraded images (html itself if none changed)
+        """
+        pieces: List[str] = []
+        position = 0
+        picture_depth = 0
+        hidden_depth = 0
+
+        for match in PICTURE_TAG_PATTERN.finditer(html):
+            container = (match.group(2) or '').lower()
+            if container:
+                step = -1 if match.group(1) else 1
+                if container == 'picture':
+                    picture_depth = max(picture_depth + step, 0)
+                else:
+                    hidden_depth = max(hidden_depth + step, 0)
+                continue
+
+            if picture_depth or hidden_depth:
+                continue
+
+            tag = match.group(0)
+            rewritten = self._rewrite(tag)
+            if rewritten != tag:
+                pieces.append(html[position:match.start()])
+                pieces.append(rewritten)
+                position = match.end()
+
+        if not pieces:
+            return html
+
+        pieces.append(html[position:])
+        return ''.join(pieces)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_picture_upgrader(app=None) -> Optional[PictureUpgrader]:
+    """
+    Get the picture upgrader attached to an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        PictureUpgrader or None if the upgrade is disabled
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('picture_upgrader')
+
+
+def init_picture_upgrade(app) -> Optional[PictureUpgrader]:
+    """
+    Build the image variant manifest and register the upgrade response filter.
+
+    Call after the LCP hints are configured: the upgrade then runs
+    first, and the hints preload the <picture>'s leading source.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        PictureUpgrader or None if PICTURE_UPGRADE_ENABLED is off
+    """
+    if not app.config.get('PICTURE_UPGRADE_ENABLED') or not app.has_static_folder:
+        return None
+
+    images = ResponsiveImages(app.static_folder, app.static_url_path.rstrip('/') + '/',
+                              get_fingerprints(app))
+    upgrader = PictureUpgrader(images, app.config.get('PICTURE_UPGRADE_CACHE_ENTRIES', 512))
+    app.extensions['picture_upgrader'] = upgrader
+
+    @app.after_request
+    def upgrade_response_images(response):
+        if (response.mimetype != 'text/html' or response.direct_passthrough
+                or response.is_streamed or response.content_encoding
+                or response.status_code in (204, 304) or request.method == 'HEAD'
+                or is_page_cache_hit()):
+            return response
+
+        html = response.get_data(as_text=True)
+        upgraded = upgrader.upgrade(html)
+        if upgraded is not html:
+            response.set_data(upgraded)
+        return response
+
+    return upgrader
@@ -0,0 +1,113 @@
+# /app/utils/precompress.py
+"""
+Build-time precompression for Adaptive Auto Hub website.
+Writes .gz and .br siblings next to text assets so servers can skip on-the-fly compression.
+"""
+
+import gzip
+import os
+from typing import Dict, List
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli ships with Flask-Compress
+    brotli = None
+
+
+# Extensions worth compressing; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = (
+    '.html', '.css', '.js', '.mjs', '.json', '.xml', '.txt', '.svg', '.map', '.webmanifest'
+)
+
+# Files smaller than this gain nothing from compression
+MIN_SIZE = 500
+
+# Sibling suffix -> HTTP content coding
+ENCODINGS = {
+    '.br': 'br',
+    '.gz': 'gzip'
+}
+
+
+def is_compressible(path: str) -> bool:
+    """Check whether a file type benefits from precompression."""
+    return path.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def compress_bytes(data: bytes) -> Dict[str, bytes]:
+    """
+    Compress data with every available encoding at maximum level.
+
+    Args:
+        data: Raw file contents
+
+    Returns:
+        dict: Sibling suffix ('.gz', '.br') to compressed bytes
+    """
+    # mtime=0 keeps gzip output reproducible between builds
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+
+    return variants
+
+
+def write_precompressed(path: str, min_size: int = MIN_SIZE) -> List[str]:
+    """
+    Write .gz/.br siblings for a file.
+
+    Siblings that would not be smaller than the original are skipped,
+    and stale siblings from a previous build are removed.
+
+    Args:
+        path: File to compress
+        min_size: Skip files smaller than this many bytes
+
+    Returns:
+        list: Paths of the sibling files written
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    written = []
+    variants = compress_bytes(data) if len(data) >= min_size else {}
+
+    for suffix in ENCODINGS:
+        sibling = path + suffix
+        compressed = variants.get(suffix)
+
+        if compressed is None or len(compressed) >= len(data):
+            if os.path.exists(sibling):
+                os.remove(sibling)
+            continue
+
+        with open(sibling, 'wb') as f:
+            f.write(compressed)
+        written.append(sibling)
+
+    return written
+
+
+def precompress_tree(root: str, min_size: int = MIN_SIZE) -> Dict[str, int]:
+    """
+    Write compressed siblings for every compressible file under a directory.
+
+    Args:
+        root: Directory to walk
+        min_size: Skip files smaller than this many bytes
+
+    Returns:
+        dict: Counts of files seen and siblings written
+    """
+    stats = {'files': 0, 'siblings': 0}
+
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            if not is_compressible(name):
+                continue
+
+            stats['files'] += 1
+            stats['siblings'] += len(write_precompressed(os.path.join(dirpath, name), min_size))
+
+    return stats
@@ -0,0 +1,244 @@
+# /app/utils/preload_headers.py
+"""
+Preload headers for Adaptive Auto Hub website.
+Sends each page's critical CSS, fonts, LCP image and scripts as Link headers and, where supported, 103 Early Hints.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from flask import request
+
+from .fragments import is_document
+from .lcp_hints import _parse_attributes
+from .partial_navigation import is_partial_navigation
+
+
+PAGE_RESOURCE_PATTERN = re.compile(r'<link\b[^>]*>|<script\b[^>]*\bsrc\s*=[^>]*>', re.I)
+
+# Link parameters in header order
+LINK_PARAMETERS = ('rel', 'as', 'type', 'crossorigin', 'fetchpriority',
+                   'imagesrcset', 'imagesizes')
+
+# WSGI environ key of a server-provided callable sending a 103 response,
+# called with a list of (header, value) pairs
+EARLY_HINTS_ENVIRON_KEY = 'wsgi.early_hints'
+
+
+def link_header(preloads: List[Dict[str, str]]) -> str:
+    """
+    Format preload directives as a Link header value.
+
+    Args:
+        preloads: Directives ({'href', 'rel', 'as', ...})
+
+    Returns:
+        str: '</static/gen/css_main.0dfe328e.css>; rel=preload; as=style, ...'
+    """
+    links = []
+    for preload in preloads:
+        link = f'<{preload["href"]}>'
+        for name in LINK_PARAMETERS:
+            value = preload.get(name)
+            if value is None:
+                continue
+            if value == '':
+                link += f'; {name}'
+            elif re.fullmatch(r'[\w/+.-]+', value):
+                link += f'; {name}={value}'
+            else:
+                link += '; {}="{}"'.format(name, value.replace('\\', '\\\\').replace('"', '\\"'))
+        links.append(link)
+    return ', '.join(links)
+
+
+def page_preloads(html: str, static_prefix: str = '/static/') -> List[Dict[str, str]]:
+    """
+    Find the preloads a rendered page asks for itself.
+
+    These are its <link rel=preload>s without a media condition (the
+    LCP image of lcp_hints.py, deferred stylesheets) and its static
+    scripts, in document order.
+
+    Args:
+        html: Rendered page
+        static_prefix: URL prefix of the static folder
+
+    Returns:
+        list: Preload directives
+    """
+    preloads = []
+
+    for match in PAGE_RESOURCE_PATTERN.finditer(html):
+        attributes = _parse_attributes(match.group(0))
+
+        if match.group(0)[1:].lower().startswith('script'):
+            src = attributes.get('src', '')
+            if src.startswith(static_prefix):
+                module = attributes.get('type', '').lower() == 'module'
+                preloads.append({'href': src, 'rel': 'modulepreload'} if module
+                                else {'href': src, 'rel': 'preload', 'as': 'script'})
+            continue
+
+        if attributes.get('rel', '').lower() != 'preload' or attributes.get('media'):
+            continue
+
+        href = attributes.get('href', '')
+        preload = {'href': href, 'rel': 'preload', 'as': attributes.get('as', '')}
+        for name in ('type', 'crossorigin', 'fetchpriority', 'imagesrcset', 'imagesizes'):
+            if name in attributes:
+                preload[name] = attributes[name]
+
+        if preload.get('imagesrcset') and not href:
+            # Responsive image preloads may have no href; a Link needs one
+            preload['href'] = preload['imagesrcset'].split(',')[0].split()[0]
+        if preload['href'].startswith(static_prefix) and preload['as']:
+            preloads.append(preload)
+
+    return preloads
+
+
+def merge_preloads(*groups: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Combine preload lists, keeping the first directive per URL.
+
+    Styles, fonts and the LCP image go before scripts, which the page
+    only runs after parsing (defer/module).
+
+    Args:
+        *groups: Preload lists, in priority order
+
+    Returns:
+        list: Merged directives
+    """
+    seen = set()
+    merged = []
+    for preload in (preload for group in groups for preload in group):
+        if preload['href'] not in seen:
+            seen.add(preload['href'])
+            merged.append(preload)
+
+    def is_script(preload: Dict[str, str]) -> bool:
+        return preload['rel'] == 'modulepreload' or preload.get('as') == 'script'
+
+    return sorted(merged, key=is_script)
+
+
+class PreloadHeaders:
+    """
+    Link header values per page path.
+
+    A path's value is computed from its first full render (the shared
+    preloads of the asset manifest plus the page's own) and replayed on
+    every later response, so Early Hints can go out before the view
+    runs. Least recently used paths are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries: Maximum number of paths remembered
+        """
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[str]:
+        """Link header value of a page (None until it has rendered once)."""
+        with self._lock:
+            value = self._entries.get(path)
+            if value is not None:
+                self._entries.move_to_end(path)
+            return value
+
+    def set(self, path: str, value: str) -> None:
+        """Remember the Link header value of a page."""
+        with self._lock:
+            self._entries[path] = value
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_preload_headers(app=None) -> Optional[PreloadHeaders]:
+    """
+    Get the preload header store attached to an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        PreloadHeaders or None if PRELOAD_HEADERS_ENABLED is off
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('preload_headers')
+
+
+def init_preload_headers(app) -> Optional[PreloadHeaders]:
+    """
+    Register the Link header response filter and the Early Hints hook.
+
+    Call after compression and before the page cache are configured:
+    the filter then sees the final uncompressed page, the page cache
+    stores its header, and the 103 goes out before a cached page is
+    looked up.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        PreloadHeaders or None if PRELOAD_HEADERS_ENABLED is off
+    """
+    if not app.config.get('PRELOAD_HEADERS_ENABLED'):
+        return None
+
+    from ..extensions import preload_critical_assets
+
+    store = PreloadHeaders(app.config.get('PRELOAD_HEADERS_CACHE_ENTRIES', 512))
+    app.extensions['preload_headers'] = store
+    static_prefix = app.static_url_path.rstrip('/') + '/'
+
+    if app.config.get('EARLY_HINTS_ENABLED'):
+        @app.before_request
+        def send_early_hints():
+            send = request.environ.get(EARLY_HINTS_ENVIRON_KEY)
+            if not callable(send) or request.method != 'GET' or is_partial_navigation():
+                return None
+
+            value = store.get(request.path)
+            if value:
+                send([('Link', value)])
+            return None
+
+    @app.after_request
+    def add_preload_headers(response):
+        # Page swaps reuse the assets the full page load preloaded
+        if (response.mimetype != 'text/html' or response.status_code != 200
+                or request.method not in ('GET', 'HEAD') or 'Link' in response.headers
+                or is_partial_navigation()):
+            return response
+
+        value = store.get(request.path)
+        if (value is None and request.method == 'GET' and not response.direct_passthrough
+                and not response.is_streamed and not response.content_encoding):
+            html = response.get_data(as_text=True)
+            # Fragments load into a page that already preloaded its assets
+            value = link_header(merge_preloads(
+                preload_critical_assets(app), page_preloads(html, static_prefix)
+            )) if is_document(html) else ''
+            store.set(request.path, value)
+
+        if value:
+            response.headers['Link'] = value
+        return response
+
+    return store
@@ -24,7 +24,8 @@ class SEOHelper:
         keywords: Optional[str] = None,
         image: Optional[str] = None,
         page_type: str = "website",
-        canonical_url: Optional[str] = None
+        canonical_url: Optional[str] = None,
+        card: str = "home"
     ) -> Dict[str, str]:
         """
         Generate comprehensive meta tags for a page.
@@ -36,15 +37,18 @@ class SEOHelper:
             image: Open Graph image URL
             page_type: Open Graph type (website, article, product)
             canonical_url: Canonical URL for the page
+            card: Open Graph card name used when no image is given
             
         Returns:
             Dictionary of meta tags
         """
+        from .og_cards import og_card_url
+        
         # Use defaults if not provided
         final_title = f"{title} | Adaptive Auto Hub" if title else SEOHelper.DEFAULT_TITLE
         final_description = description or SEOHelper.DEFAULT_DESCRIPTION
         final_keywords = keywords or SEOHelper.DEFAULT_KEYWORDS
-        final_image = image or SEOHelper.DEFAULT_IMAGE
+        final_image = image or og_card_url(card)
         
         # Ensure absolute URLs
         if final_image.startswith('/'):
@@ -0,0 +1,191 @@
+# /app/utils/service_worker.py
+"""
+Service worker for Adaptive Auto Hub website.
+Generates the worker with its precache list and build ID at build time and serves it at /sw.js.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+from markupsafe import Markup, escape
+
+from .bundler import OUTPUT_DIR, asset_urls, bundle_fonts
+from .fingerprint import HASHED_NAME_PATTERN, get_fingerprints
+from .http_cache import get_content_version
+from .picture_upgrade import ResponsiveImages
+from .precompress import ENCODINGS
+from .svg_sprite import get_icon_sprite
+
+
+# Worker source; the build prepends its configuration (self.SW_BUILD)
+SERVICE_WORKER_SOURCE = 'js/service-worker.js'
+SERVICE_WORKER_STEM = 'sw'
+SERVICE_WORKER_URL = '/sw.js'
+
+
+def precache_urls(app) -> List[str]:
+    """
+    Collect the content-hashed URLs every page needs.
+
+    These are the configured core bundles (with their media splits and
+    fonts), the icon sprite and the LQIP placeholders. URLs without a
+    content hash are left out, as the worker only serves hashed URLs
+    from its cache.
+
+    Args:
+        app: Flask application instance (with bundles loaded)
+
+    Returns:
+        list: Root-relative URLs
+    """
+    from flask import url_for
+
+    urls = []
+    with app.test_request_context():
+        for name in app.config.get('SERVICE_WORKER_PRECACHE_BUNDLES', []):
+            urls += asset_urls(name, app)
+            urls += [url_for('static', filename=font) for font in bundle_fonts(name, app)]
+
+        sprite = get_icon_sprite(app)
+        if sprite is not None and sprite.output:
+            urls.append(url_for('static', filename=sprite.output))
+
+        static_prefix = app.static_url_path.rstrip('/') + '/'
+        urls += ResponsiveImages(app.static_folder, static_prefix,
+                                 get_fingerprints(app)).placeholders()
+
+    hashed = []
+    for url in urls:
+        if HASHED_NAME_PATTERN.match(url.rsplit('/', 1)[-1]) and url not in hashed:
+            hashed.append(url)
+    return hashed
+
+
+def _is_worker(name: str) -> bool:
+    """Check whether a file name is a generated worker (sw.<build>.js)."""
+    return (name.startswith(SERVICE_WORKER_STEM + '.') and name.endswith('.js')
+            and HASHED_NAME_PATTERN.match(name) is not None)
+
+
+def _remove_workers(output_dir: str, keep: str) -> None:
+    """Delete workers of earlier builds and their precompressed siblings."""
+    for name in os.listdir(output_dir):
+        extension = os.path.splitext(name)[1]
+        worker = name[:-len(extension)] if extension in ENCODINGS else name
+        if _is_worker(worker) and worker != keep:
+            os.remove(os.path.join(output_dir, name))
+
+
+def build_service_worker(app) -> Dict:
+    """
+    Write the service worker for the current build.
+
+    The build ID is the content version pages are cached under, so a
+    deploy that changes any page starts a new cache generation and the
+    worker deletes the old ones. The worker is named by its build ID
+    (gen/sw.<build>.js), which keeps it out of the fingerprint digest
+    the content version is computed from.
+
+    Args:
+        app: Flask application instance (with bundles, sprite and critical CSS loaded)
+
+    Returns:
+        dict: 'output', 'build' and 'precache' (URL list)
+    """
+    build = get_content_version(app)['hash'][:8]
+    precache = precache_urls(app)
+
+    with open(os.path.join(app.static_folder, SERVICE_WORKER_SOURCE), 'r',
+              encoding='utf-8') as f:
+        source = f.read()
+
+    config = {
+        'build': build,
+        'precache': precache,
+        'staticPrefix': app.static_url_path.rstrip('/') + '/'
+    }
+    script = (f'// Generated by build.py from {SERVICE_WORKER_SOURCE}\n'
+              f'self.SW_BUILD = {json.dumps(config, indent=2)};\n\n{source}')
+
+    output_dir = os.path.join(app.static_folder, OUTPUT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    name = f'{SERVICE_WORKER_STEM}.{build}.js'
+    _remove_workers(output_dir, keep=name)
+    with open(os.path.join(output_dir, name), 'w', encoding='utf-8') as f:
+        f.write(script)
+
+    return {'output': f'{OUTPUT_DIR}/{name}', 'build': build, 'precache': precache}
+
+
+def find_service_worker(static_folder: str) -> Optional[str]:
+    """
+    Find the generated service worker.
+
+    Args:
+        static_folder: Path to Flask static folder
+
+    Returns:
+        str: Path of the newest gen/sw.<build>.js or None if not built
+    """
+    output_dir = os.path.join(static_folder, OUTPUT_DIR)
+    workers = [os.path.join(output_dir, name)
+               for name in (os.listdir(output_dir) if os.path.isdir(output_dir) else [])
+               if _is_worker(name)]
+    return max(workers, key=os.path.getmtime) if workers else None
+
+
+def get_service_worker(app=None) -> Optional[str]:
+    """
+    Get the service worker script served at /sw.js.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        str: Script text or None if disabled or not built
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('service_worker')
+
+
+def service_worker_tag() -> Markup:
+    """
+    Get the <meta> js/sw-register.js registers the worker from.
+
+    Without it the script unregisters any worker left from an earlier
+    deploy, so turning SERVICE_WORKER_ENABLED off takes effect.
+
+    Returns:
+        Markup: <meta name="service-worker"> or '' if not served
+    """
+    if get_service_worker() is None:
+        return Markup('')
+    return Markup(f'<meta name="service-worker" content="{escape(SERVICE_WORKER_URL)}">')
+
+
+def init_service_worker(app) -> Optional[str]:
+    """
+    Load the generated service worker and register the template helper.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        str: Script text or None if disabled or not built
+    """
+    app.jinja_env.globals['service_worker_tag'] = service_worker_tag
+
+    if not app.config.get('SERVICE_WORKER_ENABLED') or not app.has_static_folder:
+        return None
+
+    path = find_service_worker(app.static_folder)
+    if path is None:
+        return None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        script = f.read()
+    app.extensions['service_worker'] = script
+    return script
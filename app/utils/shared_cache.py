@@ -0,0 +1,295 @@
+# /app/utils/shared_cache.py
+"""
+Cross-process shared cache for Adaptive Auto Hub website.
+SQLite (WAL mode) key/value store shared by all Passenger/gunicorn workers on a host.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development machines
+    fcntl = None
+
+
+class SharedCache:
+    """
+    Size-bounded byte cache backed by a SQLite database in WAL mode.
+
+    Every worker process opens the same database file, so a value
+    stored by one worker is visible to all others. Writes are atomic
+    transactions; get_or_compute uses striped file locks so only one
+    process computes a missing value while the others wait for it.
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )""",
+        'CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)'
+    ]
+
+    # Reads refresh accessed_at at most this often (seconds) to avoid
+    # turning every hit into a write
+    ACCESS_RESOLUTION = 60
+
+    LOCK_STRIPES = 64
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024,
+                 default_ttl: int = 3600, timeout: float = 30.0):
+        """
+        Initialize shared cache.
+
+        Args:
+            path: SQLite database file path
+            max_bytes: Total value bytes kept before evicting LRU entries
+            default_ttl: Default entry lifetime in seconds
+            timeout: Seconds to wait for database and compute locks
+        """
+        self.path = os.path.abspath(path)
+        self.lock_dir = f'{self.path}.locks'
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.timeout = timeout
+
+        self._local = threading.local()
+        self._thread_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+        with self._transaction() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, reopening after a fork."""
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in an IMMEDIATE (write-locked) transaction."""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stored bytes, or None if missing or expired
+        """
+        now = time.time()
+        row = self._connection().execute(
+            'SELECT value, expires_at, accessed_at FROM entries WHERE key = ?',
+            (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        value, expires_at, accessed_at = row
+
+        if expires_at < now:
+            with self._transaction() as conn:
+                conn.execute(
+                    'DELETE FROM entries WHERE key = ? AND expires_at < ?',
+                    (key, now)
+                )
+            return None
+
+        if now - accessed_at > self.ACCESS_RESOLUTION:
+            with self._transaction() as conn:
+                conn.execute(
+                    'UPDATE entries SET accessed_at = ? WHERE key = ?',
+                    (now, key)
+                )
+
+        return bytes(value)
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        """
+        Atomically store a value and evict entries over the size bound.
+
+        Args:
+            key: Cache key
+            value: Bytes to store
+            ttl: Lifetime in seconds (default_ttl if None)
+        """
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+
+        with self._transaction() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                (key, sqlite3.Binary(value), len(value), now + ttl, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones over max_bytes."""
+        conn.execute('DELETE FROM entries WHERE expires_at < ?', (now,))
+
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = conn.execute(
+            'SELECT key, size FROM entries ORDER BY accessed_at ASC'
+        ).fetchall()
+
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        conn.executemany('DELETE FROM entries WHERE key = ?', evicted)
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes],
+                       ttl: Optional[int] = None) -> bytes:
+        """
+        Get a value, computing and storing it once across all workers.
+
+        Args:
+            key: Cache key
+            compute: Callable producing the value on a miss
+            ttl: Lifetime in seconds (default_ttl if None)
+
+        Returns:
+            Cached or freshly computed bytes
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self.lock(key):
+            # Another worker may have filled it while we waited
+            value = self.get(key)
+            if value is None:
+                value = compute()
+                self.set(key, value, ttl)
+
+        return value
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """
+        Hold the cross-process lock stripe for a key.
+
+        Uses flock where available; otherwise falls back to a
+        process-local lock.
+
+        Args:
+            key: Cache key
+        """
+        stripe = int(hashlib.md5(key.encode('utf-8')).hexdigest(), 16) % self.LOCK_STRIPES
+
+        with self._thread_locks[stripe]:
+            if fcntl is None:
+                yield
+                return
+
+            lock_path = os.path.join(self.lock_dir, f'{stripe:02d}.lock')
+            with open(lock_path, 'a+b') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry."""
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def clear(self, prefix: str = '') -> None:
+        """
+        Remove every entry, or only those whose key starts with prefix.
+
+        Args:
+            prefix: Key prefix to clear (all entries if empty)
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM entries WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix)
+            )
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get shared store size information.
+
+        Returns:
+            dict: Entry count, stored bytes and the byte limit
+        """
+        entries, total = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+        ).fetchone()
+
+        return {
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes
+        }
+
+
+def get_shared_cache(app=None) -> Optional[SharedCache]:
+    """
+    Get or create the application's shared cache.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        SharedCache, or None when SHARED_CACHE_PATH is not configured
+    """
+    if app is None:
+        from flask import current_app as app
+
+    cache = app.extensions.get('shared_cache')
+    if cache is None and app.config.get('SHARED_CACHE_PATH'):
+        cache = SharedCache(
+            app.config['SHARED_CACHE_PATH'],
+            max_bytes=app.config.get('SHARED_CACHE_MAX_BYTES', 64 * 1024 * 1024),
+            default_ttl=app.config.get('PAGE_CACHE_TTL', 3600)
+        )
+        app.extensions['shared_cache'] = cache
+
+    return cache
@@ -0,0 +1,286 @@
+# /app/utils/speculation_rules.py
+"""
+Speculation rules for Adaptive Auto Hub website.
+Ranks each page's internal links at build time and prefetches or prerenders the likeliest next pages.
+"""
+
+import base64
+import hashlib
+import html
+import json
+import os
+import posixpath
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+from flask import request
+from markupsafe import Markup
+
+from .bundler import OUTPUT_DIR
+from .fragments import is_document
+from .lcp_hints import _parse_attributes
+
+
+MANIFEST_NAME = 'link-graph.json'
+
+ANCHOR_PATTERN = re.compile(r'<a\b[^>]*>', re.I)
+
+# Link targets that are documents rather than pages
+PAGE_EXTENSIONS = ('', '.html')
+
+# Score of a link every page carries (see rank_links)
+CHROME_LINK_SCORE = 0.1
+
+
+def page_links(page_html: str, url: str, static_prefix: str = '/static/') -> Dict[str, int]:
+    """
+    Count a rendered page's links to other pages of the site.
+
+    Args:
+        page_html: Rendered page
+        url: URL the page was rendered at (links resolve against it)
+        static_prefix: URL prefix of the static folder
+
+    Returns:
+        dict: Target path to the number of links pointing at it
+    """
+    source = urlsplit(url)
+    counts: Dict[str, int] = {}
+
+    for match in ANCHOR_PATTERN.finditer(page_html):
+        attributes = _parse_attributes(match.group(0))
+        href = html.unescape(attributes.get('href', '')).strip()
+        if not href or href.startswith('#') or 'download' in attributes:
+            continue
+
+        target = urlsplit(urljoin(url, href))
+        if (target.scheme not in ('http', 'https') or target.netloc != source.netloc
+                or target.path == source.path or target.path.startswith(static_prefix)
+                or posixpath.splitext(target.path)[1].lower() not in PAGE_EXTENSIONS):
+            continue
+
+        counts[target.path] = counts.get(target.path, 0) + 1
+
+    return counts
+
+
+def rank_links(links: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, float]]:
+    """
+    Score each page's link targets.
+
+    Links every page has (header, navigation, footer) say little about
+    where a visitor goes next; the ones a page adds in its content - the
+    product cards of the product index, breadcrumbs - do. A target
+    scores one per link beyond the number every other page has, plus
+    CHROME_LINK_SCORE per link of that baseline.
+
+    Args:
+        links: Page path to its link counts (see page_links)
+
+    Returns:
+        dict: Page path to {target path: score}
+    """
+    ranked = {}
+    for page, counts in links.items():
+        scores = {}
+        for target, count in counts.items():
+            # A page never links itself: leave the target's own page out
+            baseline = min((other.get(target, 0) for path, other in links.items()
+                            if path not in (page, target)), default=0)
+            scores[target] = round(count - baseline + CHROME_LINK_SCORE * baseline, 3)
+        ranked[page] = scores
+    return ranked
+
+
+def _is_shareable(response) -> bool:
+    """Check whether a rendered page is the same for every visitor (page-cacheable)."""
+    cache_control = response.cache_control
+    return ('Set-Cookie' not in response.headers and not cache_control.private
+            and not cache_control.no_store and not cache_control.no_cache)
+
+
+def build_link_graph(app, base_url: str = 'https://localhost') -> Dict:
+    """
+    Render every page and write the ranked link graph.
+
+    Only pages every visitor gets the same copy of are kept as targets,
+    so speculative requests are served from the page cache and never
+    start a session.
+
+    Args:
+        app: Flask application instance
+        base_url: Site URL pages are rendered against
+
+    Returns:
+        dict: The manifest ({'links': {page: {target: score}}, 'pages': [...]})
+    """
+    from .freezer import collect_page_urls
+
+    urls, _ = collect_page_urls(app, base_url)
+    client = app.test_client()
+    static_prefix = app.static_url_path.rstrip('/') + '/'
+
+    links: Dict[str, Dict[str, int]] = {}
+    shareable = []
+
+    for url in urls:
+        response = client.get(url, base_url=base_url, headers={'Accept-Encoding': 'identity'})
+        if response.status_code != 200 or response.mimetype != 'text/html':
+            continue
+
+        page_html = response.get_data(as_text=True)
+        if not is_document(page_html):
+            continue
+
+        path = urlsplit(url).path
+        links[path] = page_links(page_html, base_url.rstrip('/') + url, static_prefix)
+        if _is_shareable(response):
+            shareable.append(path)
+
+    manifest = {'links': rank_links(links), 'pages': sorted(shareable)}
+
+    output_dir = os.path.join(app.static_folder, OUTPUT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
+
+
+class SpeculationRules:
+    """
+    Speculation rules per page path.
+
+    Each page prefetches its highest-ranked targets as soon as it loads
+    and prerenders the first few when the pointer rests on a link to
+    them. Rules are computed once at startup; their script text is
+    fixed, so the CSP allows every one by hash.
+    """
+
+    def __init__(self, manifest: Dict, max_urls: int = 3, prerender: int = 1,
+                 weights: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Compute the rules of every page in the link graph.
+
+        Args:
+            manifest: Link graph manifest (see build_link_graph)
+            max_urls: Targets prefetched per page
+            prerender: Of those, how many are prerendered on hover
+            weights: Extra scores, {page path or '*': {target path: score}}
+        """
+        weights = weights or {}
+        shareable = set(manifest.get('pages', []))
+        self.rules: Dict[str, str] = {}
+
+        for page, scores in manifest.get('links', {}).items():
+            scores = dict(scores)
+            for extra in (weights.get('*', {}), weights.get(page, {})):
+                for target, score in extra.items():
+                    scores[target] = scores.get(target, 0) + score
+
+            ranked = sorted((target for target, score in scores.items()
+                             if target != page and target in shareable and score > 0),
+                            key=lambda target: (-scores[target], target))[:max_urls]
+            if ranked:
+                self.rules[page] = self.script(ranked, prerender)
+
+    @staticmethod
+    def script(urls: List[str], prerender: int = 0) -> str:
+        """
+        Build the speculationrules JSON for ranked URLs.
+
+        Args:
+            urls: Target URLs, likeliest first
+            prerender: How many of the first URLs are prerendered on hover
+
+        Returns:
+            str: JSON safe inside <script>
+        """
+        rules = {'prefetch': [{'source': 'list', 'urls': urls, 'eagerness': 'immediate'}]}
+        if prerender > 0:
+            rules['prerender'] = [{'source': 'list', 'urls': urls[:prerender],
+                                   'eagerness': 'moderate'}]
+        return json.dumps(rules, separators=(',', ':'), sort_keys=True).replace('</', '<\\/')
+
+    def lookup(self, path: str) -> str:
+        """Rules of a page ('' if it has none)."""
+        return self.rules.get(path, '')
+
+    def csp_sources(self) -> List[str]:
+        """CSP script-src hash sources allowing every page's rules inline."""
+        sources = set()
+        for text in self.rules.values():
+            digest = base64.b64encode(hashlib.sha256(text.encode('utf-8')).digest())
+            sources.add(f"'sha256-{digest.decode('ascii')}'")
+        return sorted(sources)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+def get_speculation_rules(app=None) -> Optional[SpeculationRules]:
+    """
+    Get the speculation rules attached to an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        SpeculationRules or None if disabled or not built
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('speculation_rules')
+
+
+def speculation_rules() -> Markup:
+    """
+    Get the current page's <script type="speculationrules">.
+
+    Browsers without speculation rules get <link rel=prefetch> for the
+    same URLs from js/speculation-fallback.js.
+
+    Returns:
+        Markup: The script or '' if the page has no rules
+    """
+    store = get_speculation_rules()
+    rules = store.lookup(request.path) if store is not None else ''
+    if not rules:
+        return Markup('')
+    return Markup(f'<script type="speculationrules">{rules}</script>')
+
+
+def init_speculation_rules(app) -> Optional[SpeculationRules]:
+    """
+    Load the link graph and register the speculation_rules() template helper.
+
+    Call before security is configured, so the CSP allows the rules.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        SpeculationRules or None if disabled or not built
+    """
+    app.jinja_env.globals['speculation_rules'] = speculation_rules
+
+    if not app.config.get('SPECULATION_RULES_ENABLED') or not app.has_static_folder:
+        return None
+
+    try:
+        with open(os.path.join(app.static_folder, OUTPUT_DIR, MANIFEST_NAME), 'r',
+                  encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+    store = SpeculationRules(
+        manifest,
+        max_urls=app.config.get('SPECULATION_RULES_MAX_URLS', 3),
+        prerender=app.config.get('SPECULATION_RULES_PRERENDER', 1),
+        weights=app.config.get('SPECULATION_RULES_WEIGHTS')
+    )
+    app.extensions['speculation_rules'] = store
+    return store
@@ -0,0 +1,119 @@
+# /app/utils/static_files.py
+"""
+Static file serving for Adaptive Auto Hub website.
+Serves build-time .br/.gz siblings and fingerprinted URLs with immutable caching.
+"""
+
+import mimetypes
+import os
+from typing import Optional, Tuple
+
+from flask import abort, request, send_file
+from werkzeug.security import safe_join
+
+from .fingerprint import FINGERPRINT_MAX_AGE, StaticFingerprints, get_fingerprints
+from .precompress import ENCODINGS, is_compressible
+
+
+def choose_precompressed(path: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Pick the best precompressed sibling the client accepts.
+
+    Siblings older than the original file (left over from a previous
+    build) are ignored.
+
+    Args:
+        path: Absolute path of the original file
+
+    Returns:
+        tuple: (content coding, sibling path), or (None, None)
+    """
+    mtime = os.path.getmtime(path)
+
+    for suffix, encoding in ENCODINGS.items():
+        if not request.accept_encodings[encoding]:
+            continue
+
+        sibling = path + suffix
+        if os.path.isfile(sibling) and os.path.getmtime(sibling) >= mtime:
+            return encoding, sibling
+
+    return None, None
+
+
+def send_static_file(filename: str, app=None):
+    """
+    Serve a file from the static folder, preferring precompressed siblings.
+
+    Fingerprinted names ('css/style.3f2a9c1b.css') are mapped back to the
+    file on disk and cached as immutable for a year.
+
+    Args:
+        filename: Path relative to the static folder
+        app: Flask application instance (optional)
+
+    Returns:
+        Response
+    """
+    if app is None:
+        from flask import current_app as app
+
+    immutable = False
+    path = safe_join(app.static_folder, filename)
+
+    fingerprints = get_fingerprints(app)
+    if fingerprints is not None and path is not None:
+        if os.path.isfile(path):
+            immutable = fingerprints.is_prehashed(filename)
+        else:
+            filename, immutable = fingerprints.resolve(filename)
+            path = safe_join(app.static_folder, filename)
+
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    max_age = FINGERPRINT_MAX_AGE if immutable else app.get_send_file_max_age(filename)
+
+    if not is_compressible(filename):
+        response = send_file(path, max_age=max_age)
+    else:
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        encoding, sibling = choose_precompressed(path)
+
+        # Content-Length and the ETag come from the file actually sent
+        response = send_file(sibling or path, mimetype=mimetype, max_age=max_age)
+
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+
+    if immutable:
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+
+    return response
+
+
+def init_static_files(app) -> None:
+    """
+    Replace Flask's static view with the precompression-aware one.
+
+    With STATIC_FINGERPRINT_ENABLED, url_for('static', ...) also emits
+    content-hashed filenames.
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.has_static_folder:
+        return
+
+    app.view_functions['static'] = lambda filename: send_static_file(filename, app)
+
+    if app.config.get('STATIC_FINGERPRINT_ENABLED'):
+        fingerprints = StaticFingerprints(app.static_folder)
+        app.extensions['static_fingerprints'] = fingerprints
+
+        @app.url_defaults
+        def fingerprint_static_url(endpoint, values):
+            if endpoint == 'static' and 'filename' in values:
+                values['filename'] = fingerprints.hashed_filename(values['filename'])
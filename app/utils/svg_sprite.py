@@ -0,0 +1,268 @@
+# /app/utils/svg_sprite.py
+"""
+SVG icon sprite for Adaptive Auto Hub website.
+Collects static/icons/*.svg into one fingerprinted <symbol> sprite referenced by the icon() template helper.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from markupsafe import Markup, escape
+
+from .bundler import OUTPUT_DIR
+from .lcp_hints import SVG_ROOT_PATTERN, _parse_attributes
+
+
+ICON_FOLDER = 'icons'
+SPRITE_MANIFEST_NAME = 'icon-sprite.json'
+SPRITE_STEM = 'icons'
+
+# Root attributes carried over to each <symbol> (case as SVG spells them)
+SYMBOL_ATTRIBUTES = (
+    'viewBox', 'fill', 'stroke', 'stroke-width', 'stroke-linecap', 'stroke-linejoin'
+)
+
+SVG_NOISE_PATTERN = re.compile(r'<\?xml.*?\?>|<!DOCTYPE[^>]*>|<!--.*?-->|<title>.*?</title>',
+                               re.S | re.I)
+TAG_SPACE_PATTERN = re.compile(r'>\s+<')
+
+
+def optimize_icon(source: str) -> Optional[Tuple[Dict[str, str], str]]:
+    """
+    Reduce an icon file to its symbol attributes and body.
+
+    Args:
+        source: SVG file contents
+
+    Returns:
+        tuple: (symbol attributes, body markup) or None if not an SVG
+    """
+    source = SVG_NOISE_PATTERN.sub('', source)
+    root = SVG_ROOT_PATTERN.search(source)
+    end = source.rfind('</svg>')
+    if root is None or end < root.end():
+        return None
+
+    attributes = _parse_attributes(root.group(0))
+    kept = {name: attributes[name.lower()] for name in SYMBOL_ATTRIBUTES
+            if attributes.get(name.lower())}
+
+    body = TAG_SPACE_PATTERN.sub('><', source[root.end():end].strip())
+    return kept, ' '.join(body.split())
+
+
+class IconSprite:
+    """
+    Icon set read from the static icons folder.
+
+    Every icons/<name>.svg becomes <symbol id="<name>"> of one sprite,
+    written under a content hash and cached as immutable like the
+    bundles; pages then reference icons with <use href> instead of
+    repeating their markup. Until the sprite is built for the current
+    icons, icon() falls back to inline SVG.
+    """
+
+    def __init__(self, static_folder: str):
+        """
+        Initialize and read the icon set.
+
+        Args:
+            static_folder: Path to Flask static folder
+        """
+        self.static_folder = static_folder
+        self.icons: Dict[str, Tuple[Dict[str, str], str]] = {}
+        self.output: Optional[str] = None
+        self.manifest_path = os.path.join(static_folder, OUTPUT_DIR, SPRITE_MANIFEST_NAME)
+        self.load()
+
+    def load(self) -> None:
+        """Read every icon and pick up the sprite if it is current."""
+        folder = os.path.join(self.static_folder, ICON_FOLDER)
+        icons = {}
+
+        for name in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+            if not name.endswith('.svg'):
+                continue
+            try:
+                with open(os.path.join(folder, name), 'r', encoding='utf-8') as f:
+                    icon = optimize_icon(f.read())
+            except (IOError, OSError, UnicodeDecodeError):
+                continue
+            if icon is not None:
+                icons[name[:-len('.svg')]] = icon
+
+        self.icons = icons
+
+        manifest = self.load_manifest()
+        output = manifest.get('output')
+        current = (manifest.get('digest') == self.digest() and output
+                   and os.path.exists(os.path.join(self.static_folder, output)))
+        self.output = output if current else None
+
+    def load_manifest(self) -> Dict:
+        """Load the manifest written by the last build (empty if none)."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _symbol_attributes(self, name: str) -> str:
+        return ''.join(f' {attribute}="{escape(value)}"'
+                       for attribute, value in self.icons[name][0].items())
+
+    def markup(self) -> str:
+        """The sprite document."""
+        symbols = ''.join(f'<symbol id="{name}"{self._symbol_attributes(name)}>{body}</symbol>'
+                          for name, (_, body) in self.icons.items())
+        return f'<svg xmlns="http://www.w3.org/2000/svg">{symbols}</svg>'
+
+    def digest(self) -> str:
+        """Content hash of the sprite."""
+        return hashlib.md5(self.markup().encode('utf-8')).hexdigest()
+
+    def build(self) -> str:
+        """
+        Write the sprite and its manifest.
+
+        Returns:
+            str: 'built' or 'unchanged'
+        """
+        if self.output is not None:
+            return 'unchanged'
+
+        digest = self.digest()
+        output = f'{OUTPUT_DIR}/{SPRITE_STEM}.{digest[:8]}.svg'
+        output_dir = os.path.join(self.static_folder, OUTPUT_DIR)
+        os.makedirs(output_dir, exist_ok=True)
+
+        # The previous sprite (and its precompressed siblings) goes
+        previous = self.load_manifest().get('output')
+        if previous and previous != output:
+            for suffix in ('', '.br', '.gz'):
+                path = os.path.join(self.static_folder, previous + suffix)
+                if os.path.exists(path):
+                    os.remove(path)
+
+        with open(os.path.join(self.static_folder, output), 'w', encoding='utf-8') as f:
+            f.write(self.markup())
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'output': output, 'digest': digest, 'icons': list(self.icons)},
+                      f, indent=2, sort_keys=True)
+
+        self.output = output
+        return 'built'
+
+    def render(self, name: str, size: int = 24, class_: str = '', label: Optional[str] = None,
+               **attributes) -> Markup:
+        """
+        Render an icon.
+
+        Args:
+            name: Icon name (file name in static/icons without .svg)
+            size: Width and height in CSS pixels
+            class_: Extra classes
+            label: Accessible name (icons are decorative without one)
+            **attributes: Extra attributes of the <svg> (style, ...)
+
+        Returns:
+            Markup: <svg> with a <use href> into the sprite, or inline
+                    symbol content when the sprite is not built
+        """
+        classes = f'icon icon--{name} {class_}'.strip()
+        rendered: List[Tuple[str, str]] = [('class', classes), ('width', str(size)),
+                                           ('height', str(size))]
+        if label:
+            rendered += [('role', 'img'), ('aria-label', label)]
+        else:
+            rendered += [('aria-hidden', 'true'), ('focusable', 'false')]
+        rendered += [(key.rstrip('_').replace('_', '-'), str(value))
+                     for key, value in attributes.items()]
+
+        svg_attributes = ''.join(f' {key}="{escape(value)}"' for key, value in rendered)
+
+        if name not in self.icons:
+            return Markup(f'<svg{svg_attributes}></svg>')
+
+        if self.output is None:
+            return Markup(f'<svg{svg_attributes}{self._symbol_attributes(name)}>'
+                          f'{self.icons[name][1]}</svg>')
+
+        from flask import url_for
+        href = f"{url_for('static', filename=self.output)}#{name}"
+        return Markup(f'<svg{svg_attributes}><use href="{escape(href)}"></use></svg>')
+
+    def __len__(self) -> int:
+        return len(self.icons)
+
+
+def get_icon_sprite(app=None) -> Optional[IconSprite]:
+    """
+    Get the icon sprite attached to an application.
+
+    Args:
+        app: Flask application instance (optional)
+
+    Returns:
+        IconSprite or None if the application has no static folder
+    """
+    if app is None:
+        from flask import current_app as app
+
+    return app.extensions.get('icon_sprite')
+
+
+def build_icon_sprite(app) -> str:
+    """
+    Build the application's icon sprite if the icons changed.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        str: 'built' or 'unchanged'
+    """
+    return IconSprite(app.static_folder).build()
+
+
+def icon(name: str, size: int = 24, class_: str = '', label: Optional[str] = None,
+         **attributes) -> Markup:
+    """Template helper: {{ icon('shield', 16, class_='feature__icon') }} (see IconSprite.render)."""
+    sprite = get_icon_sprite()
+    if sprite is None:
+        return Markup('')
+    return sprite.render(name, size, class_, label, **attributes)
+
+
+def init_icon_sprite(app) -> Optional[IconSprite]:
+    """
+    Read the icon set and register the icon() template helper.
+
+    With ICON_SPRITE_ENABLED off icons always render inline; with
+    ASSETS_AUTO_BUILD a stale sprite is rebuilt at startup. Call before
+    the static files are configured, so the sprite gets its cache headers.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        IconSprite or None if the application has no static folder
+    """
+    app.jinja_env.globals['icon'] = icon
+    if not app.has_static_folder:
+        return None
+
+    sprite = IconSprite(app.static_folder)
+    if not app.config.get('ICON_SPRITE_ENABLED'):
+        sprite.output = None
+    elif app.config.get('ASSETS_AUTO_BUILD') and sprite.output is None and sprite.icons:
+        try:
+            sprite.build()
+        except OSError as e:
+            app.logger.error(f'Icon sprite build failed: {e}')
+
+    app.extensions['icon_sprite'] = sprite
+    return sprite
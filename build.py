@@ -4,6 +4,7 @@ Build script for production deployment of Adaptive Auto Hub
 Handles asset optimization, image processing, and bundle generation
 """
 
+import json
 import os
 import sys
 from pathlib import Path
@@ -14,6 +15,18 @@ sys.path.insert(0, str(project_root))
 
 from app import create_app
 from app.utils.image_optimizer import ImageOptimizer
+from app.utils.og_cards import render_all_cards
+from app.utils.precompress import precompress_tree
+from app.utils.bundler import (
+    MANIFEST_NAME, OUTPUT_DIR, PRUNE_REPORT_NAME, BundleError, build_bundles
+)
+from app.utils.asset_graph import build_asset_graph, unreferenced_images
+from app.utils.asset_inliner import build_inline_assets
+from app.utils.critical_css import build_critical_css
+from app.utils.js_splitter import SHARED_BUNDLE, get_js_split
+from app.utils.service_worker import build_service_worker
+from app.utils.speculation_rules import build_link_graph
+from app.utils.svg_sprite import build_icon_sprite
 
 def build_assets():
     """Build and optimize all assets for production"""
@@ -25,17 +38,43 @@ def build_assets():
     with app.app_context():
         # 1. Build CSS/JS bundles
         print("\n📦 Building asset bundles...")
-        assets = app.extensions.get('assets')
-        if assets:
-            try:
-                assets.build()
-                print("✅ Asset bundles created successfully")
-            except Exception as e:
-                print(f"❌ Error building assets: {e}")
+        try:
+            results = build_bundles(app)
+            for name, status in results.items():
+                print(f"  {'✅' if status == 'built' else '⏭️ '} {name}: {status}")
+            print("✅ Asset bundles ready")
+            print_prune_report(os.path.join(app.static_folder, OUTPUT_DIR, PRUNE_REPORT_NAME))
+            print_media_split(os.path.join(app.static_folder, OUTPUT_DIR, MANIFEST_NAME))
+            print_js_split(get_js_split(app))
+        except BundleError as e:
+            print(f"❌ Error building assets: {e}")
         
-        # 2. Optimize images
-        print("\n🖼️  Optimizing images...")
+        # 2. Collect the icon set into one sprite
+        print("\n🔣 Building icon sprite...")
+        try:
+            status = build_icon_sprite(app)
+            print(f"  {'✅' if status == 'built' else '⏭️ '} icons: {status}")
+        except OSError as e:
+            print(f"❌ Error building icon sprite: {e}")
+        
+        # 3. Map asset references (dead originals are skipped from here on)
+        print("\n🕸️  Mapping asset references...")
         static_folder = app.static_folder or os.path.join(project_root, 'app', 'static')
+        try:
+            # A fresh app loads the bundles built in step 1
+            print_asset_graph(build_asset_graph(create_app('production')))
+        except Exception as e:
+            print(f"❌ Error mapping asset references: {e}")
+        
+        # 4. Rank page links for speculation rules (prefetch of likely next pages)
+        print("\n🔗 Mapping page links...")
+        try:
+            print_link_graph(build_link_graph(app))
+        except Exception as e:
+            print(f"❌ Error mapping page links: {e}")
+        
+        # 5. Optimize images
+        print("\n🖼️  Optimizing images...")
         
         try:
             optimizer = ImageOptimizer(static_folder=static_folder)
@@ -45,6 +84,7 @@ def build_assets():
             image_extensions = ('.jpg', '.jpeg', '.png', '.webp')
             image_count = 0
             optimized_count = 0
+            unreferenced = unreferenced_images(static_folder)
             
             for root, dirs, files in os.walk(images_dir):
                 # Skip already optimized directories
@@ -56,6 +96,9 @@ def build_assets():
                         filepath = os.path.join(root, file)
                         relative_path = os.path.relpath(filepath, images_dir)
                         
+                        if 'images/' + relative_path.replace(os.sep, '/') in unreferenced:
+                            continue
+                        
                         print(f"  Processing: {relative_path}")
                         image_count += 1
                         
@@ -75,15 +118,59 @@ def build_assets():
         except Exception as e:
             print(f"❌ Error initializing image optimizer: {e}")
         
-        # 3. Generate critical CSS (if needed)
-        print("\n🎨 Checking critical CSS...")
-        critical_css_path = os.path.join(static_folder, 'css', 'critical.css')
-        if os.path.exists(critical_css_path):
-            print("✅ Critical CSS found")
-        else:
-            print("⚠️  No critical CSS found - consider creating one for better performance")
+        # 6. Inline small images (selected from the graph and optimized bytes)
+        print("\n🧩 Selecting small assets to inline...")
+        try:
+            inlined = build_inline_assets(app)
+            print_inline_assets(inlined)
+            # CSS bundles referencing a newly selected image rebuild
+            rebuilt = [name for name, status in build_bundles(app).items() if status == 'built']
+            if rebuilt:
+                print(f"  ✅ Rebuilt {', '.join(rebuilt)}")
+        except Exception as e:
+            print(f"❌ Error selecting inline assets: {e}")
         
-        # 4. Create production-ready structure
+        # 7. Pre-render Open Graph cards
+        print("\n🪪 Rendering Open Graph cards...")
+        try:
+            quality = app.config.get('OG_CARD_QUALITY', 85)
+            cards = render_all_cards(static_folder, quality=quality)
+            print(f"✅ {len(cards)} Open Graph cards ready")
+        except Exception as e:
+            print(f"❌ Error rendering Open Graph cards: {e}")
+        
+        # 8. Extract per-route critical CSS from the built bundles
+        print("\n🎨 Extracting critical CSS...")
+        try:
+            # A fresh app loads the bundles built in steps 1 and 6
+            sizes = build_critical_css(create_app('production'))
+            if sizes:
+                print(f"✅ Critical CSS for {len(sizes)} pages "
+                      f"({min(sizes.values())}-{max(sizes.values())} bytes each)")
+            else:
+                print("⚠️  No pages rendered - critical CSS not generated")
+        except Exception as e:
+            print(f"❌ Error extracting critical CSS: {e}")
+        
+        # 9. Generate the service worker (precaches the final bundles, sprite and LQIPs)
+        print("\n👷 Generating service worker...")
+        try:
+            # A fresh app loads the critical CSS of step 8 into its build ID
+            worker = build_service_worker(create_app('production'))
+            print(f"✅ {worker['output']}: build {worker['build']}, "
+                  f"{len(worker['precache'])} precached URLs")
+        except Exception as e:
+            print(f"❌ Error generating service worker: {e}")
+        
+        # 10. Precompress static assets (served by the static view, not Flask-Compress)
+        print("\n🗜️  Precompressing static assets...")
+        try:
+            stats = precompress_tree(static_folder)
+            print(f"✅ Wrote {stats['siblings']} .br/.gz files for {stats['files']} assets")
+        except Exception as e:
+            print(f"❌ Error precompressing assets: {e}")
+        
+        # 11. Create production-ready structure
         print("\n📁 Verifying production structure...")
         required_dirs = [
             os.path.join(static_folder, 'gen'),  # For generated assets
@@ -102,6 +189,71 @@ def build_assets():
         print("  2. Check .env file for production settings")
         print("  3. Deploy to server")
 
+def print_prune_report(report_path):
+    """Print bytes removed per stylesheet by unused-CSS pruning"""
+    if not os.path.exists(report_path):
+        return
+
+    with open(report_path, 'r') as f:
+        report = json.load(f)
+
+    for source, entry in sorted(report.items()):
+        print(f"  ✂️  {source}: {entry['original_bytes']} → {entry['pruned_bytes']} bytes "
+              f"(-{entry['removed_bytes']})")
+
+def print_media_split(manifest_path):
+    """Print the stylesheets each media-split bundle was partitioned into"""
+    if not os.path.exists(manifest_path):
+        return
+
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    for name, entry in sorted(manifest.items()):
+        for split in entry.get('media', []):
+            print(f"  📱 {name} @media {split['media']}: {split['bytes']} bytes "
+                  f"(base {entry['bytes']})")
+
+def print_asset_graph(report):
+    """Print broken references and the static files nothing references"""
+    print(f"✅ {len(report['references'])} referenced assets")
+    for path, referrers in report['broken'].items():
+        more = f" (+{len(referrers) - 2} more)" if len(referrers) > 2 else ""
+        print(f"  ❌ Missing {path} <- {', '.join(referrers[:2])}{more}")
+    if report['unreferenced']:
+        print(f"  🪦 {len(report['unreferenced'])} unreferenced files "
+              f"({report['unreferenced_bytes'] // 1024} KB); their images are skipped "
+              f"by image processing and the static export")
+    if report['unreferenced_templates']:
+        print(f"  🪦 Templates no view renders: {', '.join(report['unreferenced_templates'])}")
+
+def print_link_graph(manifest):
+    """Print each page's likeliest next pages"""
+    print(f"✅ {len(manifest['links'])} pages linked, "
+          f"{len(manifest['pages'])} cacheable as speculation targets")
+    for page, scores in sorted(manifest['links'].items()):
+        ranked = sorted(scores, key=lambda target: -scores[target])[:3]
+        if ranked:
+            print(f"  🔗 {page} -> {', '.join(ranked)}")
+
+def print_inline_assets(inlined):
+    """Print the images served as data URIs and where"""
+    print(f"✅ {len(inlined)} assets inlined "
+          f"({sum(entry['bytes'] for entry in inlined.values())} bytes)")
+    for path, entry in sorted(inlined.items()):
+        where = ' and '.join(name for name in ('html', 'css') if entry[name])
+        print(f"  🧩 {path}: {entry['bytes']} bytes ({where})")
+
+def print_js_split(split):
+    """Print which page templates load each per-page JS bundle"""
+    if split is None:
+        return
+
+    for name, bundle in split.bundles.items():
+        templates = [template for template, names in split.templates.items() if name in names]
+        scope = 'every page' if name == SHARED_BUNDLE else ', '.join(templates)
+        print(f"  🧩 {name} ({len(bundle['inputs'])} files): {scope}")
+
 def generate_alt_text(filename):
     """Generate appropriate alt text based on filename"""
     # Remove extension and replace separators with spaces
@@ -130,9 +282,7 @@ def check_dependencies():
     
     required_packages = {
         'flask': 'Flask',
-        'flask_assets': 'Flask-Assets',
         'PIL': 'Pillow',
-        'cssmin': 'cssmin',
         'jsmin': 'jsmin'
     }
     
@@ -28,9 +28,7 @@ class BaseConfig:
     
     # Asset pipeline settings
     ASSETS_DEBUG = False
-    ASSETS_AUTO_BUILD = True
-    ASSETS_CACHE = True
-    ASSETS_MANIFEST = 'cache'
+    ASSETS_AUTO_BUILD = True  # rebuild stale bundles at startup
 
     ANALYTICS_ID = os.environ.get('ANALYTICS_ID', 'dev-tracking')
     ANALYTICS_ENABLED = os.environ.get('ANALYTICS_ENABLED', 'false').lower() == 'true'
@@ -49,6 +47,116 @@ class BaseConfig:
     ]
     COMPRESS_LEVEL = 6
     COMPRESS_MIN_SIZE = 500
+    COMPRESS_REGISTER = False  # registered in create_app, skipping static files
+    
+    # Full-page response cache (GET routes, final compressed bytes)
+    PAGE_CACHE_ENABLED = False
+    PAGE_CACHE_TTL = 3600  # seconds
+    PAGE_CACHE_MAX_ENTRIES = 512
+    PAGE_CACHE_EXEMPT_ENDPOINTS = ['main.health', 'static']
+    PAGE_CACHE_BACKEND = 'memory'  # 'memory' (per worker) or 'shared' (SQLite)
+    
+    # HTTP caching headers (Cache-Control, ETag, Last-Modified)
+    HTTP_CACHE_ENABLED = True
+    HTTP_CACHE_MAX_AGE = 300  # seconds
+    HTTP_CACHE_STALE_WHILE_REVALIDATE = 86400
+    
+    # Superseded bundle builds kept in static/gen: pages cached before a
+    # deploy (stale-while-revalidate, service worker) still link them
+    BUNDLE_KEEP_GENERATIONS = 2
+    
+    # Unused-CSS pruning for bundles with 'prune': True (build time)
+    CSS_PRUNE_ENABLED = True
+    # fnmatch patterns for classes/ids added by code the scanner cannot see
+    CSS_PRUNE_SAFELIST = ['is-*', 'has-*', 'js-*', '*--active', '*--open', 'active', 'open', 'show']
+    
+    # Bundles with 'split_media': True link each @media condition's rules
+    # as a separate stylesheet; smaller conditions stay in the base file
+    CSS_MEDIA_SPLIT_MIN_BYTES = 128
+    
+    # CSS background images with optimized variants become image-set()
+    # (AVIF/WebP/JPEG), with narrower variants under @media (max-width)
+    CSS_IMAGE_SET_ENABLED = True
+    
+    # static/icons/*.svg served as one <symbol> sprite; icon() emits <use href>
+    # (inline SVG when off or before the sprite is built)
+    ICON_SPRITE_ENABLED = True
+    
+    # Per-route above-the-fold CSS inlined from memory (built by build.py)
+    CRITICAL_CSS_ENABLED = True
+    
+    # Shared + per-page JS bundles planned from the templates (config.JS_FEATURES)
+    JS_SPLIT_ENABLED = True
+    
+    # HTML minification: template source once at compile time, plus an
+    # optional filter over rendered pages (memoized by body hash)
+    HTML_MINIFY_TEMPLATES = True
+    HTML_MINIFY_RESPONSES = False
+    HTML_MINIFY_CACHE_ENTRIES = 256
+    
+    # Intrinsic <img> dimensions plus fetchpriority/preload for the hero image
+    LCP_HINTS_ENABLED = True
+    LCP_HINT_MIN_AREA = 40000  # rendered CSS px (width x height) of a hero image
+    
+    # Plain static <img> tags rewritten to <picture> over process_images.py variants
+    PICTURE_UPGRADE_ENABLED = True
+    PICTURE_UPGRADE_CACHE_ENTRIES = 512
+    
+    # Images under INLINE_ASSET_MAX_BYTES become data URIs (build.py selects
+    # them from the asset graph): in pages when on at most INLINE_ASSET_MAX_PAGES
+    # pages, in CSS when a single stylesheet references them
+    INLINE_ASSETS_ENABLED = True
+    INLINE_ASSET_MAX_BYTES = 2048
+    INLINE_ASSET_MAX_PAGES = 2
+    INLINE_ASSETS_EXCLUDE = ['favicon*', 'images/favicon*']  # fnmatch; requested by URL
+    
+    # Link preload header per page (main CSS, its fonts, LCP image, scripts),
+    # learned from the first render; CDNs such as Cloudflare turn it into
+    # 103 Early Hints. EARLY_HINTS_ENABLED sends the 103 directly on servers
+    # exposing a wsgi.early_hints callable (stock WSGI servers do not)
+    PRELOAD_HEADERS_ENABLED = True
+    PRELOAD_HEADERS_CACHE_ENTRIES = 512
+    EARLY_HINTS_ENABLED = False
+    
+    # Speculation rules from the link graph (build.py): each page prefetches
+    # its SPECULATION_RULES_MAX_URLS likeliest next pages and prerenders the
+    # first SPECULATION_RULES_PRERENDER on hover. Weights add to the ranking,
+    # e.g. {'*': {'/products/': 2.0}, '/products/': {'/products/aura': 5.0}}
+    SPECULATION_RULES_ENABLED = True
+    SPECULATION_RULES_MAX_URLS = 3
+    SPECULATION_RULES_PRERENDER = 1
+    SPECULATION_RULES_WEIGHTS = {}
+    
+    # Service worker generated by build.py (gen/sw.<build>.js, served at
+    # /sw.js): precaches these bundles, the icon sprite and LQIP placeholders,
+    # serves hashed assets cache-first and pages stale-while-revalidate
+    SERVICE_WORKER_ENABLED = True
+    SERVICE_WORKER_PRECACHE_BUNDLES = ['css_main', 'js_shared']
+    
+    # Below-the-fold sections placed with {{ fragment('main.testimonials') }}
+    # load from /fragments/<name>.html when scrolled near; off renders them inline
+    FRAGMENTS_LAZY_ENABLED = True
+    
+    # Same-site link clicks fetch the next page with X-Partial-Navigation: 1
+    # and swap in only its head, content and scripts (js/partial-navigation.js)
+    PARTIAL_NAVIGATION_ENABLED = True
+    
+    # Content-hashed static URLs (css/style.3f2a9c1b.css), cached as immutable
+    STATIC_FINGERPRINT_ENABLED = True
+    
+    # Cross-worker shared cache (SQLite in WAL mode)
+    SHARED_CACHE_PATH = os.environ.get('SHARED_CACHE_PATH')
+    SHARED_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    
+    # Static files linked from outside the site, kept by the asset graph
+    # (build.py) even when no page references them
+    ASSET_GRAPH_EXTERNAL_FILES = ['images/og-image.jpg', 'images/twitter-card.jpg']
+    
+    # Static site export (freeze.py)
+    FREEZE_BASE_URL = os.environ.get('FREEZE_BASE_URL', 'https://adaptiveautohub.com')
+    FREEZE_OUTPUT_DIR = os.environ.get('FREEZE_OUTPUT_DIR', 'build/site')
+    FREEZE_EXCLUDE_ENDPOINTS = ['main.health', 'about.contact']  # per-visitor or live
+    FREEZE_SKIP_UNREFERENCED_IMAGES = True  # per the asset graph report, once built
     
     # Image optimization settings
     IMAGE_WEBP_QUALITY = 85
@@ -57,6 +165,9 @@ class BaseConfig:
     IMAGE_LQIP_SIZE = (20, 20)
     IMAGE_LQIP_QUALITY = 20
     
+    # Open Graph card settings
+    OG_CARD_QUALITY = 85
+    
     # Email settings (for contact forms)
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
@@ -106,6 +217,12 @@ class DevelopmentConfig(BaseConfig):
     ASSETS_DEBUG = True
     ASSETS_AUTO_BUILD = True
     
+    # Always revalidate while editing templates
+    HTTP_CACHE_ENABLED = False
+    HTML_MINIFY_TEMPLATES = False  # keep page source readable
+    STATIC_FINGERPRINT_ENABLED = False  # map is built once at startup
+    SERVICE_WORKER_ENABLED = False  # cached pages would hide template edits
+    
     # Relaxed security for development
     SESSION_COOKIE_SECURE = False
     WTF_CSRF_ENABLED = True  # Keep CSRF protection even in dev
@@ -141,7 +258,7 @@ class ProductionConfig(BaseConfig):
     # Asset pipeline settings for production
     ASSETS_DEBUG = False
     ASSETS_AUTO_BUILD = False  # Pre-build assets for production
-    ASSETS_CACHE = True
+    HTML_MINIFY_RESPONSES = True
     
     # Enhanced security for production
     SESSION_COOKIE_SECURE = True
@@ -153,9 +270,17 @@ class ProductionConfig(BaseConfig):
     MAIL_DEBUG = False
     
     # Performance optimization
-    COMPRESS_LEVEL = 9  # Maximum compression for production
+    COMPRESS_LEVEL = 6  # Dynamic responses only; static files are precompressed by build.py
     COMPRESS_MIN_SIZE = 256  # Compress smaller files in production
     
+    # Page output only changes on deploy
+    PAGE_CACHE_ENABLED = True
+    PAGE_CACHE_TTL = 86400  # 24 hours
+    
+    # Share rendered pages between Passenger/gunicorn workers
+    PAGE_CACHE_BACKEND = 'shared'
+    SHARED_CACHE_PATH = os.environ.get('SHARED_CACHE_PATH') or 'cache/shared_cache.sqlite3'
+    
     # Security headers (handled by Flask-Talisman)
     FORCE_HTTPS = True
     STRICT_TRANSPORT_SECURITY = True
@@ -267,42 +392,65 @@ def get_config(env_name=None):
     return config.get(env_name, config['default'])
 
 
-# Asset bundles configuration for different environments
+# Single bundle definition for app/utils/bundler.py (built by build.py).
+# Inputs are listed in cascade/execution order; @import and ES module
+# imports are resolved automatically.
 ASSET_BUNDLES = {
     'css_critical': {
-        'inputs': ['css/critical.css'],
-        'output': 'gen/critical.%(version)s.css',
-        'filters': ['cssmin'] if os.environ.get('FLASK_ENV') == 'production' else []
+        'inputs': ['css/critical.css']
     },
     'css_main': {
         'inputs': [
-            'css/base.css',
-            'css/components/navigation.css',
-            'css/components/buttons.css',
-            'css/components/cards.css',
-            'css/components/forms.css',
-            'css/components/hero.css',
-            'css/utilities.css'
+            'css/mobile-fixes.css',
+            'css/style.css'
         ],
-        'output': 'gen/main.%(version)s.css',
-        'filters': ['cssmin'] if os.environ.get('FLASK_ENV') == 'production' else []
+        'prune': True,
+        'split_media': True
     },
-    'js_main': {
-        'inputs': [
-            'js/modules/utils.js',
-            'js/navigation.js',
-            'js/lazy-load.js',
-            'js/forms.js'
-        ],
-        'output': 'gen/main.%(version)s.js',
-        'filters': ['jsmin'] if os.environ.get('FLASK_ENV') == 'production' else []
+    'css_home': {
+        'inputs': ['css/video-hero.css'],
+        'prune': True,
+        'split_media': True
+    }
+}
+
+# Script features for app/utils/js_splitter.py, in execution order. A page
+# gets a feature when its template chain (extends/include) contains one of
+# the markers - a '.class', '#id' or '[attribute]' the script hooks into -
+# or a {# js: name #} comment. Features every page needs are bundled into
+# the shared js_shared chunk; the rest into one js_page_* bundle per set.
+JS_FEATURES = {
+    'core': {
+        'inputs': ['js/main.js', 'js/mobile-menu-fix.js', 'js/speculation-fallback.js',
+                   'js/sw-register.js', 'js/partial-navigation.js']
     },
-    'js_enhanced': {
+    'hero': {
         'inputs': [
-            'js/enhanced/animations.js',
-            'js/enhanced/analytics.js'
+            'js/particle-system.js',
+            'js/text-animator.js',
+            'js/counter-animator.js',
+            'js/hero-controller.js'
         ],
-        'output': 'gen/enhanced.%(version)s.js',
-        'filters': ['jsmin'] if os.environ.get('FLASK_ENV') == 'production' else []
+        'markers': ['#particle-canvas', '.hero-headline']
+    },
+    'counters': {
+        'inputs': ['js/counter-animator.js'],
+        'markers': ['.counter']
+    },
+    'lazy_load': {
+        'inputs': ['js/lazy-load.js'],
+        'markers': ['[data-lazy]', '[data-lazy-content]']
+    },
+    'forms': {
+        'inputs': ['js/forms.js'],
+        'markers': ['[data-enhance]']
+    },
+    'solutions': {
+        'inputs': ['js/solutions-controller.js'],
+        'markers': ['.solutions-section']
+    },
+    'product_showcase': {
+        'inputs': ['js/components/product-showcase.js'],
+        'markers': ['[data-product-showcase]']
     }
 }
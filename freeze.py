@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Static export script for Adaptive Auto Hub
+Renders every content page to files Apache can serve without Passenger
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app import create_app
+from app.utils.freezer import SiteFreezer
+
+
+def freeze_site(output_dir=None, base_url=None, include_static=True):
+    """Render all routes into the output directory"""
+    print("🧊 Freezing site...")
+
+    # Render with production config so pages match what Flask serves
+    app = create_app('production')
+    output_dir = output_dir or os.path.join(project_root, app.config['FREEZE_OUTPUT_DIR'])
+
+    freezer = SiteFreezer(app, output_dir, base_url=base_url, include_static=include_static)
+    manifest = freezer.freeze()
+
+    print(f"\n📄 Frozen {len(manifest['pages'])} pages:")
+    for url, page in sorted(manifest['pages'].items()):
+        print(f"  ✅ {url} -> {page['file']} ({page['bytes']} bytes)")
+
+    if manifest['redirects']:
+        print(f"\n↪️  {len(manifest['redirects'])} redirects:")
+        for url, target in sorted(manifest['redirects'].items()):
+            print(f"  {url} -> {target}")
+
+    if manifest['skipped']:
+        print("\n⏭️  Left to Flask:")
+        for rule, reason in sorted(manifest['skipped'].items()):
+            print(f"  {rule}: {reason}")
+
+    compression = manifest['compression']
+    print(f"\n🗜️  Wrote {compression['siblings']} precompressed files "
+          f"for {compression['files']} text files")
+
+    if manifest['errors']:
+        print("\n❌ Failed pages:")
+        for url, error in sorted(manifest['errors'].items()):
+            print(f"  {url}: {error}")
+        return False
+
+    print(f"\n✅ Site frozen to {freezer.output_dir}")
+    print("\n📋 Next steps:")
+    print("  1. Upload the output directory to the document root")
+    print("  2. Merge its .htaccess below the Passenger directives")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the site to static files")
+    parser.add_argument('--output', help="Output directory (default: FREEZE_OUTPUT_DIR)")
+    parser.add_argument('--base-url', help="Public site URL (default: FREEZE_BASE_URL)")
+    parser.add_argument('--no-static', action='store_true',
+                        help="Do not copy the static folder into the output")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Adaptive Auto Hub - Static Site Export")
+    print("=" * 50)
+
+    try:
+        ok = freeze_site(args.output, args.base_url, include_static=not args.no_static)
+    except Exception as e:
+        print(f"\n❌ Freeze failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,32 @@
+# /tests/conftest.py
+"""
+Shared fixtures for the Adaptive Auto Hub test suite.
+"""
+
+import pytest
+
+import config
+from app import create_app
+from app.utils.bundler import build_bundles
+
+
+@pytest.fixture(scope='session')
+def built_bundles(tmp_path_factory):
+    """Build the asset bundles production pages link (as build.py does)."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(config.ProductionConfig, 'SHARED_CACHE_PATH',
+                      str(tmp_path_factory.mktemp('cache') / 'shared_cache.sqlite3'))
+        build_bundles(create_app('production'))
+
+
+@pytest.fixture
+def production_app(built_bundles, tmp_path, monkeypatch):
+    """
+    Production application with its own empty shared page cache.
+
+    Tests may set further ProductionConfig attributes with monkeypatch
+    before calling the returned factory.
+    """
+    monkeypatch.setattr(config.ProductionConfig, 'SHARED_CACHE_PATH',
+                        str(tmp_path / 'shared_cache.sqlite3'))
+    return lambda: create_app('production')
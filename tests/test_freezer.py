@@ -0,0 +1,54 @@
+# /tests/test_freezer.py
+"""
+Cache-Control rules of the static export's .htaccess.
+"""
+
+import posixpath
+import re
+
+import pytest
+
+from app.utils.freezer import SiteFreezer
+
+# Cache-Control sections of the generated .htaccess: <FilesMatch> tests the
+# file name, <If "%{REQUEST_URI} =~ m#...#"> the path
+CACHE_CONTROL_PATTERN = re.compile(
+    r'<(FilesMatch|If) "(?:%\{REQUEST_URI\} =~ m#)?(.*?)#?">\n'
+    r'\s*Header set Cache-Control "([^"]*)"'
+)
+
+
+@pytest.fixture
+def htaccess(production_app, tmp_path):
+    freezer = SiteFreezer(production_app(), str(tmp_path / 'site'), include_static=False)
+    freezer.freeze()
+    return freezer, (tmp_path / 'site' / '.htaccess').read_text(encoding='utf-8')
+
+
+def _cache_control(htaccess_text, path):
+    """Cache-Control Apache sends for a site path (the last matching rule)."""
+    value = None
+    for kind, pattern, cache_control in CACHE_CONTROL_PATTERN.findall(htaccess_text):
+        subject = posixpath.basename(path) if kind == 'FilesMatch' else path
+        if re.search(pattern, subject):
+            value = cache_control
+    return value
+
+
+def test_static_images_are_not_marked_immutable(htaccess):
+    freezer, text = htaccess
+    cards = [url for url, page in freezer.pages.items() if page['file'].endswith('.jpg')]
+
+    # Frozen Open Graph cards keep the policy the app sent for them...
+    assert cards
+    assert 'immutable' in _cache_control(text, cards[0])
+
+    # ...while a non-fingerprinted image (an image-set() fallback) does not get it
+    assert 'immutable' not in (_cache_control(text, '/static/images/hero-drone.jpg') or '')
+
+
+def test_service_worker_policy_stays_on_sw_js(htaccess):
+    _, text = htaccess
+
+    assert _cache_control(text, '/sw.js') == 'public, max-age=0'
+    assert _cache_control(text, '/static/js/forms.js') is None
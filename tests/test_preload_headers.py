@@ -0,0 +1,74 @@
+# /tests/test_preload_headers.py
+"""
+Link preload headers and 103 Early Hints of rendered pages.
+"""
+
+import re
+
+import config
+from app.extensions import get_asset_url
+from app.utils.partial_navigation import PARTIAL_HEADER
+from app.utils.preload_headers import EARLY_HINTS_ENVIRON_KEY
+
+BASE_URL = 'https://localhost'
+
+# /products/aura links the critical bundle and has an above-the-fold hero image
+PAGE = '/products/aura'
+
+
+def _links(value):
+    """Split a Link header into its comma-separated directives."""
+    return re.findall(r'<[^>]*>(?:;\s*[\w-]+(?:=(?:"[^"]*"|[^,;]*))?)*', value)
+
+
+def test_link_header_preloads_critical_css_and_lcp_image(production_app):
+    app = production_app()
+    response = app.test_client().get(PAGE, base_url=BASE_URL)
+    html = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    links = _links(response.headers['Link'])
+
+    with app.test_request_context(base_url=BASE_URL):
+        css_main = get_asset_url('css_main', app)
+    assert css_main.startswith('/static/gen/css_main.')
+    assert f'<{css_main}>; rel=preload; as=style' in links
+
+    images = [link for link in links if '; as=image' in link]
+    assert len(images) == 1
+    assert '; rel=preload' in images[0] and '; fetchpriority=high' in images[0]
+    # The image the page itself loads with high priority
+    href = re.match(r'<([^>]*)>', images[0]).group(1)
+    assert href in html
+
+
+def test_link_header_is_kept_on_page_cache_hits(production_app):
+    client = production_app().test_client()
+    miss = client.get(PAGE, base_url=BASE_URL)
+    hit = client.get(PAGE, base_url=BASE_URL)
+
+    assert hit.headers['X-Cache'] == 'HIT'
+    assert hit.headers['Link'] == miss.headers['Link']
+
+
+def test_partial_navigation_gets_no_link_header(production_app):
+    response = production_app().test_client().get(
+        PAGE, base_url=BASE_URL, headers={PARTIAL_HEADER: '1'})
+
+    assert response.status_code == 200
+    assert 'Link' not in response.headers
+
+
+def test_early_hints_send_the_link_header(production_app, monkeypatch):
+    monkeypatch.setattr(config.ProductionConfig, 'EARLY_HINTS_ENABLED', True)
+    client = production_app().test_client()
+    sent = []
+
+    # The first response records the page's preloads
+    first = client.get(PAGE, base_url=BASE_URL,
+                       environ_overrides={EARLY_HINTS_ENVIRON_KEY: sent.append})
+    second = client.get(PAGE, base_url=BASE_URL,
+                        environ_overrides={EARLY_HINTS_ENVIRON_KEY: sent.append})
+
+    assert sent == [[('Link', first.headers['Link'])]]
+    assert second.headers['Link'] == first.headers['Link']